@@ -59,6 +59,8 @@
     currentPlatform: null,
     videoElement: null,
     timestamps: [],
+    playback: null, // compiled tables from aggregate-timestamps.py, if stored
+    segmentTable: null, // {starts, ends, refs} for the current filter settings
     currentMovieId: null,
     isFiltering: false,
     originalMuted: false,
@@ -141,10 +143,11 @@
 
   async function loadTimestamps() {
     try {
-      const result = await chrome.storage.local.get(['timestamps', 'currentMovieId']);
+      const result = await chrome.storage.local.get(['timestamps', 'playback', 'currentMovieId']);
 
       if (result.timestamps && result.currentMovieId) {
         state.timestamps = result.timestamps;
+        state.playback = result.playback || null;
         state.currentMovieId = result.currentMovieId;
         log('Loaded timestamps for:', result.currentMovieId, state.timestamps.length, 'segments');
       } else {
@@ -156,6 +159,7 @@
       log('Error loading timestamps:', err);
       state.timestamps = getDemoTimestamps();
     }
+    selectSegmentTable();
   }
 
   function getDemoTimestamps() {
@@ -185,21 +189,70 @@
     ];
   }
 
-  function findActiveSegment(currentTime) {
-    for (const segment of state.timestamps) {
-      const start = parseTimestamp(segment.start);
-      const end = parseTimestamp(segment.end);
+  // Bit order of playback type masks, as in aggregate-timestamps.py
+  const PLAYBACK_TYPES = ['nudity', 'profanity', 'violence', 'substances', 'frightening'];
+
+  // Sorted, unioned intervals for one filter setting (used when no compiled
+  // playback tables were stored with the timestamps)
+  function compileSegmentTable(timestamps, enabledTypes, minSeverity) {
+    const segments = timestamps
+      .map((segment, ref) => ({
+        start: parseTimestamp(segment.start),
+        end: parseTimestamp(segment.end),
+        segment,
+        ref
+      }))
+      .filter(s => enabledTypes.includes(s.segment.type) &&
+                   s.segment.severity >= minSeverity &&
+                   s.end > s.start)
+      .sort((a, b) => a.start - b.start || a.end - b.end || a.ref - b.ref);
+
+    const table = { starts: [], ends: [], refs: [] };
+    for (const s of segments) {
+      const last = table.ends.length - 1;
+      if (last >= 0 && s.start <= table.ends[last]) {
+        if (s.end > table.ends[last]) table.ends[last] = s.end;
+      } else {
+        table.starts.push(s.start);
+        table.ends.push(s.end);
+        table.refs.push(s.ref);
+      }
+    }
+    return table;
+  }
 
-      // Check if this segment type is enabled
-      if (!state.enabledTypes.includes(segment.type)) continue;
+  // Pick (or build) the interval table for the current type/severity settings
+  function selectSegmentTable() {
+    const playback = state.playback;
+    if (playback && playback.version === 1 && playback.index) {
+      let mask = 0;
+      PLAYBACK_TYPES.forEach((type, bit) => {
+        if (state.enabledTypes.includes(type)) mask |= 1 << bit;
+      });
+      const severity = Math.min(Math.max(Math.ceil(state.minSeverity), 1), 10);
+      state.segmentTable = playback.tables[playback.index[mask][severity - 1]];
+    } else {
+      state.segmentTable = compileSegmentTable(state.timestamps, state.enabledTypes, state.minSeverity);
+    }
+  }
 
-      // Check severity threshold
-      if (segment.severity < state.minSeverity) continue;
+  function findActiveSegment(currentTime) {
+    const table = state.segmentTable;
+    if (!table) return null;
+
+    // Last interval starting at or before currentTime
+    const { starts, ends } = table;
+    let lo = 0;
+    let hi = starts.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (starts[mid] <= currentTime) lo = mid + 1;
+      else hi = mid;
+    }
 
-      // Check if we're in this segment
-      if (currentTime >= start && currentTime < end) {
-        return { segment, start, end };
-      }
+    const i = lo - 1;
+    if (i >= 0 && currentTime < ends[i]) {
+      return { segment: state.timestamps[table.refs[i]], start: starts[i], end: ends[i] };
     }
     return null;
   }
@@ -468,6 +521,7 @@
       if (result.filterMode) state.filterMode = result.filterMode;
       if (result.enabledTypes) state.enabledTypes = result.enabledTypes;
       if (result.minSeverity !== undefined) state.minSeverity = result.minSeverity;
+      selectSegmentTable();
 
       log('Settings loaded:', {
         enabled: state.enabled,
@@ -511,7 +565,14 @@
     if (changes.minSeverity) state.minSeverity = changes.minSeverity.newValue;
     if (changes.timestamps) {
       state.timestamps = changes.timestamps.newValue;
+      // Compiled tables only apply to the timestamps they were stored with
+      state.playback = changes.playback ? changes.playback.newValue : null;
       log('Timestamps updated:', state.timestamps.length, 'segments');
+    } else if (changes.playback) {
+      state.playback = changes.playback.newValue;
+    }
+    if (changes.timestamps || changes.playback || changes.enabledTypes || changes.minSeverity) {
+      selectSegmentTable();
     }
 
     updateBadge();
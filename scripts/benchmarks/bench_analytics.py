@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Benchmark: corpus analytics over JSON files and over a packed corpus
+
+Writes a synthetic corpus as one file per title and as a packed corpus, then
+times corpus_analytics.analyze over each, in this process and across the
+process pool.
+
+Usage:
+    python bench_analytics.py              # 20,000 titles
+    python bench_analytics.py 100000
+"""
+
+import json
+import os
+import sys
+import tempfile
+from typing import Dict, List
+
+import harness
+from bench_packed import synthetic_catalog
+from corpus_analytics import analyze
+from packed_corpus import pack_movies
+
+
+def run(titles: int = 20_000, repeat: int = 3) -> List[Dict]:
+    catalog = synthetic_catalog(titles)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "corpus")
+        os.makedirs(root)
+        for movie in catalog:
+            with open(os.path.join(root, f"{movie['imdb_id']}.json"), "w") as f:
+                json.dump(movie, f, indent=2)
+        packed = os.path.join(tmp, "corpus.ffc")
+        pack_movies(catalog, packed)
+        del catalog
+
+        assert analyze(root, workers=0).report() == analyze(packed, workers=0).report()
+        for label, source in (("json", root), ("packed", packed)):
+            for mode, workers in (("serial", 0), ("pool", None)):
+                results.append(harness.bench(f"analytics/{label}/{mode}/{titles}",
+                                             lambda: analyze(source, workers=workers), titles, repeat))
+    return results
+
+
+if __name__ == "__main__":
+    harness.print_results(run(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000))
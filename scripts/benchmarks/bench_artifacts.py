@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark: re-estimating a catalog from the artifact store
+
+Stores the fixture pages for N titles in an ArtifactStore, then times
+re-estimating every title: from the page (parse + estimate, what a re-run
+cost before artifacts, minus the network), from the stored parsed warnings
+for a runtime not estimated yet (a new cut or estimator version), and with
+the estimates themselves stored.
+
+Usage:
+    python bench_artifacts.py              # 1,000 titles
+    python bench_artifacts.py 10000
+"""
+
+import glob
+import itertools
+import os
+import sys
+import tempfile
+from typing import Dict, List
+
+import harness
+
+
+def run(titles: int = 1_000, repeat: int = 3) -> List[Dict]:
+    module = harness.load_script("imdb-scraper.py")
+    pages = []
+    for path in sorted(glob.glob(os.path.join(harness.FIXTURES_DIR, "parentalguide-*.html"))):
+        with open(path, encoding="utf-8") as f:
+            pages.append(f.read())
+    imdb_ids = [f"tt{i:07d}" for i in range(titles)]
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        scraper = module.IMDbScraper(rate_limit=0, artifact_dir=tmp)
+        for i, imdb_id in enumerate(imdb_ids):
+            scraper.artifacts.put_html(imdb_id, scraper._guide_url(imdb_id), pages[i % len(pages)])
+        runtimes = itertools.count(90)
+
+        def from_pages():
+            runtime = next(runtimes)
+            for imdb_id in imdb_ids:
+                data = scraper.parse_parents_guide(imdb_id, scraper.artifacts.get_html(imdb_id))
+                scraper.generate_timestamps(data["warnings"], runtime, imdb_id)
+
+        def from_warnings():
+            runtime = next(runtimes)
+            for imdb_id in imdb_ids:
+                scraper.reestimate_movie(imdb_id, runtime)
+
+        def from_estimates():
+            for imdb_id in imdb_ids:
+                scraper.reestimate_movie(imdb_id, 89)
+
+        for imdb_id in imdb_ids:
+            scraper.reestimate_movie(imdb_id, 89)
+        results.append(harness.bench(f"reestimate/parse_and_estimate/{titles}", from_pages, titles, repeat))
+        results.append(harness.bench(f"reestimate/stored_warnings/{titles}", from_warnings, titles, repeat))
+        results.append(harness.bench(f"reestimate/stored_estimates/{titles}", from_estimates, titles, repeat))
+        scraper.artifacts.close()
+    return results
+
+
+if __name__ == "__main__":
+    harness.print_results(run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000))
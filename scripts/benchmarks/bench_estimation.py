@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark: timestamp-position and severity estimation
+
+Compares the original per-call implementation (patterns recompiled through
+re.search, keywords re-sorted on every call) with the precompiled, memoized
+DescriptionMatcher used by IMDbScraper.
+
+Usage:
+    python bench_estimation.py            # 200,000 descriptions
+    python bench_estimation.py 1000000
+"""
+
+import random
+import re
+import sys
+from typing import Dict, List
+
+import harness
+from estimation import DescriptionMatcher
+
+# Vocabulary in the style of Parents Guide entries
+PHRASES = [
+    "a man is shot in the head", "brief nudity", "strong language throughout",
+    "several characters smoke cigarettes", "the film opens with a violent battle",
+    "a graphic fight near the end", "mild peril", "a woman kisses a man passionately",
+    "some blood is shown", "about 45 minutes in a car explodes", "frequent use of the f-word",
+    "implied sex scene", "bodies are shown in the middle of the film", "a brutal beating",
+    "characters drink alcohol at a party", "a jump scare", "disturbing imagery",
+    "during the climax a building collapses", "moderate violence", "quick glimpse of a corpse",
+]
+
+# Boilerplate lines that repeat verbatim across many titles
+BOILERPLATE = [
+    "Some mild language.", "Frequent use of the f-word.", "Some blood.",
+    "Characters smoke.", "Brief kissing.", "None.",
+]
+
+
+def synthetic_descriptions(count: int, boilerplate_share: float = 0.3, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    descriptions = []
+    for _ in range(count):
+        if rng.random() < boilerplate_share:
+            descriptions.append(rng.choice(BOILERPLATE))
+        else:
+            parts = rng.sample(PHRASES, rng.randint(1, 3))
+            descriptions.append(", ".join(parts).capitalize() + f" (scene {rng.randint(1, 10**6)}).")
+    return descriptions
+
+
+def legacy_position(description: str, runtime_minutes: int, time_patterns: Dict) -> float:
+    """estimate_timestamp_position as it was before DescriptionMatcher"""
+    desc_lower = description.lower()
+    time_match = re.search(r'(\d+)\s*minutes?\s*(in|into)', desc_lower)
+    if time_match:
+        return min(int(time_match.group(1)) / runtime_minutes, 0.95)
+    for pattern, position in time_patterns.items():
+        if position == "extract":
+            continue
+        if re.search(pattern, desc_lower):
+            return position
+    return 0.5
+
+
+def legacy_severity(description: str, severity_keywords: Dict) -> int:
+    """estimate_severity as it was before DescriptionMatcher"""
+    desc_lower = description.lower()
+    for severity, keywords in sorted(severity_keywords.items(), reverse=True):
+        for keyword in keywords:
+            if keyword in desc_lower:
+                return severity
+    return 5
+
+
+def matcher_position(matcher: DescriptionMatcher, description: str, runtime_minutes: int) -> float:
+    hint = matcher.position_hint(description)
+    if not hint:
+        return 0.5
+    kind, value = hint
+    return min(value / runtime_minutes, 0.95) if kind == "minutes" else value
+
+
+def run(count: int = 200_000, repeat: int = 3) -> List[Dict]:
+    scraper_cls = harness.load_script("imdb-scraper.py").IMDbScraper
+    time_patterns, severity_keywords = scraper_cls.TIME_PATTERNS, scraper_cls.SEVERITY_KEYWORDS
+    descriptions = synthetic_descriptions(count)
+
+    def fresh_matcher():
+        return DescriptionMatcher(time_patterns, severity_keywords)
+
+    # Same answers before and after, or the numbers below mean nothing
+    check = fresh_matcher()
+    for desc in descriptions[:20_000]:
+        assert legacy_position(desc, 120, time_patterns) == matcher_position(check, desc, 120), desc
+        assert legacy_severity(desc, severity_keywords) == (check.keyword_severity(desc) or 5), desc
+
+    def run_legacy():
+        for desc in descriptions:
+            legacy_position(desc, 120, time_patterns)
+            legacy_severity(desc, severity_keywords)
+
+    def run_matcher(memoize: bool):
+        matcher = fresh_matcher() if memoize else DescriptionMatcher(time_patterns, severity_keywords, cache_size=0)
+        for desc in descriptions:
+            matcher_position(matcher, desc, 120)
+            matcher.keyword_severity(desc)
+
+    return [
+        harness.bench("estimation/legacy", run_legacy, count, repeat),
+        harness.bench("estimation/precompiled", lambda: run_matcher(False), count, repeat),
+        harness.bench("estimation/precompiled+memo", lambda: run_matcher(True), count, repeat),
+    ]
+
+
+if __name__ == "__main__":
+    harness.print_results(run(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000))
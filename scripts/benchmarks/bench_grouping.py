@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark: group_similar_timestamps at community-submission scale
+
+Generates N synthetic submissions for one title (jittered copies of a set
+of true scenes across all five types) and times the sweep-line clustering,
+then the full merge_timestamps with the Python and (if NumPy is installed)
+the array merge engine.
+
+Usage:
+    python bench_grouping.py                 # 10^3, 10^5 and 10^6 submissions
+    python bench_grouping.py 1000 100000
+"""
+
+import importlib.util
+import random
+import sys
+from typing import Dict, List
+
+import harness
+
+TYPES = ["nudity", "profanity", "violence", "substances", "frightening"]
+
+
+def format_time(seconds: int) -> str:
+    return f"{seconds // 3600:02d}:{(seconds % 3600) // 60:02d}:{seconds % 60:02d}"
+
+
+def synthetic_submissions(count: int, runtime_minutes: int = 150, seed: int = 11) -> List[Dict]:
+    """Submissions clustered around ~1 true scene per 3 minutes of runtime"""
+    rng = random.Random(seed)
+    runtime = runtime_minutes * 60
+    scenes = [(rng.randrange(0, runtime - 120), rng.randint(5, 90), rng.choice(TYPES))
+              for _ in range(runtime_minutes // 3)]
+    submissions = []
+    for i in range(count):
+        start, duration, ts_type = rng.choice(scenes)
+        start = max(0, start + rng.randint(-20, 20))
+        submissions.append({
+            "start": format_time(start),
+            "end": format_time(start + max(1, duration + rng.randint(-10, 10))),
+            "type": ts_type,
+            "severity": rng.randint(1, 10),
+            "description": f"submission {i}",
+            "_source": f"user-{rng.randrange(1000)}",
+        })
+    return submissions
+
+
+def run(sizes=(10**3, 10**5, 10**6), repeat: int = 3) -> List[Dict]:
+    aggregator = harness.load_script("aggregate-timestamps.py")
+    engines = ["python"] + (["numpy"] if importlib.util.find_spec("numpy") else [])
+    results = []
+    for size in sizes:
+        submissions = synthetic_submissions(size)
+        runs = repeat if size < 10**6 else 1
+        results.append(harness.bench(
+            f"group_similar_timestamps/{size:.0e}",
+            lambda: aggregator.group_similar_timestamps(submissions),
+            size, runs,
+        ))
+        sources = [{"metadata": {"source": "Community"}, "timestamps": submissions}]
+        for engine in engines:
+            results.append(harness.bench(
+                f"merge_timestamps/{engine}/{size:.0e}",
+                lambda: aggregator.merge_timestamps(sources, engine),
+                size, runs,
+            ))
+    return results
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or (10**3, 10**5, 10**6)
+    harness.print_results(run(sizes))
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark: packed columnar corpus vs JSON dicts
+
+Builds a synthetic catalog, writes it both as one JSON document and as a
+packed corpus, then times loading each and running the same query
+(violence at severity >= 7) against it. Peak memory comes from tracemalloc.
+
+Usage:
+    python bench_packed.py            # 100,000 titles
+    python bench_packed.py 10000
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+from typing import Dict, List
+
+import harness
+from packed_corpus import PackedCorpus, format_time, pack_movies
+
+TYPES = ["nudity", "profanity", "violence", "substances", "frightening"]
+
+DESCRIPTIONS = [
+    "Some blood.", "Frequent use of the f-word.", "A man is shot in the head.",
+    "Characters drink at a party.", "Brief rear nudity.", "Jump scare in a dark hallway.",
+]
+
+
+def synthetic_catalog(titles: int, per_title: int = 12, seed: int = 5) -> List[Dict]:
+    rng = random.Random(seed)
+    catalog = []
+    for n in range(titles):
+        runtime = rng.randint(80, 180)
+        timestamps = []
+        for _ in range(per_title):
+            start = rng.randrange(0, runtime * 60 - 120)
+            timestamps.append({
+                "start": format_time(start),
+                "end": format_time(start + rng.randint(5, 120)),
+                "type": rng.choice(TYPES),
+                "severity": rng.randint(1, 10),
+                "description": rng.choice(DESCRIPTIONS),
+                "verified": rng.random() < 0.5,
+                "confidence": round(rng.random(), 2),
+            })
+        catalog.append({"title": f"Title {n}", "imdb_id": f"tt{n:07d}",
+                        "runtime_minutes": runtime, "timestamps": timestamps})
+    return catalog
+
+
+def json_query(catalog: List[Dict]) -> int:
+    return sum(1 for movie in catalog for ts in movie["timestamps"]
+               if ts["type"] == "violence" and ts["severity"] >= 7)
+
+
+def packed_query(corpus: PackedCorpus) -> int:
+    return len(corpus.query(["violence"], 7))
+
+
+def peak_memory(fn) -> int:
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def run(titles: int = 100_000, repeat: int = 3) -> List[Dict]:
+    catalog = synthetic_catalog(titles)
+    segments = sum(len(movie["timestamps"]) for movie in catalog)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "catalog.json")
+        packed_path = os.path.join(tmp, "catalog.ffc")
+        with open(json_path, "w") as f:
+            json.dump(catalog, f)
+        pack_movies(catalog, packed_path)
+        del catalog
+
+        def load_json():
+            with open(json_path) as f:
+                return json.load(f)
+
+        results = [
+            harness.bench("load/json", load_json, titles, repeat),
+            harness.bench("load/packed", lambda: PackedCorpus(packed_path), titles, repeat),
+        ]
+        loaded = load_json()
+        corpus = PackedCorpus(packed_path)
+        results.append(harness.bench("query/json", lambda: json_query(loaded), segments, repeat))
+        results.append(harness.bench("query/packed", lambda: packed_query(corpus), segments, repeat))
+        assert json_query(loaded) == packed_query(corpus)
+
+        print(f"file size: json {os.path.getsize(json_path):,} B, packed {os.path.getsize(packed_path):,} B")
+        print(f"peak load memory: json {peak_memory(load_json):,} B, "
+              f"packed {peak_memory(lambda: PackedCorpus(packed_path)):,} B")
+        corpus.close()
+    return results
+
+
+if __name__ == "__main__":
+    harness.print_results(run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Parents Guide HTML extraction
+
+Parses the saved pages in fixtures/ with the original BeautifulSoup
+extraction (two whole-tree searches per category selector) and with the
+single-pass lxml ParentsGuideExtractor, after checking both give the same
+result. IMDbScraper.scrape_parents_guide is also timed end to end against
+the fixtures, served by an in-process transport adapter. The BeautifulSoup
+baseline is skipped when beautifulsoup4 is not installed.
+
+Usage:
+    python bench_parsing.py
+"""
+
+import contextlib
+import glob
+import importlib.util
+import io
+import os
+import re
+from typing import Dict, List
+
+import harness
+
+
+def legacy_parse(imdb_id: str, page_html: str, categories: Dict[str, List[str]]) -> Dict:
+    """scrape_parents_guide's parsing as it was before ParentsGuideExtractor"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(page_html, "lxml")
+    title_elem = soup.select_one('h3[itemprop="name"] a, [data-testid="hero-title-block__title"]')
+    title = title_elem.get_text(strip=True) if title_elem else None
+    if not title:
+        title_elem = soup.select_one('title')
+        if title_elem:
+            title = title_elem.get_text().split(' - ')[0].strip()
+
+    result = {"imdb_id": imdb_id, "title": title, "warnings": {}, "severity_votes": {}}
+    for category, selectors in categories.items():
+        warnings = []
+        for selector in selectors:
+            section = soup.find(id=selector)
+            if section:
+                items = section.find_all("li", class_=lambda c: c and "ipl-zebra-list__item" in c)
+                if not items:
+                    items = section.find_all("li")
+                warnings.extend([item.get_text(strip=True) for item in items])
+            header = soup.find(string=re.compile(selector, re.I))
+            if header:
+                parent = header.find_parent("section") or header.find_parent("div")
+                if parent:
+                    warnings.extend([item.get_text(strip=True) for item in parent.find_all("li")])
+
+        seen = set()
+        clean_warnings = []
+        for w in warnings:
+            w_clean = re.sub(r'\s+', ' ', w).strip()
+            if w_clean and w_clean not in seen and len(w_clean) > 10:
+                seen.add(w_clean)
+                clean_warnings.append(w_clean)
+        result["warnings"][category] = clean_warnings
+    return result
+
+
+def run(repeat: int = 5, pages_per_run: int = 20) -> List[Dict]:
+    scraper = harness.load_script("imdb-scraper.py").IMDbScraper(rate_limit=0)
+    has_beautifulsoup = importlib.util.find_spec("bs4") is not None
+    results = []
+    for path in sorted(glob.glob(os.path.join(harness.FIXTURES_DIR, "parentalguide-*.html"))):
+        with open(path, encoding="utf-8") as f:
+            page_html = f.read()
+        layout = os.path.basename(path)[len("parentalguide-"):-len(".html")]
+
+        def run_legacy():
+            for _ in range(pages_per_run):
+                legacy_parse("tt0000000", page_html, scraper.CATEGORIES)
+
+        def run_single_pass():
+            for _ in range(pages_per_run):
+                scraper.parse_parents_guide("tt0000000", page_html)
+
+        def run_scrape():
+            for _ in range(pages_per_run):
+                scraper._fetch_and_parse("tt0000000")
+
+        if has_beautifulsoup:
+            expected = legacy_parse("tt0000000", page_html, scraper.CATEGORIES)
+            assert scraper.parse_parents_guide("tt0000000", page_html) == expected, path
+            results.append(harness.bench(f"parse/{layout}/beautifulsoup", run_legacy, pages_per_run, repeat))
+        results.append(harness.bench(f"parse/{layout}/single-pass", run_single_pass, pages_per_run, repeat))
+
+        scraper.session.mount("https://", harness.FixtureAdapter(page_html.encode("utf-8")))
+        with contextlib.redirect_stderr(io.StringIO()):  # "Fetching: ..." lines
+            results.append(harness.bench(f"scrape_parents_guide/{layout}", run_scrape, pages_per_run, repeat))
+    return results
+
+
+if __name__ == "__main__":
+    harness.print_results(run())
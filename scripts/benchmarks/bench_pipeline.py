@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark: timestamp generation, merging and quality scoring
+
+Scales the sample movies in timestamps/sample-movies up to a synthetic
+catalog. Title n is a copy of sample n % 5 with a new IMDb ID, seen through
+three sources whose timestamps are jittered by up to +-20 seconds. The
+benchmark then times, over the whole catalog:
+
+    generate_timestamps      IMDbScraper estimating timestamps from warnings
+    merge_timestamps         aggregating each title's three sources
+    calculate_quality_score  scoring each merged title
+
+Usage:
+    python bench_pipeline.py                  # 5, 1,000 and 10,000 titles
+    python bench_pipeline.py 5 1000 100000
+"""
+
+import json
+import os
+import random
+import sys
+from typing import Dict, List
+
+import harness
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(harness.BENCH_DIR)), "timestamps", "sample-movies")
+SOURCE_NAMES = ["IMDb Parents Guide", "Reddit", "Community"]
+
+
+def format_time(seconds: int) -> str:
+    return f"{seconds // 3600:02d}:{(seconds % 3600) // 60:02d}:{seconds % 60:02d}"
+
+
+def parse_time(value: str) -> int:
+    h, m, s = value.split(":")
+    return int(h) * 3600 + int(m) * 60 + int(s)
+
+
+def load_samples() -> List[Dict]:
+    samples = []
+    for filename in sorted(os.listdir(SAMPLES_DIR)):
+        with open(os.path.join(SAMPLES_DIR, filename)) as f:
+            samples.append(json.load(f))
+    return samples
+
+
+def synthetic_sources(titles: int, seed: int = 3) -> List[List[Dict]]:
+    """Per title, three jittered source files derived from a sample movie"""
+    rng = random.Random(seed)
+    samples = load_samples()
+    catalog = []
+    for n in range(titles):
+        sample = samples[n % len(samples)]
+        sources = []
+        for source_name in SOURCE_NAMES:
+            timestamps = []
+            for ts in sample["timestamps"]:
+                start = max(0, parse_time(ts["start"]) + rng.randint(-20, 20))
+                end = max(start + 1, parse_time(ts["end"]) + rng.randint(-20, 20))
+                timestamps.append(dict(ts, start=format_time(start), end=format_time(end),
+                                       confidence=round(rng.uniform(0.3, 0.9), 2),
+                                       verified=rng.random() < 0.2))
+            sources.append({
+                "title": sample["title"],
+                "imdb_id": f"tt{9000000 + n}",
+                "runtime_minutes": sample["runtime_minutes"],
+                "platforms": sample.get("platforms", []),
+                "timestamps": timestamps,
+                "metadata": {"source": source_name},
+            })
+        catalog.append(sources)
+    return catalog
+
+
+def synthetic_warnings(titles: int) -> List[Dict[str, List[str]]]:
+    """Parents Guide style warnings: each title's sample descriptions by type"""
+    samples = load_samples()
+    warnings = []
+    for n in range(titles):
+        by_type: Dict[str, List[str]] = {}
+        for ts in samples[n % len(samples)]["timestamps"]:
+            by_type.setdefault(ts["type"], []).append(f"{ts['description']} ({n})")
+        warnings.append(by_type)
+    return warnings
+
+
+def run(sizes=(5, 1_000, 10_000), repeat: int = 3) -> List[Dict]:
+    scraper = harness.load_script("imdb-scraper.py").IMDbScraper(rate_limit=0)
+    aggregator = harness.load_script("aggregate-timestamps.py")
+    results = []
+    for size in sizes:
+        runs = repeat if size <= 10_000 else 1
+
+        # The warnings live only as the lambda's default, so they are freed
+        # once the benchmark returns, before the merge catalog is built
+        results.append(harness.bench(
+            f"generate_timestamps/{size}",
+            lambda title_warnings=synthetic_warnings(size): [
+                scraper.generate_timestamps(w, 140, "tt0000000") for w in title_warnings],
+            size, runs,
+        ))
+
+        catalog = synthetic_sources(size)
+        merged: List[Dict] = []
+
+        def merge_all():
+            merged[:] = [aggregator.merge_timestamps(sources) for sources in catalog]
+
+        results.append(harness.bench(f"merge_timestamps/{size}", merge_all, size, runs))
+        results.append(harness.bench(
+            f"group_similar_timestamps/{size}",
+            lambda: [aggregator.group_similar_timestamps(
+                [ts for source in sources for ts in source["timestamps"]]) for sources in catalog],
+            size, runs,
+        ))
+        results.append(harness.bench(
+            f"calculate_quality_score/{size}",
+            lambda: [aggregator.calculate_quality_score(m) for m in merged],
+            size, runs,
+        ))
+    return results
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or (5, 1_000, 10_000)
+    harness.print_results(run(sizes))
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: end-to-end scraping throughput against the IMDb stand-in
+
+Starts imdb_standin.py on a free port in a subprocess and points
+IMDbScraper at it with base_url, then runs process_many (fetch, parse,
+estimate) over synthetic titles without rate limiting. Two scenarios:
+
+    clean    every request succeeds after --latency
+    faulty   1% 500s and 1% 429s (Retry-After: 0), retried by the scraper
+
+Reports titles/s and the p50/p99 time from a title's fetch starting to its
+timestamps being estimated, retries included.
+
+Usage:
+    python bench_scrape.py                # 500 titles, 20 ms latency, concurrency 8 and 32
+    python bench_scrape.py 2000 0.05
+"""
+
+import asyncio
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import harness
+from bench_server import free_port, wait_for_port
+
+STANDIN = os.path.join(harness.BENCH_DIR, "imdb_standin.py")
+
+SCENARIOS = {
+    "clean": [],
+    "faulty": ["--error-rate", "0.01", "--throttle-rate", "0.01", "--retry-after", "0"],
+}
+
+
+async def scrape_all(scraper, movies, latencies: List[float]) -> int:
+    def work(movie):
+        started = time.perf_counter()
+        imdb_id, runtime_minutes = movie
+        result = scraper._build_output(scraper._fetch_and_parse(imdb_id), imdb_id, runtime_minutes)
+        latencies.append(time.perf_counter() - started)
+        return result
+
+    errors = 0
+    async for result in scraper._run_many(movies, work, lambda movie: movie[0]):
+        errors += 1 if result.get("error") else 0
+    return errors
+
+
+def run(titles: int = 500, latency: float = 0.02, concurrency=(8, 32)) -> List[Dict]:
+    module = harness.load_script("imdb-scraper.py")
+    movies = [(f"tt{n:07d}", 90 + n % 60) for n in range(1, titles + 1)]
+    results = []
+    for scenario, knobs in SCENARIOS.items():
+        port = free_port()
+        server = subprocess.Popen([sys.executable, STANDIN, "--port", str(port), "--latency", str(latency),
+                                   "--jitter", str(latency / 2), *knobs], stderr=subprocess.DEVNULL)
+        try:
+            wait_for_port(port)
+            for workers in concurrency:
+                scraper = module.IMDbScraper(rate_limit=0, max_concurrency=workers,
+                                             base_url=f"http://127.0.0.1:{port}")
+                latencies: List[float] = []
+                started = time.perf_counter()
+                with contextlib.redirect_stderr(io.StringIO()):
+                    errors = asyncio.run(scrape_all(scraper, movies, latencies))
+                elapsed = time.perf_counter() - started
+                latencies.sort()
+                results.append({
+                    "name": f"scrape/{scenario}/c{workers}",
+                    "items": titles,
+                    "repeat": 1,
+                    "best_s": elapsed,
+                    "median_s": elapsed,
+                    "items_per_s": titles / elapsed,
+                    "p50_ms": latencies[len(latencies) // 2] * 1000,
+                    "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+                    "errors": errors,
+                    "retries": scraper.metrics.counters.get("fetch_retries", 0),
+                })
+        finally:
+            server.terminate()
+            server.wait()
+    return results
+
+
+if __name__ == "__main__":
+    titles = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.02
+    for r in run(titles, latency):
+        print(f"{r['name']:<20} {r['items_per_s']:>8,.1f} titles/s  p50 {r['p50_ms']:7.2f} ms  "
+              f"p99 {r['p99_ms']:7.2f} ms  retries {r['retries']:>3}  errors {r['errors']}")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark: timestamp-server.py request rate and latency
+
+Writes a synthetic corpus (plus index.json) to a temporary directory, starts
+the server on a free port in a subprocess, and drives it with keep-alive
+connections asking for random titles with gzip. Every fourth request
+revalidates with If-None-Match. Reports requests/s and p50/p99/max latency.
+
+Usage:
+    python bench_server.py                      # 10,000 titles, 64 connections, 20,000 requests
+    python bench_server.py 10000 64 50000
+"""
+
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import harness
+from bench_packed import synthetic_catalog
+from catalog_index import CatalogIndex
+
+SERVER = os.path.join(os.path.dirname(harness.BENCH_DIR), "timestamp-server.py")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def write_corpus(root: str, titles: int):
+    os.makedirs(os.path.join(root, "movies"))
+    for movie in synthetic_catalog(titles):
+        with open(os.path.join(root, "movies", f"{movie['imdb_id']}.json"), "w") as f:
+            json.dump(movie, f, indent=2)
+    CatalogIndex.build(root).save()
+
+
+async def read_response(reader: asyncio.StreamReader) -> Dict[str, str]:
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length:
+        await reader.readexactly(length)
+    headers["status"] = lines[0].split(" ")[1]
+    return headers
+
+
+async def client(port: int, ids: List[str], count: int, latencies: List[float], seed: int):
+    rng = random.Random(seed)
+    etags: Dict[str, str] = {}
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for n in range(count):
+        imdb_id = rng.choice(ids)
+        request = f"GET /timestamps/{imdb_id} HTTP/1.1\r\nHost: bench\r\nAccept-Encoding: gzip\r\n"
+        if n % 4 == 3 and imdb_id in etags:
+            request += f"If-None-Match: {etags[imdb_id]}\r\n"
+        started = time.perf_counter()
+        writer.write((request + "\r\n").encode())
+        headers = await read_response(reader)
+        latencies.append(time.perf_counter() - started)
+        if headers["status"] == "200":
+            etags[imdb_id] = headers["etag"]
+    writer.close()
+
+
+async def drive(port: int, ids: List[str], connections: int, requests: int) -> Dict:
+    latencies: List[float] = []
+    per_client = requests // connections
+    started = time.perf_counter()
+    await asyncio.gather(*(client(port, ids, per_client, latencies, seed) for seed in range(connections)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "requests_per_s": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+        "max_ms": latencies[-1] * 1000,
+    }
+
+
+def wait_for_port(port: int, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("server did not start")
+
+
+def run(titles: int = 10_000, connections: int = 64, requests: int = 20_000) -> List[Dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as root:
+        write_corpus(root, titles)
+        ids = [f"tt{n:07d}" for n in range(titles)]
+        port = free_port()
+        server = subprocess.Popen([sys.executable, SERVER, "--corpus", root, "--port", str(port),
+                                   "--cache-size", str(titles)], stderr=subprocess.DEVNULL)
+        try:
+            wait_for_port(port)
+            for label in ("cold", "warm"):
+                result = asyncio.run(drive(port, ids, connections, requests))
+                result["name"] = f"server/{label}"
+                results.append(result)
+        finally:
+            server.terminate()
+            server.wait()
+    return results
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    for r in run(*args):
+        print(f"{r['name']:<12} {r['requests']:>7,} requests  {r['requests_per_s']:>9,.0f} req/s  "
+              f"p50 {r['p50_ms']:.2f} ms  p99 {r['p99_ms']:.2f} ms  max {r['max_ms']:.2f} ms")
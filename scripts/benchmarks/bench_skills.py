@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: skills catalog search, linear scan vs SkillIndex
+
+Grows the bundled catalog to a skills.sh-sized synthetic one (publishers,
+repos and hyphenated names drawn from the real catalog's vocabulary), then
+times building the index, loading it from the disk cache, and answering the
+catalog's queries (search, category, publisher, ranked search) by scanning
+every ID as the catalog used to and through the index, after checking both
+return the same skills.
+
+Usage:
+    python bench_skills.py              # 50,000 skills
+    python bench_skills.py 200000
+"""
+
+import os
+import random
+import sys
+import tempfile
+from typing import Dict, List
+
+import harness
+
+catalog = harness.load_script("claude-skills-catalog.py", os.path.dirname(harness.BENCH_DIR))
+
+QUERIES = ["test", "react", "ui", "web-design", "seo-audit", "best-practices", "x", "native-ui"]
+RANKED = ["rea", "react nat", "marketing cro", "design sys"]
+
+
+def synthetic_skills(count: int, seed: int = 5) -> List[str]:
+    rng = random.Random(seed)
+    words = sorted({token for skill in catalog.skills for token in catalog.tokenize(skill)})
+    publishers = [f"{rng.choice(words)}{rng.randint(0, 999)}" for _ in range(max(1, count // 20))]
+    skill_ids = list(catalog.skills)
+    seen = set(skill_ids)
+    while len(skill_ids) < count:
+        name = "-".join(rng.sample(words, rng.randint(1, 4)))
+        skill_id = f"{rng.choice(publishers)}/{rng.choice(words)}-skills/{name}"
+        if skill_id not in seen:
+            seen.add(skill_id)
+            skill_ids.append(skill_id)
+    return skill_ids
+
+
+def scan_search(skill_ids: List[str], *terms: str) -> List[str]:
+    return [skill for skill in skill_ids if any(term in skill.lower() for term in terms)]
+
+
+def run(count: int = 50_000, repeat: int = 3) -> List[Dict]:
+    skill_ids = synthetic_skills(count)
+    category_terms = catalog.SKILL_CATEGORIES["frontend"]
+    publisher = skill_ids[-1].split("/")[0] + "/"
+    results = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        index = catalog.SkillIndex.load(skill_ids, cache_dir)
+        for query in QUERIES:
+            assert index.search(query) == scan_search(skill_ids, query), query
+        assert index.search(*category_terms) == scan_search(skill_ids, *category_terms)
+        assert index.with_prefix(publisher) == [s for s in skill_ids if s.startswith(publisher)]
+
+        results.append(harness.bench(f"skills/index_build/{count}",
+                                     lambda: catalog.SkillIndex(skill_ids), count, repeat))
+        results.append(harness.bench(f"skills/index_load_cached/{count}",
+                                     lambda: catalog.SkillIndex.load(skill_ids, cache_dir), count, repeat))
+
+    def scan():
+        for query in QUERIES:
+            scan_search(skill_ids, query)
+        scan_search(skill_ids, *category_terms)
+
+    def indexed():
+        # Fresh caches each time, so every query is answered from the postings
+        index._term_cache.clear()
+        index._search_cache.clear()
+        for query in QUERIES:
+            index.search(query)
+        index.search(*category_terms)
+
+    queries = len(QUERIES) + 1
+    results.append(harness.bench(f"skills/search_scan/{count}", scan, queries, repeat))
+    results.append(harness.bench(f"skills/search_index/{count}", indexed, queries, repeat))
+    results.append(harness.bench(f"skills/publisher_index/{count}",
+                                 lambda: index.with_prefix(publisher), 1, repeat))
+
+    def ranked():
+        index._term_cache.clear()
+        for query in RANKED:
+            index.rank(query)
+
+    results.append(harness.bench(f"skills/rank_index/{count}", ranked, len(RANKED), repeat))
+    return results
+
+
+if __name__ == "__main__":
+    harness.print_results(run(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000))
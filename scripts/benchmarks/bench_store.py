@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: SQLite timestamp store vs scanning the JSON files
+
+Writes a synthetic corpus (with platforms) as one file per title, then times
+bulk-loading it into a fresh TimestampStore and answering "violence of
+severity >= 8 on netflix titles" both from the store's indexes and by
+parsing every file, as the corpus had to be queried before.
+
+Usage:
+    python bench_store.py              # 20,000 titles
+    python bench_store.py 100000
+"""
+
+import itertools
+import json
+import os
+import random
+import sys
+import tempfile
+from typing import Dict, List
+
+import harness
+from bench_packed import synthetic_catalog
+from packed_corpus import iter_corpus
+from timestamp_store import TimestampStore
+
+PLATFORMS = ["netflix", "prime", "disney", "hbo", "hulu"]
+
+
+def catalog_with_platforms(titles: int, seed: int = 9) -> List[Dict]:
+    rng = random.Random(seed)
+    catalog = synthetic_catalog(titles)
+    for movie in catalog:
+        movie["platforms"] = sorted(rng.sample(PLATFORMS, rng.randint(1, 3)))
+    return catalog
+
+
+def scan_query(root: str) -> int:
+    return sum(1 for _, movie in iter_corpus(root) if "netflix" in movie.get("platforms", [])
+               for ts in movie["timestamps"] if ts["type"] == "violence" and ts["severity"] >= 8)
+
+
+def store_query(store: TimestampStore) -> int:
+    return sum(1 for _ in store.query(types=["violence"], min_severity=8, platforms=["netflix"]))
+
+
+def run(titles: int = 20_000, repeat: int = 3) -> List[Dict]:
+    catalog = catalog_with_platforms(titles)
+    segments = sum(len(movie["timestamps"]) for movie in catalog)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = os.path.join(tmp, "corpus")
+        os.makedirs(corpus)
+        for movie in catalog:
+            with open(os.path.join(corpus, f"{movie['imdb_id']}.json"), "w") as f:
+                json.dump(movie, f, indent=2)
+
+        counter = itertools.count()
+
+        def load():
+            with TimestampStore(os.path.join(tmp, f"load-{next(counter)}.db")) as store:
+                store.upsert_many(catalog)
+
+        results.append(harness.bench(f"store/upsert_many/{titles}", load, titles, repeat))
+
+        with TimestampStore(os.path.join(tmp, "store.db")) as store:
+            store.upsert_many(catalog)
+            assert store_query(store) == scan_query(corpus)
+            results.append(harness.bench(f"query/json_scan/{titles}", lambda: scan_query(corpus), segments, repeat))
+            results.append(harness.bench(f"query/store/{titles}", lambda: store_query(store), segments, repeat))
+            results.append(harness.bench(f"get/store/{titles}",
+                                         lambda: [store.get(movie["imdb_id"]) for movie in catalog[:1000]],
+                                         1000, repeat))
+    return results
+
+
+if __name__ == "__main__":
+    harness.print_results(run(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000))
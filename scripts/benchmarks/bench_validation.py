@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Benchmark: schema validation of a whole corpus
+
+Writes a synthetic corpus to a temporary directory and validates every file
+against timestamps/schema.json with schema_validation.validate_corpus, once
+in this process and once across the process pool.
+
+Usage:
+    python bench_validation.py              # 20,000 files
+    python bench_validation.py 50000
+"""
+
+import json
+import os
+import sys
+import tempfile
+from typing import Dict, List
+
+import harness
+from bench_packed import synthetic_catalog
+from schema_validation import DEFAULT_SCHEMA, validate_corpus
+
+
+def write_files(root: str, titles: int):
+    for movie in synthetic_catalog(titles):
+        with open(os.path.join(root, f"{movie['imdb_id']}.json"), "w") as f:
+            json.dump(movie, f, indent=2)
+
+
+def run(titles: int = 20_000, repeat: int = 3) -> List[Dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as root:
+        write_files(root, titles)
+        checked, failures = validate_corpus(root, DEFAULT_SCHEMA, workers=0)
+        if failures:
+            path, errors = next(iter(failures.items()))
+            raise AssertionError(f"synthetic corpus is invalid: {path}: {errors[0]}")
+        for label, workers in (("serial", 0), ("pool", None)):
+            results.append(harness.bench(
+                f"validate_corpus/{label}/{titles}",
+                lambda: validate_corpus(root, DEFAULT_SCHEMA, workers=workers),
+                checked, repeat,
+            ))
+    return results
+
+
+if __name__ == "__main__":
+    titles = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    harness.print_results(run(titles))
@@ -0,0 +1,99 @@
+"""
+FilterFlix Benchmark Harness
+Small timing helpers shared by the bench_*.py scripts
+
+Benchmarks run offline against synthetic data or stored fixtures and report
+the best of several repeats, which is the least noisy number on a busy box.
+"""
+
+import importlib.util
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRAPERS_DIR = os.path.join(os.path.dirname(BENCH_DIR), "scrapers")
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+
+# The scrapers import their helper modules as top-level names
+if SCRAPERS_DIR not in sys.path:
+    sys.path.insert(0, SCRAPERS_DIR)
+
+_scripts: Dict[str, object] = {}
+
+
+def load_script(filename: str, directory: str = SCRAPERS_DIR):
+    """Import a hyphen-named script (from scripts/scrapers by default) as a module"""
+    if filename not in _scripts:
+        path = os.path.join(directory, filename)
+        name = os.path.splitext(filename)[0].replace("-", "_")
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _scripts[filename] = module
+    return _scripts[filename]
+
+
+class FixtureAdapter:
+    """
+    requests transport adapter that answers every GET with a stored page
+
+    Mounted on a scraper's session so scrape_parents_guide runs end to end
+    (request, response, parse) without touching the network.
+    """
+
+    def __init__(self, body: bytes):
+        import requests
+
+        self._requests = requests
+        self.body = body
+
+    def send(self, request, **kwargs):
+        response = self._requests.Response()
+        response.status_code = 200
+        response.url = request.url
+        response.request = request
+        response.encoding = "utf-8"
+        response.headers["Content-Type"] = "text/html; charset=utf-8"
+        response._content = self.body
+        return response
+
+    def close(self):
+        pass
+
+
+def bench(name: str, fn: Callable[[], object], items: int, repeat: int = 5) -> Dict:
+    """
+    Time fn() `repeat` times
+
+    Args:
+        name: Label for the report
+        fn: Zero-argument callable doing one full run
+        items: Units of work per run, used for the throughput figure
+
+    Returns:
+        Result dict with best/median seconds and items per second
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    return {
+        "name": name,
+        "items": items,
+        "repeat": repeat,
+        "best_s": best,
+        "median_s": statistics.median(timings),
+        "items_per_s": items / best if best > 0 else float("inf"),
+    }
+
+
+def print_results(results: List[Dict]):
+    width = max(len(r["name"]) for r in results)
+    for r in results:
+        print(f"{r['name']:<{width}}  {r['items']:>9,} items  "
+              f"best {r['best_s'] * 1000:10.2f} ms  {r['items_per_s']:>14,.0f} items/s")
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+FilterFlix IMDb Stand-in Server
+Serves Parents Guide pages locally so the scraper can be load tested offline
+
+Answers GET /title/{imdb_id}/parentalguide with a page rendered by pages.py
+(synthetic warnings seeded by the ID, so every title is stable across runs)
+or, with --fixtures, with the recorded pages in fixtures/. Knobs shape the
+traffic the scraper sees:
+
+    --layout         legacy, current, or mixed (alternating by ID)
+    --latency        seconds added to every response, +- --jitter
+    --error-rate     fraction of requests answered 500
+    --throttle-rate  fraction of requests answered 429 with Retry-After
+    --max-rps        answer 429 whenever the last second saw more requests
+    --padding        page size multiplier (navigation/script noise)
+
+GET /stats returns the counts of each kind of response as JSON.
+
+Usage:
+    python imdb_standin.py --port 8788 --latency 0.05 --throttle-rate 0.01
+    python imdb-scraper.py tt0000001 120 tt0000002 130 --base-url http://127.0.0.1:8788
+"""
+
+import argparse
+import collections
+import functools
+import glob
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from pages import RENDERERS, synthetic_warnings
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+LAYOUTS = ("legacy", "current", "mixed")
+
+GUIDE_PATH = re.compile(r"^/title/(tt\d+)/parentalguide/?$")
+
+
+def load_fixtures(layout: str) -> List[bytes]:
+    """Recorded pages for the layout (fixtures/parentalguide-<layout>.html)"""
+    pattern = "*" if layout == "mixed" else layout
+    paths = sorted(glob.glob(os.path.join(FIXTURES_DIR, f"parentalguide-{pattern}.html")))
+    if not paths:
+        raise FileNotFoundError(f"no fixtures for layout {layout!r} in {FIXTURES_DIR}")
+    pages = []
+    for path in paths:
+        with open(path, "rb") as f:
+            pages.append(f.read())
+    return pages
+
+
+class StandInServer:
+    """
+    Threaded HTTP server imitating IMDb's Parents Guide pages
+
+    Usable from a benchmark in-process (start()/stop(), or as a context
+    manager) or as a subprocess through the CLI.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        layout: str = "mixed",
+        fixtures: bool = False,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: int = 1,
+        max_rps: Optional[float] = None,
+        padding: int = 1,
+        seed: int = 0,
+    ):
+        if layout not in LAYOUTS:
+            raise ValueError(f"unknown layout {layout!r} (expected one of {', '.join(LAYOUTS)})")
+        self.layout = layout
+        self.fixtures = load_fixtures(layout) if fixtures else None
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.max_rps = max_rps
+        self.padding = padding
+        self.rng = random.Random(seed)
+        self.stats: Dict[str, int] = collections.Counter()
+        self.recent: collections.deque = collections.deque()
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+        # Render each title once; repeat requests are served from memory
+        self.page = functools.lru_cache(maxsize=4096)(self._render)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _render(self, imdb_id: str) -> bytes:
+        """The page served for imdb_id"""
+        number = int(imdb_id[2:])
+        if self.fixtures is not None:
+            return self.fixtures[number % len(self.fixtures)]
+        layout = self.layout
+        if layout == "mixed":
+            layout = ("legacy", "current")[number % 2]
+        html = RENDERERS[layout](imdb_id, f"Stand-in Title {number}", synthetic_warnings(number),
+                                 padding=self.padding, seed=number)
+        return html.encode("utf-8")
+
+    def decide(self) -> int:
+        """Status for the next guide request, after the injected faults"""
+        now = time.monotonic()
+        with self._lock:
+            if self.max_rps is not None:
+                self.recent.append(now)
+                while self.recent and now - self.recent[0] > 1.0:
+                    self.recent.popleft()
+                if len(self.recent) > self.max_rps:
+                    return 429
+            roll = self.rng.random()
+        if roll < self.throttle_rate:
+            return 429
+        if roll < self.throttle_rate + self.error_rate:
+            return 500
+        return 200
+
+    def delay(self) -> float:
+        if not self.latency and not self.jitter:
+            return 0.0
+        with self._lock:
+            return max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: bytes = b"", content_type: str = "text/html; charset=utf-8",
+                      headers: Optional[Dict[str, str]] = None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == "/stats":
+                    with server._lock:
+                        body = json.dumps(dict(server.stats)).encode()
+                    self._send(200, body, "application/json")
+                    return
+
+                match = GUIDE_PATH.match(self.path.split("?", 1)[0])
+                if not match:
+                    server.count("not_found")
+                    self._send(404, b"Not Found", "text/plain")
+                    return
+
+                delay = server.delay()
+                if delay:
+                    time.sleep(delay)
+                status = server.decide()
+                if status == 429:
+                    server.count("throttled")
+                    self._send(429, b"Too Many Requests", "text/plain",
+                               {"Retry-After": str(server.retry_after)})
+                elif status == 500:
+                    server.count("errors")
+                    self._send(500, b"Internal Server Error", "text/plain")
+                else:
+                    server.count("pages")
+                    self._send(200, server.page(match.group(1)))
+
+        return Handler
+
+    def count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve IMDb-like Parents Guide pages for load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8788)
+    parser.add_argument("--layout", choices=LAYOUTS, default="mixed",
+                        help="Page layout (mixed alternates legacy and current by ID)")
+    parser.add_argument("--fixtures", action="store_true",
+                        help="Serve the recorded pages in fixtures/ instead of synthetic ones")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform +- jitter on --latency, in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429s (default: 1)")
+    parser.add_argument("--max-rps", type=float, help="Answer 429 above this many requests per second")
+    parser.add_argument("--padding", type=int, default=1, help="Page size multiplier (default: 1)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for latency jitter and fault injection")
+    args = parser.parse_args()
+
+    try:
+        server = StandInServer(
+            args.host, args.port, args.layout, args.fixtures, args.latency, args.jitter,
+            args.error_rate, args.throttle_rate, args.retry_after, args.max_rps, args.padding, args.seed,
+        )
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Serving Parents Guide pages on {server.url}", file=sys.stderr)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+FilterFlix Synthetic Parents Guide Pages
+Renders IMDb-like Parents Guide HTML in the layouts the scraper understands
+
+    legacy   - the older page: <section id="advisory-..."> with
+               li.ipl-zebra-list__item entries and an h3[itemprop="name"] title
+    current  - the newer page: ipc-page-section blocks headed by
+               <span id="nudity">Sex &amp; Nudity</span> and a hero title block
+
+Both layouts carry navigation, script and footer noise so parse costs are
+in the same range as real pages. `padding` scales that noise.
+"""
+
+import html
+import json
+import random
+from typing import Dict, List
+
+# (category, legacy section id, current-layout span id, heading)
+SECTIONS = [
+    ("nudity", "advisory-nudity", "nudity", "Sex &amp; Nudity"),
+    ("violence", "advisory-violence", "violence", "Violence &amp; Gore"),
+    ("profanity", "advisory-profanity", "profanity", "Profanity"),
+    ("substances", "advisory-alcohol", "alcohol", "Alcohol, Drugs &amp; Smoking"),
+    ("frightening", "advisory-frightening", "frightening", "Frightening &amp; Intense Scenes"),
+]
+
+WARNING_TEXT = {
+    "nudity": ["A couple kisses passionately in a bedroom scene.", "Brief implied sex, nothing graphic is shown.",
+               "A man is seen shirtless on the beach.", "Women in bikinis at a party near the end."],
+    "violence": ["A man is shot in the head about 45 minutes in, with some blood.", "Intense aerial combat sequence throughout the climax.",
+                 "A brutal fist fight in the middle of the film.", "Several bodies are shown after an explosion early on."],
+    "profanity": ["Frequent use of the f-word throughout.", "Some mild language in the opening scene.",
+                  "Several uses of religious exclamations.", "One use of a sexual reference."],
+    "substances": ["Characters drink beer at a bar in the beginning.", "A character smokes a cigar during a party.",
+                   "Several scenes of social drinking.", "A man is implied to be drunk later in the film."],
+    "frightening": ["A tense crash sequence may disturb younger viewers.", "Jump scare toward the end.",
+                    "A character is presumed dead for a long stretch.", "Disturbing imagery during the final battle."],
+}
+
+
+def synthetic_warnings(seed: int, per_category: int = 6) -> Dict[str, List[str]]:
+    rng = random.Random(seed)
+    return {
+        category: [f"{rng.choice(lines)} (entry {i + 1})" for i in range(rng.randint(1, per_category))]
+        for category, lines in WARNING_TEXT.items()
+    }
+
+
+def _noise(rng: random.Random, padding: int) -> str:
+    nav = "".join(f'<li><a href="/chart/{i}">Menu item {i}</a></li>' for i in range(20 * padding))
+    blob = json.dumps({"props": {"pageProps": {"items": [rng.random() for _ in range(200 * padding)]}}})
+    return (f'<nav class="navbar"><ul>{nav}</ul></nav>'
+            f'<script id="__NEXT_DATA__" type="application/json">{blob}</script>')
+
+
+def render_legacy_page(imdb_id: str, title: str, warnings: Dict[str, List[str]], padding: int = 1, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    sections = []
+    for category, section_id, _, heading in SECTIONS:
+        items = "".join(
+            f'<li class="ipl-zebra-list__item">{html.escape(text)}'
+            f'<div class="zebra-item-edit-link"><a href="/edit">Edit</a></div></li>'
+            for text in warnings.get(category, [])
+        )
+        sections.append(
+            f'<section id="{section_id}"><h4 class="ipl-list-title">{heading}</h4>'
+            f'<ul class="ipl-zebra-list">{items}</ul></section>'
+        )
+    return (
+        f'<!DOCTYPE html><html><head><title>{html.escape(title)} (2022) - Parents Guide - IMDb</title></head>'
+        f'<body>{_noise(rng, padding)}<div id="main">'
+        f'<div class="subpage_title_block"><h3 itemprop="name"><a href="/title/{imdb_id}/">{html.escape(title)}</a>'
+        f'<span class="nobr">(2022)</span></h3></div>'
+        f'<h2>Parents Guide</h2>{"".join(sections)}</div>'
+        f'<footer><p>&copy; 1990-2025 by IMDb.com, Inc.</p></footer></body></html>'
+    )
+
+
+def render_current_page(imdb_id: str, title: str, warnings: Dict[str, List[str]], padding: int = 1, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    sections = []
+    for category, _, span_id, heading in SECTIONS:
+        items = "".join(
+            f'<li class="ipc-metadata-list__item"><div class="ipc-html-content-inner-div">{html.escape(text)}</div></li>'
+            for text in warnings.get(category, [])
+        )
+        sections.append(
+            f'<section class="ipc-page-section" data-testid="sub-section-{category}">'
+            f'<div class="ipc-title"><h3 class="ipc-title__text"><span id="{span_id}">{heading}</span></h3></div>'
+            f'<ul class="ipc-metadata-list">{items}</ul></section>'
+        )
+    return (
+        f'<!DOCTYPE html><html><head><title>{html.escape(title)} (2022) - Parents guide - IMDb</title></head>'
+        f'<body>{_noise(rng, padding)}<main>'
+        f'<div class="hero"><h2 data-testid="hero-title-block__title">{html.escape(title)}</h2></div>'
+        f'{"".join(sections)}</main>'
+        f'<footer><p>&copy; 1990-2025 by IMDb.com, Inc.</p></footer></body></html>'
+    )
+
+
+RENDERERS = {"legacy": render_legacy_page, "current": render_current_page}
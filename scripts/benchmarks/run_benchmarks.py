@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+FilterFlix Benchmark Suite
+Runs the bench_*.py benchmarks, records the results as JSON and compares runs
+
+Every benchmark runs offline (synthetic data, stored fixtures, or a local
+subprocess). A run writes results/<timestamp>.json with the git commit and
+interpreter next to each result, so two runs can be diffed before a deploy:
+a benchmark whose best time grew by more than --threshold is reported as a
+regression and makes the command exit 1.
+
+Profiles pick the input sizes:
+    quick    small inputs, about a minute
+    default  the sizes each bench_*.py uses on its own
+    full     default plus the 100,000-title catalog
+
+Usage:
+    python run_benchmarks.py                              # default profile, all suites
+    python run_benchmarks.py --profile quick --only pipeline estimation
+    python run_benchmarks.py --baseline results/20260101-120000.json
+    python run_benchmarks.py --compare results/old.json results/new.json
+"""
+
+import argparse
+import importlib
+import importlib.util
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import harness
+
+RESULTS_DIR = os.path.join(harness.BENCH_DIR, "results")
+
+# suite -> (module, {profile: run() keyword arguments})
+SUITES = {
+    "estimation": ("bench_estimation", {
+        "quick": {"count": 20_000}, "default": {}, "full": {"count": 1_000_000},
+    }),
+    "parsing": ("bench_parsing", {
+        "quick": {"repeat": 2, "pages_per_run": 5}, "default": {}, "full": {},
+    }),
+    "grouping": ("bench_grouping", {
+        "quick": {"sizes": (10**3, 10**5)}, "default": {}, "full": {},
+    }),
+    "pipeline": ("bench_pipeline", {
+        "quick": {"sizes": (5, 1_000)}, "default": {}, "full": {"sizes": (5, 1_000, 10_000, 100_000)},
+    }),
+    "packed": ("bench_packed", {
+        "quick": {"titles": 10_000}, "default": {}, "full": {},
+    }),
+    "validation": ("bench_validation", {
+        "quick": {"titles": 5_000}, "default": {}, "full": {"titles": 100_000, "repeat": 1},
+    }),
+    "analytics": ("bench_analytics", {
+        "quick": {"titles": 5_000}, "default": {}, "full": {"titles": 100_000, "repeat": 1},
+    }),
+    "store": ("bench_store", {
+        "quick": {"titles": 5_000}, "default": {}, "full": {"titles": 100_000, "repeat": 1},
+    }),
+    "artifacts": ("bench_artifacts", {
+        "quick": {"titles": 200}, "default": {}, "full": {"titles": 5_000, "repeat": 1},
+    }),
+    "skills": ("bench_skills", {
+        "quick": {"count": 10_000}, "default": {}, "full": {"count": 200_000, "repeat": 1},
+    }),
+    "server": ("bench_server", {
+        "quick": {"titles": 1_000, "requests": 5_000}, "default": {}, "full": {},
+    }),
+    "scrape": ("bench_scrape", {
+        "quick": {"titles": 200, "concurrency": (8,)}, "default": {}, "full": {"titles": 5_000},
+    }),
+}
+
+# Suites that need more than the scraper's own dependencies
+REQUIRES = {"packed": "numpy", "analytics": "numpy"}
+
+# Not run unless named with --only (start a server subprocess)
+OPT_IN = {"server", "scrape"}
+
+DEFAULT_THRESHOLD = 0.10
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=harness.BENCH_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suites(names: List[str], profile: str) -> Dict:
+    results = []
+    skipped = {}
+    for name in names:
+        module_name, profiles = SUITES[name]
+        requirement = REQUIRES.get(name)
+        if requirement and importlib.util.find_spec(requirement) is None:
+            skipped[name] = f"{requirement} is not installed"
+            print(f"[{name}] skipped: {skipped[name]}", file=sys.stderr)
+            continue
+
+        print(f"[{name}] running ({profile})", file=sys.stderr)
+        started = time.perf_counter()
+        suite_results = importlib.import_module(module_name).run(**profiles[profile])
+        for result in suite_results:
+            result["suite"] = name
+        results.extend(suite_results)
+        print(f"[{name}] {len(suite_results)} results in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    return {
+        "created": datetime.utcnow().isoformat() + "Z",
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "profile": profile,
+        "skipped": skipped,
+        "results": results,
+    }
+
+
+def metric(result: Dict) -> Optional[float]:
+    """Lower-is-better figure of a result: best run time, or p99 latency for the server"""
+    if "best_s" in result:
+        return result["best_s"]
+    if "p99_ms" in result:
+        return result["p99_ms"] / 1000
+    return None
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """
+    Match results by name and compute the relative change
+
+    Returns:
+        One row per benchmark present in both runs, with `change` (0.25 = 25%
+        slower) and `regression` set when the change exceeds threshold
+    """
+    before = {r["name"]: metric(r) for r in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        old, new = before.get(result["name"]), metric(result)
+        if not old or new is None:
+            continue
+        change = new / old - 1
+        rows.append({"name": result["name"], "baseline_s": old, "current_s": new,
+                     "change": change, "regression": change > threshold})
+    return rows
+
+
+def print_comparison(rows: List[Dict]):
+    if not rows:
+        print("No benchmarks in common")
+        return
+    width = max(len(r["name"]) for r in rows)
+    for r in rows:
+        flag = "  REGRESSION" if r["regression"] else ""
+        print(f"{r['name']:<{width}}  {r['baseline_s'] * 1000:10.2f} ms -> {r['current_s'] * 1000:10.2f} ms  "
+              f"{r['change']:+7.1%}{flag}")
+
+
+def load(path: str) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the FilterFlix benchmark suite")
+    parser.add_argument("--only", nargs="+", choices=sorted(SUITES), help="Suites to run (default: all but server)")
+    parser.add_argument("--profile", choices=["quick", "default", "full"], default="default")
+    parser.add_argument("--output", help="Results file (default: results/<timestamp>.json)")
+    parser.add_argument("--baseline", help="Earlier results file to compare this run against")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="Compare two results files without running anything")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative slowdown reported as a regression (default: 0.10)")
+    args = parser.parse_args()
+
+    if args.compare:
+        rows = compare(load(args.compare[0]), load(args.compare[1]), args.threshold)
+        print_comparison(rows)
+        sys.exit(1 if any(r["regression"] for r in rows) else 0)
+
+    names = args.only or [name for name in SUITES if name not in OPT_IN]
+    run = run_suites(names, args.profile)
+    harness.print_results([r for r in run["results"] if "best_s" in r])
+
+    output = args.output or os.path.join(RESULTS_DIR, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(run, f, indent=2)
+        f.write("\n")
+    print(f"Results written to {output}", file=sys.stderr)
+
+    if args.baseline:
+        rows = compare(load(args.baseline), run, args.threshold)
+        print_comparison(rows)
+        if any(r["regression"] for r in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
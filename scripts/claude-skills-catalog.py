@@ -19,8 +19,25 @@ Usage:
 
     # Generate install commands
     install_skill('anthropics/skills/frontend-design')
+
+    # Ranked, incremental search (prefix matches of the last word count)
+    rank_skills('react nat')
+
+Lookups go through a SkillIndex built once per catalog and cached on disk,
+so they stay fast on the full skills.sh listing (load_skills).
 """
 
+import bisect
+import hashlib
+import heapq
+import json
+import os
+import re
+import shlex
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 # Full catalog of skills from skills.sh (January 2026)
 skills = [
     "vercel-labs/agent-skills/vercel-react-best-practices",
@@ -239,6 +256,328 @@ FILTERFLIX_RECOMMENDED = {
 }
 
 
+# Concurrent `npx skills add` runs in bulk installs; each one is mostly npx
+# startup and network wait, so a handful in parallel hides that latency
+DEFAULT_INSTALL_JOBS = 4
+
+
+# ============================================================================
+# SEARCH INDEX
+# ============================================================================
+
+INDEX_VERSION = 1
+INDEX_CACHE_DIR = os.path.expanduser('~/.cache/filterflix/skills-index')
+
+# Separators inside skill IDs; a query term is split on the same characters
+TOKEN_SPLIT = re.compile(r'[/\-_.]+')
+
+# Substrings of every token up to this length are indexed; longer query
+# pieces are looked up by intersecting their GRAM_SIZE-character grams
+GRAM_SIZE = 3
+
+# Rank of a query word's best match within a skill ID
+EXACT, PREFIX, SUBSTRING = 3, 2, 1
+
+
+def catalog_hash(skill_ids):
+    """Content hash of a catalog (the disk cache key)."""
+    return hashlib.sha256('\n'.join(skill_ids).encode('utf-8')).hexdigest()
+
+
+def tokenize(text):
+    """Lowercase tokens of a skill ID or query term."""
+    return [token for token in TOKEN_SPLIT.split(text.lower()) if token]
+
+
+class SkillIndex:
+    """
+    Inverted index over the tokens of skill IDs.
+
+    Every query answered here matches what a linear scan over the catalog
+    would return, in catalog order, but only touches the skills that contain
+    the query:
+
+    - vocabulary: the sorted distinct tokens, each with a postings list of
+      the skills using it; bisecting it finds every token with a given
+      prefix (it serves as the prefix trie for incremental search)
+    - grams: every substring of up to GRAM_SIZE characters of every token,
+      mapped to the tokens containing it, for substring queries
+    - sorted_ids: the skill IDs in sorted order, for publisher prefixes
+
+    Example:
+        >>> index = SkillIndex.load(skills)
+        >>> index.search('test')
+        >>> index.rank('react nat', limit=5)
+    """
+
+    def __init__(self, skill_ids, data=None):
+        self.skills = list(skill_ids)
+        self.key = catalog_hash(self.skills)
+        if data is None:
+            data = self._build(self.skills)
+        self.vocabulary = data['vocabulary']
+        self.postings = data['postings']
+        self.grams = data['grams']
+        self.sorted_ids = data['sorted_ids']
+        self.token_ids = {token: i for i, token in enumerate(self.vocabulary)}
+        self._term_cache = {}
+        self._search_cache = {}
+
+    @staticmethod
+    def _build(skill_ids):
+        postings = {}
+        for position, skill in enumerate(skill_ids):
+            for token in set(tokenize(skill)):
+                postings.setdefault(token, []).append(position)
+        vocabulary = sorted(postings)
+
+        grams = {}
+        for token_id, token in enumerate(vocabulary):
+            seen = set()
+            for size in range(1, GRAM_SIZE + 1):
+                for start in range(len(token) - size + 1):
+                    gram = token[start:start + size]
+                    if gram not in seen:
+                        seen.add(gram)
+                        grams.setdefault(gram, []).append(token_id)
+
+        order = sorted(range(len(skill_ids)), key=skill_ids.__getitem__)
+        return {
+            'vocabulary': vocabulary,
+            'postings': [postings[token] for token in vocabulary],
+            'grams': grams,
+            'sorted_ids': [[skill_ids[i], i] for i in order],
+        }
+
+    @classmethod
+    def load(cls, skill_ids, cache_dir=INDEX_CACHE_DIR):
+        """
+        Index for a catalog, read from the disk cache when it has one.
+
+        Args:
+            skill_ids: The catalog
+            cache_dir: Directory of cached indexes, keyed by catalog content
+                       (None disables the cache)
+
+        Returns:
+            SkillIndex
+        """
+        skill_ids = list(skill_ids)
+        if not cache_dir:
+            return cls(skill_ids)
+        path = os.path.join(cache_dir, f'{catalog_hash(skill_ids)}.json')
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                return cls(skill_ids, data)
+        except (OSError, ValueError):
+            pass
+
+        index = cls(skill_ids)
+        index.save(path)
+        return index
+
+    def save(self, path):
+        """Write the index to path atomically; a cache that cannot be written is skipped."""
+        data = {
+            'version': INDEX_VERSION,
+            'vocabulary': self.vocabulary,
+            'postings': self.postings,
+            'grams': self.grams,
+            'sorted_ids': self.sorted_ids,
+        }
+        tmp = f'{path}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    def __len__(self):
+        return len(self.skills)
+
+    def tokens_containing(self, piece):
+        """IDs of vocabulary tokens that contain piece."""
+        if len(piece) <= GRAM_SIZE:
+            return self.grams.get(piece, [])
+        lists = []
+        for start in range(len(piece) - GRAM_SIZE + 1):
+            token_ids = self.grams.get(piece[start:start + GRAM_SIZE])
+            if not token_ids:
+                return []
+            lists.append(token_ids)
+        lists.sort(key=len)
+        candidates = set(lists[0])
+        for token_ids in lists[1:]:
+            candidates.intersection_update(token_ids)
+            if not candidates:
+                return []
+        return [token_id for token_id in candidates if piece in self.vocabulary[token_id]]
+
+    def tokens_with_prefix(self, prefix):
+        """IDs of vocabulary tokens that start with prefix."""
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        end = start
+        while end < len(self.vocabulary) and self.vocabulary[end].startswith(prefix):
+            end += 1
+        return range(start, end)
+
+    def _positions(self, token_ids):
+        positions = set()
+        for token_id in token_ids:
+            positions.update(self.postings[token_id])
+        return positions
+
+    def term_positions(self, term):
+        """
+        Positions of the skills whose lowercased ID contains term.
+
+        Each separator-free piece of the term lies inside one token of a
+        matching skill, so intersecting the pieces' postings leaves a
+        superset that is then checked against the whole term.
+        """
+        term = term.lower()
+        cached = self._term_cache.get(term)
+        if cached is not None:
+            return cached
+
+        pieces = tokenize(term)
+        if not pieces:
+            positions = {i for i, skill in enumerate(self.skills) if term in skill.lower()}
+        else:
+            positions = None
+            for piece in sorted(set(pieces), key=len, reverse=True):
+                matches = self._positions(self.tokens_containing(piece))
+                positions = matches if positions is None else positions & matches
+                if not positions:
+                    break
+            if len(pieces) > 1 or pieces[0] != term:
+                positions = {i for i in positions if term in self.skills[i].lower()}
+
+        if len(self._term_cache) >= 4096:
+            self._term_cache.clear()
+        self._term_cache[term] = positions
+        return positions
+
+    def search(self, *terms):
+        """Skills containing any of the terms, in catalog order."""
+        key = tuple(sorted({term.lower() for term in terms}))
+        cached = self._search_cache.get(key)
+        if cached is None:
+            positions = set()
+            for term in key:
+                positions |= self.term_positions(term)
+            cached = [self.skills[i] for i in sorted(positions)]
+            if len(self._search_cache) >= 1024:
+                self._search_cache.clear()
+            self._search_cache[key] = cached
+        return list(cached)
+
+    def with_prefix(self, prefix):
+        """Skills whose ID starts with prefix (case-sensitive), in catalog order."""
+        start = bisect.bisect_left(self.sorted_ids, [prefix])
+        positions = []
+        for skill, position in self.sorted_ids[start:]:
+            if not skill.startswith(prefix):
+                break
+            positions.append(position)
+        return [self.skills[i] for i in sorted(positions)]
+
+    def rank(self, query, limit=20):
+        """
+        Skills matching every word of the query, best first.
+
+        A word scores EXACT when it is a whole token of the skill ID, PREFIX
+        when a token starts with it and SUBSTRING otherwise; the last word is
+        treated as still being typed, so prefixes of it rank like whole
+        words. Ties go to the shorter ID, then to catalog order (popularity).
+        A single word with at least limit prefix matches never looks at
+        substring matches, which could not outrank them.
+
+        Args:
+            query: Space-separated words
+            limit: Maximum number of results
+
+        Returns:
+            List of skill IDs
+        """
+        words = query.lower().split()
+        if not words:
+            return []
+        scores = None
+        for n, word in enumerate(words):
+            word_scores = {}
+            pieces = tokenize(word)
+            if len(pieces) == 1 and pieces[0] == word:
+                prefix_rank = EXACT if n == len(words) - 1 else PREFIX
+                for token_id in self.tokens_with_prefix(word):
+                    rank = EXACT if self.vocabulary[token_id] == word else prefix_rank
+                    for position in self.postings[token_id]:
+                        if word_scores.get(position, 0) < rank:
+                            word_scores[position] = rank
+            if len(words) > 1 or len(word_scores) < limit:
+                for position in self.term_positions(word):
+                    word_scores.setdefault(position, SUBSTRING)
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {i: score + word_scores[i] for i, score in scores.items() if i in word_scores}
+            if not scores:
+                return []
+        best = heapq.nsmallest(limit, scores.items(),
+                               key=lambda item: (-item[1], len(self.skills[item[0]]), item[0]))
+        return [self.skills[i] for i, _ in best]
+
+
+_index = None
+
+
+def get_index():
+    """
+    The search index of the current catalog, built (or read from the disk
+    cache) on first use and rebuilt whenever the catalog no longer matches
+    the skills it was built from, including same-length edits in place.
+    """
+    global _index
+    # List equality is what comparing catalog_hash would decide, without
+    # hashing the whole catalog on every query
+    if _index is None or _index.skills != skills:
+        _index = SkillIndex.load(skills)
+    return _index
+
+
+def load_skills(path):
+    """
+    Replace the catalog with the skill IDs in a file.
+
+    Args:
+        path: Text file with one skill ID per line ('#' starts a comment),
+              or a JSON list of skill IDs
+
+    Returns:
+        Number of skills loaded
+
+    Example:
+        >>> load_skills('skills-sh-mirror.txt')
+    """
+    global _index
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    if text.lstrip().startswith('['):
+        skill_ids = json.loads(text)
+    else:
+        skill_ids = [line.split('#', 1)[0].strip() for line in text.splitlines()]
+    skills[:] = [skill_id for skill_id in skill_ids if skill_id]
+    _index = None
+    return len(skills)
+
+
 # ============================================================================
 # UTILITY FUNCTIONS
 # ============================================================================
@@ -257,7 +596,6 @@ def get_skills_by_category(*categories):
         >>> get_skills_by_category('frontend', 'react')
         >>> get_skills_by_category('marketing')
     """
-    matching_skills = []
     search_terms = set()
 
     # Gather all search terms from category mappings
@@ -268,13 +606,7 @@ def get_skills_by_category(*categories):
         else:
             search_terms.add(cat_lower)
 
-    # Search through skills
-    for skill in skills:
-        skill_lower = skill.lower()
-        if any(term in skill_lower for term in search_terms):
-            matching_skills.append(skill)
-
-    return matching_skills
+    return get_index().search(*search_terms)
 
 
 def get_skills_by_publisher(publisher):
@@ -290,7 +622,7 @@ def get_skills_by_publisher(publisher):
     Example:
         >>> get_skills_by_publisher('anthropics')
     """
-    return [skill for skill in skills if skill.startswith(f"{publisher}/")]
+    return get_index().with_prefix(f"{publisher}/")
 
 
 def get_filterflix_recommendations(category=None):
@@ -313,6 +645,31 @@ def get_filterflix_recommendations(category=None):
     return FILTERFLIX_RECOMMENDED
 
 
+def collect_recommendations(*categories):
+    """
+    Recommended skills of several categories, each skill once.
+
+    Args:
+        *categories: FILTERFLIX_RECOMMENDED category names
+
+    Returns:
+        List of skill IDs in category order, without the skills shared
+        between categories repeated
+
+    Raises:
+        KeyError: For an unknown category
+
+    Example:
+        >>> collect_recommendations('extension_development', 'automation')
+    """
+    skill_ids = []
+    for category in categories:
+        if category not in FILTERFLIX_RECOMMENDED:
+            raise KeyError(category)
+        skill_ids.extend(FILTERFLIX_RECOMMENDED[category])
+    return list(dict.fromkeys(skill_ids))
+
+
 def generate_install_command(skill_id):
     """
     Generate npx install command for a skill.
@@ -330,29 +687,68 @@ def generate_install_command(skill_id):
     return f"npx skills add {skill_id}"
 
 
-def generate_bulk_install_script(skill_ids, output_file='install-skills.sh'):
+def generate_bulk_install_script(skill_ids, output_file='install-skills.sh', jobs=DEFAULT_INSTALL_JOBS):
     """
     Generate a shell script to install multiple skills.
 
+    The script installs each skill once, up to `jobs` at a time (JOBS=n in
+    the environment overrides it). A failed install does not stop the
+    others: its output is kept in a log, and the script lists the failures
+    with the total time at the end and exits 1.
+
     Args:
-        skill_ids: List of skill IDs
+        skill_ids: List of skill IDs (duplicates are installed once)
         output_file: Output filename for the script
+        jobs: Number of installs to run at the same time
 
     Example:
-        >>> recommendations = get_filterflix_recommendations('extension_development')
+        >>> recommendations = collect_recommendations('extension_development', 'automation')
         >>> generate_bulk_install_script(recommendations, 'install-dev-skills.sh')
     """
+    skill_ids = list(dict.fromkeys(skill_ids))
     with open(output_file, 'w') as f:
         f.write('#!/bin/bash\n')
         f.write('# Auto-generated skill installation script\n')
-        f.write(f'# Generated: {__import__("datetime").datetime.utcnow().isoformat()}Z\n\n')
-        f.write('set -e  # Exit on error\n\n')
+        f.write(f'# Generated: {__import__("datetime").datetime.utcnow().isoformat()}Z\n')
+        f.write(f'# Installs {len(skill_ids)} skills, JOBS at a time; failures are listed at the end\n\n')
 
-        for skill_id in skill_ids:
-            f.write(f'echo "Installing {skill_id}..."\n')
-            f.write(f'{generate_install_command(skill_id)}\n\n')
+        f.write(f'JOBS=${{JOBS:-{max(1, jobs)}}}\n')
+        f.write('# At least one install at a time, whatever JOBS says\n')
+        f.write('if ! [ "$JOBS" -ge 1 ] 2>/dev/null; then JOBS=1; fi\n')
+        f.write('LOG_DIR=$(mktemp -d)\n')
+        f.write('START=$SECONDS\n\n')
 
-        f.write('echo "All skills installed successfully!"\n')
+        f.write('SKILLS=(\n')
+        for skill_id in skill_ids:
+            f.write(f'    {shlex.quote(skill_id)}\n')
+        f.write(')\n\n')
+
+        install_command = generate_install_command('"$1"')
+        f.write('install() {\n')
+        f.write('    local log="$LOG_DIR/$2.log" start=$SECONDS\n')
+        f.write(f'    if {install_command} >"$log" 2>&1; then\n')
+        f.write('        echo "Installed $1 ($((SECONDS - start))s)"\n')
+        f.write('    else\n')
+        f.write('        echo "FAILED $1 ($((SECONDS - start))s), see $log"\n')
+        f.write('        echo "$1" >>"$LOG_DIR/failed"\n')
+        f.write('    fi\n')
+        f.write('}\n\n')
+
+        f.write('for i in "${!SKILLS[@]}"; do\n')
+        f.write('    # wait -n needs bash 4.3; older shells poll instead\n')
+        f.write('    while [ "$(jobs -rp | wc -l)" -ge "$JOBS" ]; do wait -n 2>/dev/null || sleep 0.2; done\n')
+        f.write('    install "${SKILLS[$i]}" "$i" &\n')
+        f.write('done\n')
+        f.write('wait\n\n')
+
+        f.write('if [ -s "$LOG_DIR/failed" ]; then\n')
+        f.write('    echo "$(wc -l <"$LOG_DIR/failed" | tr -d \' \') of ${#SKILLS[@]} skills failed'
+                ' ($((SECONDS - START))s):"\n')
+        f.write('    sed \'s/^/  /\' "$LOG_DIR/failed"\n')
+        f.write('    exit 1\n')
+        f.write('fi\n')
+        f.write('rm -rf "$LOG_DIR"\n')
+        f.write('echo "All ${#SKILLS[@]} skills installed successfully ($((SECONDS - START))s)"\n')
 
     # Make executable
     import os
@@ -361,6 +757,53 @@ def generate_bulk_install_script(skill_ids, output_file='install-skills.sh'):
     return output_file
 
 
+def install_skills(skill_ids, jobs=DEFAULT_INSTALL_JOBS, timeout=None, progress=None):
+    """
+    Install skills now, up to `jobs` at a time.
+
+    Each skill is installed once. A failure (non-zero exit, timeout, npx
+    missing) is recorded for that skill and the other installs carry on.
+
+    Args:
+        skill_ids: List of skill IDs (duplicates are installed once)
+        jobs: Number of installs to run at the same time
+        timeout: Seconds to allow each install (None waits indefinitely)
+        progress: Optional callable given each result as it completes
+
+    Returns:
+        List of result dicts in the order of skill_ids, each with 'skill',
+        'ok', 'seconds' and 'output' (the install's combined output)
+
+    Example:
+        >>> results = install_skills(collect_recommendations('backend_api', 'automation'))
+        >>> [r['skill'] for r in results if not r['ok']]
+    """
+    skill_ids = list(dict.fromkeys(skill_ids))
+
+    def install(skill_id):
+        start = time.perf_counter()
+        try:
+            completed = subprocess.run(shlex.split(generate_install_command(skill_id)),
+                                       stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                       text=True, timeout=timeout)
+            ok, output = completed.returncode == 0, completed.stdout
+        except subprocess.TimeoutExpired:
+            ok, output = False, f'timed out after {timeout}s'
+        except OSError as e:
+            ok, output = False, str(e)
+        return {'skill': skill_id, 'ok': ok, 'seconds': time.perf_counter() - start, 'output': output}
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = [pool.submit(install, skill_id) for skill_id in skill_ids]
+        for future in as_completed(futures):
+            result = future.result()
+            results[result['skill']] = result
+            if progress:
+                progress(result)
+    return [results[skill_id] for skill_id in skill_ids]
+
+
 def search_skills(query):
     """
     Search skills by keyword.
@@ -375,8 +818,25 @@ def search_skills(query):
         >>> search_skills('testing')
         >>> search_skills('design')
     """
-    query_lower = query.lower()
-    return [skill for skill in skills if query_lower in skill.lower()]
+    return get_index().search(query)
+
+
+def rank_skills(query, limit=20):
+    """
+    Ranked search for incremental (search-as-you-type) lookups.
+
+    Args:
+        query: Space-separated words; the last may be a partial word
+        limit: Maximum number of results
+
+    Returns:
+        List of skill IDs matching every word, best match first
+
+    Example:
+        >>> rank_skills('react nat')
+        ['callstackincubator/agent-skills/react-native-best-practices', ...]
+    """
+    return get_index().rank(query, limit)
 
 
 def list_publishers():
@@ -422,6 +882,11 @@ def main():
     """Command-line interface for the skills catalog."""
     import sys
 
+    # --catalog FILE searches a local mirror of skills.sh instead
+    if len(sys.argv) > 2 and sys.argv[1] == '--catalog':
+        load_skills(sys.argv[2])
+        del sys.argv[1:3]
+
     if len(sys.argv) < 2:
         print(__doc__)
         print("\nCommands:")
@@ -429,11 +894,15 @@ def main():
         print("  publishers                    - List all publishers")
         print("  tree                          - Show skills in tree format")
         print("  search <query>                - Search for skills")
+        print("  rank <words...>               - Ranked search (last word may be partial)")
         print("  category <category>           - Get skills by category")
         print("  publisher <name>              - Get skills by publisher")
         print("  recommend [category]          - FilterFlix recommendations")
         print("  install <skill-id>            - Generate install command")
-        print("  bulk-install <category>       - Generate bulk install script")
+        print("  bulk-install <category>...    - Generate bulk install script")
+        print("      [--jobs N] [--run]          (N installs at a time; --run installs now)")
+        print("\nOptions (before the command):")
+        print("  --catalog <file>              - Use a catalog file, one skill ID per line")
         print("\nCategories:")
         for cat in sorted(SKILL_CATEGORIES.keys()):
             print(f"  - {cat}")
@@ -459,6 +928,11 @@ def main():
         for skill in results:
             print(skill)
 
+    elif command == 'rank' and len(sys.argv) > 2:
+        query = ' '.join(sys.argv[2:])
+        for skill in rank_skills(query):
+            print(skill)
+
     elif command == 'category' and len(sys.argv) > 2:
         category = sys.argv[2]
         results = get_skills_by_category(category)
@@ -493,19 +967,55 @@ def main():
         print(generate_install_command(skill_id))
 
     elif command == 'bulk-install' and len(sys.argv) > 2:
-        category = sys.argv[2]
-        recommendations = get_filterflix_recommendations(category)
-        if recommendations:
+        args = sys.argv[2:]
+        jobs = DEFAULT_INSTALL_JOBS
+        if '--jobs' in args:
+            at = args.index('--jobs')
+            value = args[at + 1] if at + 1 < len(args) else ''
+            if not value.isdigit() or int(value) < 1:
+                print("Usage: claude-skills-catalog.py bulk-install <category>... [--jobs N] [--run]", file=sys.stderr)
+                print(f"--jobs must be a whole number of at least 1, got {value or 'nothing'!r}", file=sys.stderr)
+                sys.exit(1)
+            jobs = int(value)
+            del args[at:at + 2]
+        run_now = '--run' in args
+        categories = [arg for arg in args if arg != '--run']
+
+        if not categories:
+            print("Usage: claude-skills-catalog.py bulk-install <category>... [--jobs N] [--run]", file=sys.stderr)
+            print(f"Available categories: {', '.join(FILTERFLIX_RECOMMENDED.keys())}", file=sys.stderr)
+            sys.exit(1)
+        unknown = [category for category in categories if category not in FILTERFLIX_RECOMMENDED]
+        if unknown:
+            print(f"Unknown category: {', '.join(unknown)}")
+            print(f"Available categories: {', '.join(FILTERFLIX_RECOMMENDED.keys())}")
+            sys.exit(1)
+        recommendations = collect_recommendations(*categories)
+
+        if run_now:
+            print(f"Installing {len(recommendations)} skills, {jobs} at a time...\n")
+            start = time.perf_counter()
+            results = install_skills(
+                recommendations, jobs,
+                progress=lambda r: print(f"{'Installed' if r['ok'] else 'FAILED'} {r['skill']} ({r['seconds']:.1f}s)"),
+            )
+            failed = [r for r in results if not r['ok']]
+            print(f"\n{len(results) - len(failed)} of {len(results)} skills installed "
+                  f"in {time.perf_counter() - start:.1f}s")
+            for result in failed:
+                print(f"\nFAILED {result['skill']}:")
+                print(result['output'].strip()[-2000:])
+            if failed:
+                sys.exit(1)
+        else:
             output_file = generate_bulk_install_script(
                 recommendations,
-                f'install-{category}-skills.sh'
+                f"install-{'-'.join(categories)}-skills.sh",
+                jobs,
             )
-            print(f"Generated installation script: {output_file}")
+            print(f"Generated installation script: {output_file} ({len(recommendations)} skills)")
             print(f"\nTo install, run:")
             print(f"  ./{output_file}")
-        else:
-            print(f"Unknown category: {category}")
-            print(f"Available categories: {', '.join(FILTERFLIX_RECOMMENDED.keys())}")
 
     else:
         print(f"Unknown command: {command}")
@@ -6,28 +6,83 @@ Combines data from multiple sources and calculates confidence scores
 Usage:
     python aggregate-timestamps.py --imdb tt1745960 --runtime 130 --output top-gun.json
     python aggregate-timestamps.py --batch movies.txt --output-dir ./timestamps/
+    python imdb-scraper.py --ndjson tt1 130 tt2 152 | python aggregate-timestamps.py --ndjson
+
+Batch files list one movie per line: an IMDb ID followed by its source files
+(paths relative to the batch file). Blank lines and # comments are ignored.
+
+    tt1745960  imdb/tt1745960.json  reddit/tt1745960.json
+    tt0468569  imdb/tt0468569.json
+
+With --ndjson, source records are read from stdin, one JSON object per line.
+Consecutive records with the same imdb_id are merged together, so sort the
+stream by imdb_id to merge several sources per title. Each merged title is
+written as soon as its group ends: one compact line on stdout, or a file in
+--output-dir.
+
+Every file is checked against the corpus's schema.json before it is written;
+a title that fails is reported and left unwritten.
+
+With --db, every title that passes and is written (--output, --output-dir)
+is also upserted into a SQLite store (timestamp_store.py) for indexed queries.
 """
 
 import json
 import argparse
+import contextlib
+import itertools
 import os
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, List, Optional
-import hashlib
+from functools import lru_cache
+from typing import Dict, IO, Iterator, List, Optional, Tuple
+
+from catalog_index import CatalogIndex, catalog_entry
+from corpus_analytics import quality_score
+from corpus_io import BuildManifest, hash_files, timestamp_content_hash, write_timestamp_file
+import merge_engine
+from metrics import Metrics
+from profiling import PROFILE_KINDS, profile
+from schema_validation import SchemaValidationError, check as check_schema
+from timestamp_store import TimestampStore
+from versioning import VersionStore
 
+# Bump when merge logic changes so the build manifest rebuilds every movie
+MERGE_VERSION = 4
 
-def merge_timestamps(sources: List[Dict]) -> Dict:
+# Bit order of the playback type masks (bit 0 = nudity)
+PLAYBACK_TYPES = ["nudity", "profanity", "violence", "substances", "frightening"]
+PLAYBACK_VERSION = 1
+MAX_SEVERITY = 10
+
+# Titles upserted into the --db store per transaction
+STORE_BATCH_SIZE = 200
+
+# "auto" uses the NumPy engine (when installed) for titles with at least this
+# many timestamps; below it the array setup costs more than it saves
+MERGE_ENGINES = ("auto", "python", "numpy")
+NUMPY_MIN_TIMESTAMPS = 200
+
+
+def merge_timestamps(sources: List[Dict], engine: str = "python") -> Dict:
     """
     Merge timestamps from multiple sources
 
     Args:
         sources: List of timestamp data objects from different sources
+        engine: "python", "numpy" (merge_engine.py, same output) or "auto"
 
     Returns:
         Merged timestamp object with confidence scores
     """
     if not sources:
         return None
+    if engine not in MERGE_ENGINES:
+        raise ValueError(f"unknown merge engine {engine!r} (expected one of {', '.join(MERGE_ENGINES)})")
+    if engine == "numpy" and not merge_engine.available():
+        raise ImportError("the numpy merge engine needs NumPy: pip install numpy")
 
     # Use first source as base
     merged = {
@@ -50,25 +105,30 @@ def merge_timestamps(sources: List[Dict]) -> Dict:
         platforms.update(source.get("platforms", []))
         if source.get("metadata", {}).get("source"):
             merged["metadata"]["sources"].append(source["metadata"]["source"])
-    merged["platforms"] = list(platforms)
-
-    # Collect all timestamps with source tracking
-    all_timestamps = []
-    for source_idx, source in enumerate(sources):
-        source_name = source.get("metadata", {}).get("source", f"Source {source_idx}")
-        for ts in source.get("timestamps", []):
-            ts_copy = ts.copy()
-            ts_copy["_source"] = source_name
-            ts_copy["_source_idx"] = source_idx
-            all_timestamps.append(ts_copy)
-
-    # Group similar timestamps (within 30 seconds of each other)
-    grouped = group_similar_timestamps(all_timestamps)
-
-    # Merge each group
-    for group in grouped:
-        merged_ts = merge_timestamp_group(group)
-        merged["timestamps"].append(merged_ts)
+    merged["platforms"] = sorted(platforms)
+
+    source_names = [source.get("metadata", {}).get("source", f"Source {source_idx}")
+                    for source_idx, source in enumerate(sources)]
+    by_source = [source.get("timestamps", []) for source in sources]
+    timestamps = None
+    if engine == "numpy" or (engine == "auto" and merge_engine.available()
+                             and sum(map(len, by_source)) >= NUMPY_MIN_TIMESTAMPS):
+        # None when the input has something only the Python path handles
+        timestamps = merge_engine.merge_timestamp_groups(by_source, source_names)
+
+    if timestamps is None:
+        # Collect all timestamps with source tracking
+        all_timestamps = []
+        for source_idx, source_timestamps in enumerate(by_source):
+            for ts in source_timestamps:
+                ts_copy = ts.copy()
+                ts_copy["_source"] = source_names[source_idx]
+                ts_copy["_source_idx"] = source_idx
+                all_timestamps.append(ts_copy)
+
+        # Group similar timestamps (within 30 seconds of each other) and merge each group
+        timestamps = [merge_timestamp_group(group) for group in group_similar_timestamps(all_timestamps)]
+    merged["timestamps"] = timestamps
 
     # Sort by start time
     merged["timestamps"].sort(key=lambda x: x["start"])
@@ -78,51 +138,146 @@ def merge_timestamps(sources: List[Dict]) -> Dict:
         avg_confidence = sum(ts.get("confidence", 0.5) for ts in merged["timestamps"]) / len(merged["timestamps"])
         merged["metadata"]["confidence_score"] = round(avg_confidence, 2)
 
+    merged["playback"] = compile_segment_tables(merged["timestamps"])
+
     return merged
 
 
-def group_similar_timestamps(timestamps: List[Dict], threshold_seconds: int = 30) -> List[List[Dict]]:
+@lru_cache(maxsize=1 << 17)
+def parse_time(value: str) -> int:
+    """Convert HH:MM:SS to seconds (memoized: a day has only 86,400 distinct values)"""
+    parts = value.split(":")
+    return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
+
+
+def compile_segment_tables(timestamps: List[Dict]) -> Dict:
     """
-    Group timestamps that refer to the same scene (within threshold)
+    Precompute the playback lookup tables for every filter setting
+
+    For each type mask (bit i = PLAYBACK_TYPES[i]) and minimum severity 1-10,
+    the matching segments are reduced to sorted integer-second intervals with
+    overlapping or touching ones unioned. Identical tables are stored once;
+    index[mask][min_severity - 1] names the table to use. `refs` holds, per
+    interval, the position in `timestamps` of its earliest segment.
+
+    The player answers "am I filtered, and until when" with one binary search
+    over `starts` instead of re-parsing every segment on each tick.
 
     Args:
-        timestamps: List of timestamp objects
-        threshold_seconds: Time window for grouping
+        timestamps: Final (sorted) timestamp list of a title
 
     Returns:
-        List of groups, each group is a list of related timestamps
+        {"version", "types", "tables": [{"starts", "ends", "refs"}], "index"}
     """
-    if not timestamps:
-        return []
+    segments = sorted(
+        (parse_time(ts["start"]), parse_time(ts["end"]), 1 << PLAYBACK_TYPES.index(ts["type"]),
+         ts.get("severity", 5), position)
+        for position, ts in enumerate(timestamps)
+        if ts.get("type") in PLAYBACK_TYPES
+    )
+    segments = [s for s in segments if s[1] > s[0]]
+
+    # Only the types and severities that occur change a table: settings that
+    # differ elsewhere share the table built for the first of them
+    present = 0
+    for segment in segments:
+        present |= segment[2]
+    severities = sorted({segment[3] for segment in segments})
+    thresholds = [next((s for s in severities if s >= min_severity), None)
+                  for min_severity in range(1, MAX_SEVERITY + 1)]
+
+    tables = []
+    table_ids = {}
+    rows = {}
+    index = []
+    for mask in range(1 << len(PLAYBACK_TYPES)):
+        effective = mask & present
+        if effective not in rows:
+            subset = [segment for segment in segments if segment[2] & effective]
+            built = {}
+            for threshold in dict.fromkeys(thresholds):
+                starts, ends, refs = [], [], []
+                if threshold is not None:
+                    for start, end, _, severity, position in subset:
+                        if severity < threshold:
+                            continue
+                        if starts and start <= ends[-1]:
+                            if end > ends[-1]:
+                                ends[-1] = end
+                        else:
+                            starts.append(start)
+                            ends.append(end)
+                            refs.append(position)
+
+                key = (tuple(starts), tuple(ends), tuple(refs))
+                if key not in table_ids:
+                    table_ids[key] = len(tables)
+                    tables.append({"starts": starts, "ends": ends, "refs": refs})
+                built[threshold] = table_ids[key]
+            rows[effective] = [built[threshold] for threshold in thresholds]
+        index.append(rows[effective])
 
-    # Parse all start times
-    def parse_time(ts):
-        start = ts.get("start", "00:00:00")
-        parts = start.split(":")
-        return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
+    return {
+        "version": PLAYBACK_VERSION,
+        "types": PLAYBACK_TYPES,
+        "tables": tables,
+        "index": index,
+    }
 
-    # Sort by start time
-    sorted_ts = sorted(timestamps, key=parse_time)
 
-    groups = []
-    current_group = [sorted_ts[0]]
-    current_time = parse_time(sorted_ts[0])
+def group_similar_timestamps(timestamps: List[Dict], threshold_seconds: int = 30) -> List[List[Dict]]:
+    """
+    Group timestamps that refer to the same scene
 
-    for ts in sorted_ts[1:]:
-        ts_time = parse_time(ts)
+    Timestamps are partitioned by type and each partition is swept once in
+    start order. A timestamp joins the open cluster when it starts within
+    `threshold_seconds` of the cluster's first start, or when it overlaps
+    the cluster (starts before the furthest end seen so far). Segments of
+    other types in between no longer split a cluster. O(n log n) overall.
 
-        # Check if same category and within threshold
-        if (ts_time - current_time <= threshold_seconds and
-            ts.get("type") == current_group[0].get("type")):
-            current_group.append(ts)
-        else:
-            groups.append(current_group)
-            current_group = [ts]
-            current_time = ts_time
+    Args:
+        timestamps: List of timestamp objects
+        threshold_seconds: Time window for grouping
 
-    groups.append(current_group)
+    Returns:
+        List of groups ordered by their first start, each a list of related
+        timestamps in start order
+    """
+    if not timestamps:
+        return []
 
-    return groups
+    by_type: Dict[str, List[int]] = {}
+    starts = []
+    ends = []
+    for idx, ts in enumerate(timestamps):
+        start = parse_time(ts.get("start", "00:00:00"))
+        starts.append(start)
+        ends.append(parse_time(ts["end"]) if ts.get("end") else start)
+        by_type.setdefault(ts.get("type"), []).append(idx)
+
+    clusters = []
+    for indices in by_type.values():
+        # Stable sort: equal starts keep their input order
+        indices.sort(key=starts.__getitem__)
+
+        current = [indices[0]]
+        anchor = starts[indices[0]]
+        reach = ends[indices[0]]
+        for idx in indices[1:]:
+            start = starts[idx]
+            if start - anchor <= threshold_seconds or start <= reach:
+                current.append(idx)
+                if ends[idx] > reach:
+                    reach = ends[idx]
+            else:
+                clusters.append(current)
+                current = [idx]
+                anchor = start
+                reach = ends[idx]
+        clusters.append(current)
+
+    clusters.sort(key=lambda cluster: (starts[cluster[0]], cluster[0]))
+    return [[timestamps[idx] for idx in cluster] for cluster in clusters]
 
 
 def merge_timestamp_group(group: List[Dict]) -> Dict:
@@ -143,14 +298,10 @@ def merge_timestamp_group(group: List[Dict]) -> Dict:
         ts["sources_count"] = 1
         return ts
 
-    # Multiple sources agree - higher confidence
-    sources = set(ts.get("_source", "Unknown") for ts in group)
+    # Multiple sources agree - higher confidence (first-seen order keeps output stable)
+    sources = list(dict.fromkeys(ts.get("_source", "Unknown") for ts in group))
 
     # Average the times
-    def parse_time(start):
-        parts = start.split(":")
-        return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
-
     def format_time(seconds):
         h = seconds // 3600
         m = (seconds % 3600) // 60
@@ -161,9 +312,8 @@ def merge_timestamp_group(group: List[Dict]) -> Dict:
     avg_end = sum(parse_time(ts["end"]) for ts in group) // len(group)
     avg_severity = sum(ts.get("severity", 5) for ts in group) // len(group)
 
-    # Combine descriptions
-    descriptions = list(set(ts.get("description", "")[:100] for ts in group))
-    combined_desc = " | ".join(descriptions[:3])
+    # Combine descriptions, skipping rewordings of ones already taken
+    combined_desc = merge_engine.combine_descriptions(ts.get("description", "") for ts in group)
 
     # Calculate confidence based on number of sources agreeing
     confidence = min(0.5 + (len(sources) * 0.15), 0.95)
@@ -177,7 +327,7 @@ def merge_timestamp_group(group: List[Dict]) -> Dict:
         "verified": len(sources) >= 3,
         "confidence": round(confidence, 2),
         "sources_count": len(sources),
-        "sources": list(sources),
+        "sources": sources,
     }
 
 
@@ -192,31 +342,422 @@ def calculate_quality_score(timestamp_data: Dict) -> float:
     - Verification status
     """
     timestamps = timestamp_data.get("timestamps", [])
+    # The formula lives in corpus_analytics, which scores the whole corpus
+    return quality_score(
+        len(timestamps),
+        len(set(ts.get("type") for ts in timestamps)),
+        sum(ts.get("confidence", 0.5) for ts in timestamps),
+        sum(1 for ts in timestamps if ts.get("verified")),
+    )
+
+
+def iter_ndjson(stream: IO[str], metrics: Metrics) -> Iterator[Dict]:
+    """Source records from an NDJSON stream, skipping blank, malformed and error records"""
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            print(f"Skipping line {line_number}: invalid JSON ({e})", file=sys.stderr)
+            metrics.count("records_invalid")
+            continue
+        if not isinstance(record, dict) or not record.get("imdb_id") or record.get("error"):
+            reason = record.get("error") if isinstance(record, dict) and record.get("error") else "no imdb_id"
+            print(f"Skipping line {line_number}: {reason}", file=sys.stderr)
+            metrics.count("records_skipped")
+            continue
+        metrics.count("records_read")
+        metrics.count("timestamps_in", len(record.get("timestamps", [])))
+        yield record
+
+
+def run_stream(
+    stream: IO[str],
+    out: IO[str],
+    output_dir: Optional[str] = None,
+    index_path: Optional[str] = None,
+    metrics: Optional[Metrics] = None,
+    engine: str = "python",
+    store_path: Optional[str] = None,
+) -> Dict[str, int]:
+    """
+    Merge NDJSON source records as they arrive
 
-    if not timestamps:
-        return 0.0
+    Only one title's records are held in memory at a time.
 
-    score = 0.0
+    Args:
+        stream: NDJSON source records, grouped by imdb_id
+        out: Where merged records go (one compact line each) without output_dir
+        output_dir: Write <imdb_id>.json files here instead
+        index_path: Catalog index to update (default: the one at the corpus
+            root above output_dir, if any)
+        metrics: Registry for the per-stage metrics
+        engine: Merge engine passed to merge_timestamps
+        store_path: SQLite store (timestamp_store.py) to upsert the titles
+            written to output_dir into
 
-    # Coverage (more timestamps = more thorough)
-    coverage_score = min(len(timestamps) / 20, 1.0) * 0.3
-    score += coverage_score
+    Returns:
+        Counts of merged titles and of files written/unchanged/invalid (not written)
+    """
+    if metrics is None:
+        metrics = Metrics("filterflix_aggregator")
+    index = None
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        index = CatalogIndex(index_path) if index_path else CatalogIndex.for_output(output_dir)
+
+    store = StoreWriter(store_path, metrics) if store_path else None
+
+    counts = {"merged": 0, "written": 0, "unchanged": 0, "invalid": 0}
+    try:
+        for imdb_id, group in itertools.groupby(iter_ndjson(stream, metrics), key=lambda r: r["imdb_id"]):
+            merged = timed_merge(list(group), metrics, engine)
+            counts["merged"] += 1
+            if output_dir:
+                output_path = os.path.join(output_dir, f"{imdb_id}.json")
+                try:
+                    written = write_validated(output_path, merged, metrics)
+                except SchemaValidationError as e:
+                    print(f"Not writing {imdb_id}: {e}", file=sys.stderr)
+                    counts["invalid"] += 1
+                    continue
+                counts["written" if written else "unchanged"] += 1
+                if index is not None:
+                    index.update(output_path, merged)
+                if store is not None:
+                    store.add(merged)
+            else:
+                out.write(json.dumps(merged, separators=(",", ":")) + "\n")
+                out.flush()
+    finally:
+        if index is not None:
+            index.save()
+        if store is not None:
+            store.close()
+    return counts
+
+
+def read_batch_file(batch_path: str) -> List[Tuple[str, List[str]]]:
+    """
+    Read a batch movie list
 
-    # Type variety
-    types = set(ts.get("type") for ts in timestamps)
-    variety_score = len(types) / 5 * 0.2
-    score += variety_score
+    Args:
+        batch_path: Path to the batch file
 
-    # Average confidence
-    avg_confidence = sum(ts.get("confidence", 0.5) for ts in timestamps) / len(timestamps)
-    score += avg_confidence * 0.3
+    Returns:
+        List of (imdb_id, source paths) with paths resolved against the batch file
+    """
+    base_dir = os.path.dirname(os.path.abspath(batch_path))
+    movies = []
+    with open(batch_path) as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            imdb_id, *source_paths = line.split()
+            if not source_paths:
+                raise ValueError(f"{batch_path}:{line_no}: no source files listed for {imdb_id}")
+            movies.append((imdb_id, [os.path.join(base_dir, p) for p in source_paths]))
+    return movies
+
+
+class CheckpointJournal:
+    """
+    Append-only record of finished batch jobs
 
-    # Verification rate
-    verified = sum(1 for ts in timestamps if ts.get("verified"))
-    verification_score = verified / len(timestamps) * 0.2
-    score += verification_score
+    Every completed movie is written as one JSON line and fsynced, so after a
+    crash the next run can skip everything that already made it to disk.
+    Entries carry the hash of the movie's inputs, so a movie whose sources
+    changed since it was journalled is not skipped. run_batch deletes the
+    journal once a run finishes without failures.
+    """
 
-    return round(score, 2)
+    def __init__(self, path: str):
+        self.path = path
+        # imdb_id -> input hash it was completed with
+        self.completed: Dict[str, Optional[str]] = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn final line from an interrupted write
+                    if entry.get("status") == "done":
+                        self.completed[entry["imdb_id"]] = entry.get("inputs")
+        self._file = open(path, "a")
+
+    def is_done(self, imdb_id: str, input_hash: str) -> bool:
+        """True if imdb_id was completed from exactly these inputs"""
+        return imdb_id in self.completed and self.completed[imdb_id] == input_hash
+
+    def record(self, imdb_id: str, status: str, **info):
+        self._file.write(json.dumps({"imdb_id": imdb_id, "status": status, **info}) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        if status == "done":
+            self.completed[imdb_id] = info.get("inputs")
+
+    def close(self):
+        self._file.close()
+
+    def remove(self):
+        """Close and delete the journal (the run it covers is complete)"""
+        self.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+def load_sources(paths: List[str], metrics: Metrics) -> List[Dict]:
+    """Parse the source files that exist, timing the reads"""
+    sources = []
+    with metrics.timer("read_seconds"):
+        for source_path in paths:
+            if os.path.exists(source_path):
+                with open(source_path) as f:
+                    sources.append(json.load(f))
+    metrics.count("sources_read", len(sources))
+    metrics.count("timestamps_in", sum(len(source.get("timestamps", [])) for source in sources))
+    return sources
+
+
+def timed_merge(sources: List[Dict], metrics: Metrics, engine: str = "python") -> Optional[Dict]:
+    """merge_timestamps with merge timing and counts; None (nothing counted) without sources"""
+    with metrics.timer("merge_seconds"):
+        merged = merge_timestamps(sources, engine)
+    if merged is None:
+        return None
+    metrics.count("titles_aggregated")
+    metrics.count("timestamps_out", len(merged["timestamps"]))
+    return merged
+
+
+def write_validated(output_path: str, merged: Dict, metrics: Metrics) -> bool:
+    """
+    Check a merged title against its corpus's schema.json, then write it
+
+    metadata.version is bumped when the content changes, and the replaced
+    version and a JSON Patch to the new one are kept under .versions/.
+
+    Returns:
+        Whether the file changed on disk
+
+    Raises:
+        SchemaValidationError: The title is invalid; nothing is written
+    """
+    versions = VersionStore(output_path)
+    previous = versions.prepare(merged)
+    with metrics.timer("validate_seconds"):
+        try:
+            check_schema(merged, output_path)
+        except SchemaValidationError:
+            metrics.count("outputs_invalid")
+            raise
+    with metrics.timer("write_seconds"):
+        written = write_timestamp_file(output_path, merged)
+        if written:
+            versions.record(previous, merged)
+    metrics.count("outputs_written" if written else "outputs_unchanged")
+    return written
+
+
+class StoreWriter:
+    """Batches validated titles into a TimestampStore (--db)"""
+
+    def __init__(self, path: str, metrics: Metrics, batch_size: int = STORE_BATCH_SIZE):
+        self.store = TimestampStore(path)
+        self.metrics = metrics
+        self.batch_size = batch_size
+        self.pending: List[Dict] = []
+
+    def add(self, merged: Dict):
+        self.pending.append(merged)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            with self.metrics.timer("store_seconds"):
+                self.metrics.count("store_upserts", self.store.upsert_many(self.pending))
+            self.pending = []
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self.store.close()
+
+
+def aggregate_movie(
+    imdb_id: str,
+    source_paths: List[str],
+    output_path: str,
+    engine: str = "python",
+    return_document: bool = False,
+) -> Dict:
+    """
+    Merge one movie's sources and write the result (runs in a worker process)
+
+    Returns:
+        Summary of the job for the journal, plus the job's metrics snapshot
+        (and the merged title under "document" with return_document, for the
+        parent to put in the store)
+    """
+    metrics = Metrics("filterflix_aggregator")
+    sources = load_sources(source_paths, metrics)
+    if not sources:
+        raise FileNotFoundError(f"none of the source files exist: {', '.join(source_paths)}")
+
+    merged = timed_merge(sources, metrics, engine)
+    merged["imdb_id"] = merged["imdb_id"] or imdb_id
+    written = write_validated(output_path, merged, metrics)
+    return {
+        "document": merged if return_document else None,
+        "metrics": metrics.to_dict(),
+        "output": output_path,
+        "timestamps": len(merged["timestamps"]),
+        "written": written,
+        "output_hash": timestamp_content_hash(merged),
+        "index_entry": catalog_entry(merged),
+        "imdb_id": merged["imdb_id"],
+    }
+
+
+class _InlineExecutor:
+    """Runs submitted jobs immediately in this process (workers=0)"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def submit(self, fn, *args) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+def run_batch(
+    batch_path: str,
+    output_dir: str,
+    workers: Optional[int] = None,
+    resume: bool = True,
+    force: bool = False,
+    index_path: Optional[str] = None,
+    metrics: Optional[Metrics] = None,
+    engine: str = "python",
+    store_path: Optional[str] = None,
+) -> Dict:
+    """
+    Aggregate every movie in a batch file across a process pool
+
+    Movies whose source files hash the same as in the last build (per the
+    build manifest in output_dir) are skipped without starting a worker.
+
+    Args:
+        batch_path: Batch file (see module docstring for the format)
+        output_dir: Directory that receives <imdb_id>.json files
+        workers: Worker processes (default: one per CPU; 0 runs every job in
+            this process, which --profile needs to see the work)
+        resume: Skip movies the checkpoint journal marks as done from the same inputs
+        force: Rebuild movies even if their inputs are unchanged
+        index_path: Catalog index to update (default: the one at the corpus
+            root above output_dir, if any)
+        metrics: Registry that collects the per-stage metrics of every job
+        engine: Merge engine passed to merge_timestamps
+        store_path: SQLite store (timestamp_store.py) to upsert built titles
+            into; workers send the merged titles back and only this process
+            writes to it
+
+    Returns:
+        Counts of done, unchanged, skipped and failed movies
+    """
+    movies = read_batch_file(batch_path)
+    os.makedirs(output_dir, exist_ok=True)
+
+    journal_path = os.path.join(output_dir, ".aggregate-journal.jsonl")
+    if not resume and os.path.exists(journal_path):
+        os.unlink(journal_path)
+    journal = CheckpointJournal(journal_path)
+
+    manifest = BuildManifest(output_dir)
+    index = CatalogIndex(index_path) if index_path else CatalogIndex.for_output(output_dir)
+
+    if metrics is None:
+        metrics = Metrics("filterflix_aggregator")
+    store = StoreWriter(store_path, metrics) if store_path else None
+
+    summary = {"done": 0, "unchanged": 0, "skipped": 0, "failed": 0}
+    todo = []
+    input_hashes = {}
+    for imdb_id, paths in movies:
+        output_path = os.path.join(output_dir, f"{imdb_id}.json")
+        existing = [p for p in paths if os.path.exists(p)]
+        input_hashes[imdb_id] = hash_files(existing, salt=f"merge-v{MERGE_VERSION}")
+        if journal.is_done(imdb_id, input_hashes[imdb_id]):
+            summary["skipped"] += 1
+            continue
+        if not force and existing and manifest.is_current(imdb_id, input_hashes[imdb_id], output_path):
+            summary["unchanged"] += 1
+            continue
+        todo.append((imdb_id, paths))
+    if summary["skipped"]:
+        print(f"Resuming: {summary['skipped']} movies already done", file=sys.stderr)
+    metrics.count("titles_skipped_unchanged", summary["unchanged"])
+    metrics.count("titles_skipped_resumed", summary["skipped"])
+
+    started = time.time()
+    pool = _InlineExecutor() if workers == 0 else ProcessPoolExecutor(max_workers=workers or os.cpu_count())
+    try:
+        with pool:
+            futures = {
+                pool.submit(aggregate_movie, imdb_id, paths, os.path.join(output_dir, f"{imdb_id}.json"),
+                            engine, store is not None): imdb_id
+                for imdb_id, paths in todo
+            }
+            for future in as_completed(futures):
+                imdb_id = futures[future]
+                try:
+                    info = future.result()
+                except Exception as e:
+                    print(f"Error aggregating {imdb_id}: {e}", file=sys.stderr)
+                    journal.record(imdb_id, "failed", error=str(e))
+                    metrics.count("titles_failed")
+                    summary["failed"] += 1
+                else:
+                    metrics.merge(info.pop("metrics"))
+                    document = info.pop("document")
+                    if store is not None:
+                        store.add(document)
+                    manifest.record(imdb_id, input_hashes[imdb_id], info["output"], info.pop("output_hash"))
+                    entry = info.pop("index_entry")
+                    merged_id = info.pop("imdb_id")
+                    if index is not None:
+                        index.record(merged_id, info["output"], entry)
+                    journal.record(imdb_id, "done", inputs=input_hashes[imdb_id], **info)
+                    summary["done"] += 1
+    finally:
+        journal.close()
+        manifest.save()
+        if index is not None:
+            index.save()
+        if store is not None:
+            store.close()
+    if summary["failed"] == 0:
+        # Nothing left to resume; a stale journal would skip later changes
+        journal.remove()
+
+    elapsed = time.time() - started
+    metrics.gauge("titles_per_second", summary["done"] / elapsed if elapsed > 0 else 0.0)
+    print(f"Batch finished: {summary['done']} done, {summary['unchanged']} unchanged, "
+          f"{summary['skipped']} skipped, {summary['failed']} failed in {elapsed:.1f}s", file=sys.stderr)
+    return summary
 
 
 def main():
@@ -226,25 +767,83 @@ def main():
     parser.add_argument("--sources", nargs="+", help="Source JSON files to merge")
     parser.add_argument("--output", help="Output file path")
     parser.add_argument("--batch", help="Batch file with list of movies")
-    parser.add_argument("--output-dir", help="Output directory for batch processing")
+    parser.add_argument("--output-dir", help="Output directory for batch or --ndjson processing")
+    parser.add_argument("--ndjson", action="store_true",
+                        help="Read source records as NDJSON from stdin and merge each title as it arrives")
+    parser.add_argument("--workers", type=int, help="Worker processes for batch mode (default: CPU count)")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="Ignore the checkpoint journal and rebuild every movie in the batch")
+    parser.add_argument("--force", action="store_true",
+                        help="Rebuild movies even when the build manifest says their inputs are unchanged")
+    parser.add_argument("--index",
+                        help="Catalog index to update with written files "
+                             "(default: index.json at the corpus root above the output)")
+    parser.add_argument("--db",
+                        help="SQLite timestamp store (timestamp_store.py) to upsert every valid title into")
+    parser.add_argument("--engine", choices=MERGE_ENGINES, default="auto",
+                        help="Merge implementation; numpy gives the same output, much faster on titles with "
+                             f"many timestamps (default: auto, numpy from {NUMPY_MIN_TIMESTAMPS} timestamps if installed)")
+    parser.add_argument("--metrics-json",
+                        help="Write per-stage timers and counters to this JSON file")
+    parser.add_argument("--metrics-prom",
+                        help="Write the same metrics in Prometheus text format (for the textfile collector)")
+    parser.add_argument("--profile", choices=PROFILE_KINDS,
+                        help="Profile the run (cProfile or tracemalloc) and write collapsed stacks; "
+                             "batch jobs then run in this process")
+    parser.add_argument("--profile-output",
+                        help="Collapsed-stack file for --profile (default: aggregator-<kind>.folded)")
 
     args = parser.parse_args()
+    if args.engine == "numpy" and not merge_engine.available():
+        parser.error("--engine numpy needs NumPy (pip install numpy)")
+    metrics = Metrics("filterflix_aggregator")
 
-    if args.sources:
-        # Merge provided source files
-        sources = []
-        for source_path in args.sources:
-            if os.path.exists(source_path):
-                with open(source_path) as f:
-                    sources.append(json.load(f))
-
-        merged = merge_timestamps(sources)
+    profiler = contextlib.nullcontext()
+    if args.profile:
+        profiler = profile(args.profile, args.profile_output or f"aggregator-{args.profile}.folded")
 
-        if args.output:
-            with open(args.output, "w") as f:
-                json.dump(merged, f, indent=2)
-        else:
-            print(json.dumps(merged, indent=2))
+    if args.sources:
+        with profiler:
+            # Merge provided source files
+            sources = load_sources(args.sources, metrics)
+            merged = timed_merge(sources, metrics, args.engine)
+            if merged is None:
+                print(f"Error: none of the source files exist: {', '.join(args.sources)}", file=sys.stderr)
+                sys.exit(1)
+
+            if args.output:
+                try:
+                    write_validated(args.output, merged, metrics)
+                except SchemaValidationError as e:
+                    for error in e.errors:
+                        print(f"{args.output}: {error}", file=sys.stderr)
+                    sys.exit(1)
+                index = CatalogIndex(args.index) if args.index else CatalogIndex.for_output(args.output)
+                if index is not None and merged["imdb_id"]:
+                    index.update(args.output, merged)
+                    index.save()
+                if args.db and merged["imdb_id"]:
+                    store = StoreWriter(args.db, metrics)
+                    store.add(merged)
+                    store.close()
+            else:
+                print(json.dumps(merged, indent=2))
+
+    elif args.ndjson:
+        with profiler:
+            counts = run_stream(sys.stdin, sys.stdout, args.output_dir, args.index, metrics, args.engine, args.db)
+        if args.output_dir:
+            print(f"Merged {counts['merged']}: wrote {counts['written']}, "
+                  f"unchanged {counts['unchanged']}, invalid {counts['invalid']}", file=sys.stderr)
+
+    elif args.batch:
+        if not args.output_dir:
+            parser.error("--batch requires --output-dir")
+        with profiler:
+            summary = run_batch(args.batch, args.output_dir, workers=0 if args.profile else args.workers,
+                                resume=not args.no_resume, force=args.force,
+                                index_path=args.index, metrics=metrics, engine=args.engine,
+                                store_path=args.db)
 
     else:
         print("Usage examples:")
@@ -253,6 +852,19 @@ def main():
         print("")
         print("  Batch process:")
         print("    python aggregate-timestamps.py --batch movies.txt --output-dir ./timestamps/")
+        return
+
+    if args.metrics_json or args.metrics_prom:
+        print(metrics.summary(["read_seconds", "merge_seconds", "validate_seconds", "write_seconds",
+                               "store_seconds"]),
+              file=sys.stderr)
+        if args.metrics_json:
+            metrics.write_json(args.metrics_json)
+        if args.metrics_prom:
+            metrics.write_prometheus(args.metrics_prom)
+
+    if args.batch and summary["failed"]:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+FilterFlix Scrape Artifacts
+Per-stage cache of the scraper's intermediate results
+
+process_movie runs three stages: fetch the Parents Guide page, parse it into
+a `warnings` dict, and estimate timestamps for a runtime. Each stage's output
+is stored here, keyed by what it was made from:
+
+    html       imdb_id -> the page as last fetched (zlib-compressed) and its sha256
+    parsed     imdb_id -> extract() result, with the page hash and parser version
+    estimates  hash(warnings, runtime_minutes, estimator version) -> timestamps
+
+A parsed artifact is only used while its page hash and parser version match,
+and an estimate only for the exact warnings, runtime and estimator version it
+was made from. Tuning TIME_PATTERNS or estimating an extended cut's runtime
+therefore starts from the stored warnings, without touching the network or
+the HTML (imdb-scraper.py --reestimate); a parser change re-parses the stored
+pages.
+
+Usage:
+    python imdb-scraper.py tt1745960 130 --artifact-dir ~/.cache/filterflix/artifacts
+    python imdb-scraper.py tt1745960 137 --artifact-dir ~/.cache/filterflix/artifacts --reestimate
+    python imdb-scraper.py --artifact-dir ~/.cache/filterflix/artifacts --reestimate --output-dir out/
+    python artifacts.py stats ~/.cache/filterflix/artifacts
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from corpus_io import content_hash
+
+ARTIFACTS_NAME = "artifacts.sqlite"
+
+
+def html_hash(html: str) -> str:
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+def estimate_key(warnings: Dict[str, List[str]], runtime_minutes: int, estimator_version: str) -> str:
+    """Content hash of everything generate_timestamps output depends on"""
+    return content_hash({
+        "warnings": warnings,
+        "runtime_minutes": runtime_minutes,
+        "estimator": estimator_version,
+    })
+
+
+class ArtifactStore:
+    """SQLite-backed store of fetched pages, parsed warnings and estimates"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS html (
+            imdb_id TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            sha256 TEXT NOT NULL,
+            body BLOB NOT NULL,
+            fetched_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS parsed (
+            imdb_id TEXT PRIMARY KEY,
+            html_sha256 TEXT NOT NULL,
+            parser_version TEXT NOT NULL,
+            data TEXT NOT NULL,
+            parsed_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS estimates (
+            key TEXT PRIMARY KEY,
+            imdb_id TEXT NOT NULL,
+            runtime_minutes INTEGER NOT NULL,
+            estimator_version TEXT NOT NULL,
+            timestamps TEXT NOT NULL,
+            estimated_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS estimates_title ON estimates (imdb_id, estimated_at);
+    """
+
+    def __init__(self, directory: str):
+        directory = os.path.expanduser(directory)
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, ARTIFACTS_NAME)
+        self.stats = {"html_stores": 0, "parsed_hits": 0, "parsed_stores": 0,
+                      "estimate_hits": 0, "estimate_stores": 0}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(self.SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Stage 1: fetched pages
+    # ------------------------------------------------------------------
+
+    def put_html(self, imdb_id: str, url: str, html: str) -> str:
+        """Store the page as fetched; returns its sha256"""
+        digest = html_hash(html)
+        with self._lock:
+            row = self._db.execute("SELECT sha256 FROM html WHERE imdb_id = ?", (imdb_id,)).fetchone()
+            if row and row[0] == digest:
+                self._db.execute("UPDATE html SET fetched_at = ? WHERE imdb_id = ?", (time.time(), imdb_id))
+            else:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO html VALUES (?, ?, ?, ?, ?)",
+                    (imdb_id, url, digest, zlib.compress(html.encode("utf-8"), 6), time.time()),
+                )
+                self.stats["html_stores"] += 1
+            self._db.commit()
+        return digest
+
+    def get_html(self, imdb_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT body FROM html WHERE imdb_id = ?", (imdb_id,)).fetchone()
+        return zlib.decompress(row[0]).decode("utf-8") if row else None
+
+    # ------------------------------------------------------------------
+    # Stage 2: parsed warnings
+    # ------------------------------------------------------------------
+
+    def put_parsed(self, imdb_id: str, parser_version: str, data: Dict):
+        """Store an extract() result for the title's stored page"""
+        with self._lock:
+            row = self._db.execute("SELECT sha256 FROM html WHERE imdb_id = ?", (imdb_id,)).fetchone()
+            if row is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO parsed VALUES (?, ?, ?, ?, ?)",
+                (imdb_id, row[0], parser_version, json.dumps(data, separators=(",", ":")), time.time()),
+            )
+            self.stats["parsed_stores"] += 1
+            self._db.commit()
+
+    def get_parsed(self, imdb_id: str, parser_version: str) -> Optional[Dict]:
+        """The parsed page, if it was parsed from the stored page by this parser version"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT p.data FROM parsed p JOIN html h USING (imdb_id) "
+                "WHERE p.imdb_id = ? AND p.parser_version = ? AND p.html_sha256 = h.sha256",
+                (imdb_id, parser_version),
+            ).fetchone()
+            if row is None:
+                return None
+            self.stats["parsed_hits"] += 1
+        return json.loads(row[0])
+
+    # ------------------------------------------------------------------
+    # Stage 3: estimated timestamps
+    # ------------------------------------------------------------------
+
+    def put_estimate(self, key: str, imdb_id: str, runtime_minutes: int, estimator_version: str,
+                     timestamps: List[Dict]):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO estimates VALUES (?, ?, ?, ?, ?, ?)",
+                (key, imdb_id, runtime_minutes, estimator_version,
+                 json.dumps(timestamps, separators=(",", ":")), time.time()),
+            )
+            self.stats["estimate_stores"] += 1
+            self._db.commit()
+
+    def get_estimate(self, key: str) -> Optional[List[Dict]]:
+        with self._lock:
+            row = self._db.execute("SELECT timestamps FROM estimates WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self.stats["estimate_hits"] += 1
+        return json.loads(row[0])
+
+    # ------------------------------------------------------------------
+    # Catalog views
+    # ------------------------------------------------------------------
+
+    def titles(self) -> List[Tuple[str, Optional[int]]]:
+        """
+        Every title with a stored page, with the runtime it was last estimated for
+
+        Returns:
+            (imdb_id, runtime_minutes or None) pairs, by IMDb ID
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT h.imdb_id, ("
+                "  SELECT e.runtime_minutes FROM estimates e WHERE e.imdb_id = h.imdb_id"
+                "  ORDER BY e.estimated_at DESC LIMIT 1"
+                ") FROM html h ORDER BY h.imdb_id"
+            ).fetchall()
+        return [(imdb_id, runtime) for imdb_id, runtime in rows]
+
+    def summary(self) -> Dict:
+        with self._lock:
+            html_count, html_bytes = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(body)), 0) FROM html").fetchone()
+            parsed_versions = dict(self._db.execute(
+                "SELECT parser_version, COUNT(*) FROM parsed GROUP BY parser_version").fetchall())
+            estimate_versions = dict(self._db.execute(
+                "SELECT estimator_version, COUNT(*) FROM estimates GROUP BY estimator_version").fetchall())
+        return {
+            "pages": html_count,
+            "page_bytes_compressed": html_bytes,
+            "parsed": parsed_versions,
+            "estimates": estimate_versions,
+            "file_bytes": os.path.getsize(self.path),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the scraper's per-stage artifact cache")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    stats = sub.add_parser("stats", help="Counts per stage and version")
+    stats.add_argument("directory")
+
+    titles = sub.add_parser("titles", help="Stored titles and their last estimated runtime")
+    titles.add_argument("directory")
+
+    html = sub.add_parser("html", help="Print a stored page")
+    html.add_argument("directory")
+    html.add_argument("imdb_id")
+
+    args = parser.parse_args()
+    if not os.path.exists(os.path.join(os.path.expanduser(args.directory), ARTIFACTS_NAME)):
+        print(f"No artifact store in {args.directory}", file=sys.stderr)
+        sys.exit(1)
+
+    with ArtifactStore(args.directory) as store:
+        if args.command == "stats":
+            print(json.dumps(store.summary(), indent=2))
+        elif args.command == "titles":
+            for imdb_id, runtime in store.titles():
+                print(f"{imdb_id}\t{runtime if runtime is not None else '-'}")
+        else:
+            page = store.get_html(args.imdb_id)
+            if page is None:
+                print(f"{args.imdb_id} has no stored page", file=sys.stderr)
+                sys.exit(1)
+            sys.stdout.write(page)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+FilterFlix Catalog Index
+One lookup file mapping every imdb_id in the corpus to its timestamp file
+
+The index lives at the corpus root (the directory holding schema.json) as
+index.json:
+
+    {
+      "version": 1,
+      "entries": {
+        "tt1375666": {"path": "sample-movies/inception.json", "title": "Inception",
+                      "year": 2010, "runtime_minutes": 148, "version": 1,
+                      "content_hash": "..."}
+      }
+    }
+
+Paths are relative to the index. The scraper and the aggregator update the
+entry of every file they write, so serving a title by ID never needs a
+directory scan; `build` re-creates the index from scratch.
+
+Usage:
+    python catalog_index.py build ../../timestamps
+    python catalog_index.py lookup ../../timestamps tt1375666
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Dict, Optional
+
+from corpus_io import timestamp_content_hash, write_json_atomic
+from packed_corpus import iter_corpus
+
+INDEX_NAME = "index.json"
+INDEX_VERSION = 1
+
+# Files that mark a directory as the corpus root
+ROOT_MARKER = "schema.json"
+
+
+def catalog_entry(data: Dict) -> Dict:
+    """Index fields of a timestamp dict (everything but the path)"""
+    return {
+        "title": data.get("title"),
+        "year": data.get("year"),
+        "runtime_minutes": data.get("runtime_minutes"),
+        "version": data.get("metadata", {}).get("version"),
+        "content_hash": timestamp_content_hash(data),
+    }
+
+
+def find_corpus_root(path: str) -> Optional[str]:
+    """Nearest directory at or above path that holds schema.json or index.json"""
+    directory = os.path.abspath(path if os.path.isdir(path) else os.path.dirname(path))
+    while True:
+        if os.path.exists(os.path.join(directory, ROOT_MARKER)) or os.path.exists(os.path.join(directory, INDEX_NAME)):
+            return directory
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+class CatalogIndex:
+    """In-memory view of index.json with incremental updates"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.root = os.path.dirname(os.path.abspath(path))
+        self.entries: Dict[str, Dict] = {}
+        self.dirty = False
+        if os.path.exists(path):
+            with open(path) as f:
+                self.entries = json.load(f).get("entries", {})
+
+    @classmethod
+    def for_output(cls, output_path: str) -> Optional["CatalogIndex"]:
+        """Index of the corpus that output_path belongs to, or None outside a corpus"""
+        root = find_corpus_root(output_path)
+        return cls(os.path.join(root, INDEX_NAME)) if root else None
+
+    @classmethod
+    def build(cls, root: str) -> "CatalogIndex":
+        """Index every timestamp file under root, replacing any existing index"""
+        index = cls(os.path.join(root, INDEX_NAME))
+        index.entries = {}
+        for path, data in iter_corpus(root):
+            index.update(path, data)
+        index.dirty = True
+        return index
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, imdb_id: str) -> bool:
+        return imdb_id in self.entries
+
+    def lookup(self, imdb_id: str) -> Optional[Dict]:
+        return self.entries.get(imdb_id)
+
+    def resolve(self, imdb_id: str) -> Optional[str]:
+        """Absolute path of a title's timestamp file"""
+        entry = self.entries.get(imdb_id)
+        return os.path.join(self.root, entry["path"]) if entry else None
+
+    def update(self, file_path: str, data: Dict):
+        """
+        Record the file just written for data["imdb_id"]
+
+        Args:
+            file_path: Path of the timestamp file (inside the index root)
+            data: Its contents
+        """
+        self.record(data["imdb_id"], file_path, catalog_entry(data))
+
+    def record(self, imdb_id: str, file_path: str, fields: Dict):
+        """Like update(), for callers that only have the catalog_entry() fields"""
+        entry = {"path": os.path.relpath(os.path.abspath(file_path), self.root).replace(os.sep, "/")}
+        entry.update(fields)
+        if self.entries.get(imdb_id) != entry:
+            self.entries[imdb_id] = entry
+            self.dirty = True
+
+    def save(self):
+        if self.dirty:
+            write_json_atomic(self.path, {"version": INDEX_VERSION, "entries": dict(sorted(self.entries.items()))})
+            self.dirty = False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the catalog index")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build_cmd = sub.add_parser("build", help="Rebuild index.json from every file in the corpus")
+    build_cmd.add_argument("root", help="Corpus root (e.g. timestamps/)")
+
+    lookup_cmd = sub.add_parser("lookup", help="Print the index entry for a title")
+    lookup_cmd.add_argument("root")
+    lookup_cmd.add_argument("imdb_id")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        index = CatalogIndex.build(args.root)
+        index.save()
+        print(f"Indexed {len(index)} titles into {index.path}")
+    else:
+        entry = CatalogIndex(os.path.join(args.root, INDEX_NAME)).lookup(args.imdb_id)
+        if entry is None:
+            print(f"{args.imdb_id} is not in the index", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(entry, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+FilterFlix Corpus Analytics
+One pass over the whole corpus: quality scores, coverage and histograms
+
+Reads either the timestamp files under a directory or a packed corpus
+(packed_corpus.py) and reports:
+
+    - per-title quality scores (calculate_quality_score's formula) as a
+      histogram, with the lowest-scoring titles listed
+    - segments per type, severity histogram, duration histogram
+    - verification rate overall and per type, mean confidence
+    - coverage: the share of each title's runtime that some segment covers
+
+Work is split into chunks of titles; each chunk produces a CorpusStats
+partial whose snapshot (to_dict) merges into the total, the way Metrics
+snapshots merge. Chunks run across a process pool, and memory stays bounded
+by the chunk size whatever the corpus size. Packed input is summarised with
+array operations over each chunk's segment columns.
+
+Usage:
+    python corpus_analytics.py ../../timestamps
+    python corpus_analytics.py corpus.ffc --workers 4 --json dashboard.json
+"""
+
+import argparse
+import heapq
+import json
+import os
+import sys
+import time
+from bisect import bisect_left
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from corpus_io import write_json_atomic
+from packed_corpus import TYPES, UNKNOWN_CONFIDENCE, UNKNOWN_TYPE, iter_corpus_files, parse_time
+
+try:
+    import numpy as np
+except ImportError:  # JSON input needs nothing extra
+    np = None
+
+# Upper bounds (seconds, inclusive) of the duration buckets; one more bucket
+# holds everything longer
+DURATION_BOUNDS = (10, 30, 60, 120, 300, 600)
+SEVERITY_LEVELS = 10
+FRACTION_BUCKETS = 10
+
+CHUNK_TITLES = 2000
+DEFAULT_LOWEST = 20
+DEFAULT_CONFIDENCE = 0.5
+
+
+def quality_score(count: int, type_count: int, confidence_sum: float, verified: int) -> float:
+    """
+    Quality score of a title from its per-title totals
+
+    Factors:
+    - Number of timestamps (30%, full marks at 20)
+    - Variety of types (20%, out of 5)
+    - Average confidence (30%)
+    - Verification rate (20%)
+    """
+    if not count:
+        return 0.0
+
+    score = 0.0
+    score += min(count / 20, 1.0) * 0.3
+    score += type_count / 5 * 0.2
+    score += confidence_sum / count * 0.3
+    score += verified / count * 0.2
+    return round(score, 2)
+
+
+def _fraction_bucket(value: float) -> int:
+    return min(max(int(value * FRACTION_BUCKETS), 0), FRACTION_BUCKETS - 1)
+
+
+def _union_seconds(intervals: List[Tuple[int, int]]) -> int:
+    covered = 0
+    reach = 0
+    for start, end in sorted(intervals):
+        covered += max(end - max(start, reach), 0)
+        reach = max(reach, end)
+    return covered
+
+
+class CorpusStats:
+    """Mergeable partial of the corpus analytics"""
+
+    def __init__(self, lowest: int = DEFAULT_LOWEST):
+        self.lowest_count = lowest
+        self.titles = 0
+        self.empty_titles = 0
+        self.segments = 0
+        self.verified = 0
+        self.confidence_sum = 0.0
+        self.quality_sum = 0.0
+        self.covered_seconds = 0
+        self.runtime_seconds = 0
+        self.by_type: Counter = Counter()
+        self.verified_by_type: Counter = Counter()
+        self.titles_with_type: Counter = Counter()
+        self.severity = [0] * SEVERITY_LEVELS
+        self.duration = [0] * (len(DURATION_BOUNDS) + 1)
+        self.quality = [0] * FRACTION_BUCKETS
+        self.coverage = [0] * FRACTION_BUCKETS
+        self.lowest: List[Tuple[float, str, str]] = []
+        self._candidates: List[Tuple[float, str, str]] = []
+
+    # ------------------------------------------------------------------
+    # Accumulating
+    # ------------------------------------------------------------------
+
+    def _add_title(self, imdb_id: str, title: str, score: float, covered: int, runtime_seconds: int):
+        self.titles += 1
+        self.quality_sum += score
+        self.quality[_fraction_bucket(score)] += 1
+        if runtime_seconds > 0:
+            self.covered_seconds += covered
+            self.runtime_seconds += runtime_seconds
+            self.coverage[_fraction_bucket(covered / runtime_seconds)] += 1
+        self._candidates.append((score, imdb_id, title))
+        if len(self._candidates) >= CHUNK_TITLES:
+            self._trim_lowest()
+
+    def _trim_lowest(self):
+        self.lowest = heapq.nsmallest(self.lowest_count, self.lowest + self._candidates)
+        self._candidates = []
+
+    def add_movie(self, data: Dict):
+        """Account for one timestamp dict (schema layout)"""
+        timestamps = data.get("timestamps", [])
+        if not timestamps:
+            self.empty_titles += 1
+        types = set()
+        confidence_sum = 0.0
+        verified = 0
+        intervals = []
+        for ts in timestamps:
+            kind = ts.get("type", "unknown")
+            types.add(kind)
+            self.by_type[kind] += 1
+            confidence_sum += ts.get("confidence", DEFAULT_CONFIDENCE)
+            if ts.get("verified"):
+                verified += 1
+                self.verified_by_type[kind] += 1
+            severity = ts.get("severity", 5)
+            self.severity[min(max(severity, 1), SEVERITY_LEVELS) - 1] += 1
+            start, end = parse_time(ts["start"]), parse_time(ts["end"])
+            self.duration[bisect_left(DURATION_BOUNDS, end - start)] += 1
+            intervals.append((start, end))
+        self.titles_with_type.update(types)
+        self.segments += len(timestamps)
+        self.verified += verified
+        self.confidence_sum += confidence_sum
+        score = quality_score(len(timestamps), len(types), confidence_sum, verified)
+        self._add_title(data.get("imdb_id", ""), data.get("title", ""), score, _union_seconds(intervals),
+                        (data.get("runtime_minutes") or 0) * 60)
+
+    def add_packed(self, corpus, first: int, last: int):
+        """Account for movie rows [first, last) of an open PackedCorpus"""
+        offsets = corpus.segment_offsets[first:last + 1].astype(np.int64)
+        low, high = int(offsets[0]), int(offsets[-1])
+        local = offsets - low
+        counts = np.diff(offsets)
+        rows = last - first
+        start = corpus.start[low:high].astype(np.int64)
+        end = corpus.end[low:high].astype(np.int64)
+        kind = corpus.type[low:high]
+        verified = corpus.verified[low:high].astype(np.int64)
+        confidence = corpus.confidence[low:high]
+        row_of = np.repeat(np.arange(rows), counts)
+
+        def names(counts_by_code: "np.ndarray") -> Iterator[Tuple[str, int]]:
+            for code in np.flatnonzero(counts_by_code).tolist():
+                yield (TYPES[code] if code != UNKNOWN_TYPE else "unknown"), int(counts_by_code[code])
+
+        def per_title(values: "np.ndarray") -> "np.ndarray":
+            totals = np.concatenate(([0], np.cumsum(values)))
+            return totals[local[1:]] - totals[local[:-1]]
+
+        self.by_type.update(dict(names(np.bincount(kind, minlength=256))))
+        self.verified_by_type.update(dict(names(np.bincount(kind, weights=verified, minlength=256).astype(np.int64))))
+        severity = np.clip(corpus.severity[low:high], 1, SEVERITY_LEVELS).astype(np.int64) - 1
+        for level, count in enumerate(np.bincount(severity, minlength=SEVERITY_LEVELS).tolist()):
+            self.severity[level] += count
+        buckets = np.searchsorted(np.array(DURATION_BOUNDS), end - start, side="left")
+        for bucket, count in enumerate(np.bincount(buckets, minlength=len(DURATION_BOUNDS) + 1).tolist()):
+            self.duration[bucket] += count
+
+        # Distinct types per title from the distinct (title, type) pairs
+        pairs = np.unique(row_of * 256 + kind)
+        type_counts = np.bincount(pairs // 256, minlength=rows)
+        self.titles_with_type.update(dict(names(np.bincount(pairs % 256, minlength=256))))
+
+        percent = np.where(confidence == UNKNOWN_CONFIDENCE, round(DEFAULT_CONFIDENCE * 100), confidence)
+        confidence_sums = per_title(percent.astype(np.int64)) / 100
+        verified_counts = per_title(verified)
+
+        # Covered seconds: segments are sorted by start within a title, so
+        # each adds what extends past the furthest end before it; the running
+        # maximum restarts per title by lifting each title into its own band
+        band = int(end.max()) + 1 if len(end) else 1
+        lifted = end + row_of * band
+        reach = np.empty(len(end), dtype=np.int64)
+        if len(end):
+            reach[0] = 0
+            reach[1:] = np.maximum.accumulate(lifted)[:-1] - row_of[1:] * band
+            first_of_title = local[:-1][counts > 0]
+            reach[first_of_title] = 0
+        covered = per_title(np.maximum(end - np.maximum(start, reach), 0))
+
+        ids = corpus.columns["movie_imdb_id"][first:last].tolist()
+        title_ids = corpus.columns["movie_title"][first:last].tolist()
+        runtimes = (corpus.columns["movie_runtime"][first:last].astype(np.int64) * 60).tolist()
+        self.segments += high - low
+        self.verified += int(verified.sum())
+        self.confidence_sum += float(confidence_sums.sum())
+        self.empty_titles += int((counts == 0).sum())
+        for row, (count, types, confidence_sum, verified_count, seconds) in enumerate(zip(
+                counts.tolist(), type_counts.tolist(), confidence_sums.tolist(), verified_counts.tolist(),
+                covered.tolist())):
+            score = quality_score(count, types, confidence_sum, verified_count)
+            self._add_title(corpus.string(ids[row]), corpus.string(title_ids[row]), score, seconds, runtimes[row])
+
+    # ------------------------------------------------------------------
+    # Merging and reporting
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> Dict:
+        """Snapshot that merge() can combine (picklable, JSON-safe)"""
+        self._trim_lowest()
+        return {
+            "titles": self.titles,
+            "empty_titles": self.empty_titles,
+            "segments": self.segments,
+            "verified": self.verified,
+            "confidence_sum": self.confidence_sum,
+            "quality_sum": self.quality_sum,
+            "covered_seconds": self.covered_seconds,
+            "runtime_seconds": self.runtime_seconds,
+            "by_type": dict(self.by_type),
+            "verified_by_type": dict(self.verified_by_type),
+            "titles_with_type": dict(self.titles_with_type),
+            "severity": list(self.severity),
+            "duration": list(self.duration),
+            "quality": list(self.quality),
+            "coverage": list(self.coverage),
+            "lowest": [list(entry) for entry in self.lowest],
+        }
+
+    def merge(self, snapshot: Dict):
+        """Add another partial's to_dict() into this one"""
+        for name in ("titles", "empty_titles", "segments", "verified", "confidence_sum", "quality_sum",
+                     "covered_seconds", "runtime_seconds"):
+            setattr(self, name, getattr(self, name) + snapshot[name])
+        for name in ("by_type", "verified_by_type", "titles_with_type"):
+            getattr(self, name).update(snapshot[name])
+        for name in ("severity", "duration", "quality", "coverage"):
+            histogram = getattr(self, name)
+            for bucket, count in enumerate(snapshot[name]):
+                histogram[bucket] += count
+        self._candidates.extend(tuple(entry) for entry in snapshot["lowest"])
+        self._trim_lowest()
+
+    def report(self) -> Dict:
+        """Dashboard figures derived from the totals"""
+        self._trim_lowest()
+        segments = self.segments or 1
+        titles = self.titles or 1
+        duration_labels = [f"<={bound}s" for bound in DURATION_BOUNDS] + [f">{DURATION_BOUNDS[-1]}s"]
+        fraction_labels = [f"{bucket / FRACTION_BUCKETS:.1f}-{(bucket + 1) / FRACTION_BUCKETS:.1f}"
+                           for bucket in range(FRACTION_BUCKETS)]
+        return {
+            "titles": self.titles,
+            "empty_titles": self.empty_titles,
+            "segments": self.segments,
+            "mean_quality": round(self.quality_sum / titles, 4),
+            "mean_confidence": round(self.confidence_sum / segments, 4),
+            "verification_rate": round(self.verified / segments, 4),
+            "coverage": round(self.covered_seconds / self.runtime_seconds, 4) if self.runtime_seconds else None,
+            "segments_by_type": dict(sorted(self.by_type.items())),
+            "verification_rate_by_type": {kind: round(self.verified_by_type.get(kind, 0) / count, 4)
+                                          for kind, count in sorted(self.by_type.items())},
+            "titles_with_type": dict(sorted(self.titles_with_type.items())),
+            "severity_histogram": {str(level + 1): count for level, count in enumerate(self.severity)},
+            "duration_histogram": dict(zip(duration_labels, self.duration)),
+            "quality_histogram": dict(zip(fraction_labels, self.quality)),
+            "coverage_histogram": dict(zip(fraction_labels, self.coverage)),
+            "lowest_quality": [{"imdb_id": imdb_id, "title": title, "quality": score}
+                               for score, imdb_id, title in self.lowest],
+        }
+
+
+# ----------------------------------------------------------------------
+# Corpus passes
+# ----------------------------------------------------------------------
+
+def _json_chunk(paths: Sequence[str], lowest: int) -> Dict:
+    stats = CorpusStats(lowest)
+    for path in paths:
+        with open(path) as f:
+            data = json.load(f)
+        if isinstance(data, dict) and data.get("imdb_id") and isinstance(data.get("timestamps"), list):
+            stats.add_movie(data)
+    return stats.to_dict()
+
+
+def _packed_chunk(path: str, first: int, last: int, lowest: int) -> Dict:
+    from packed_corpus import PackedCorpus
+
+    corpus = PackedCorpus(path)
+    try:
+        stats = CorpusStats(lowest)
+        stats.add_packed(corpus, first, last)
+        return stats.to_dict()
+    finally:
+        corpus.close()
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[List]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def analyze(source: str, workers: Optional[int] = None, lowest: int = DEFAULT_LOWEST,
+            chunk_titles: int = CHUNK_TITLES) -> CorpusStats:
+    """
+    Run the analytics over a corpus directory or a packed corpus file
+
+    Args:
+        source: Directory of timestamp files, or a packed corpus file
+        workers: Worker processes (default: one per CPU; 0 runs in this process)
+        lowest: How many of the lowest-quality titles to keep
+        chunk_titles: Titles per chunk handed to a worker
+
+    Returns:
+        The merged statistics
+    """
+    total = CorpusStats(lowest)
+    if os.path.isdir(source):
+        jobs = [(_json_chunk, chunk, lowest) for chunk in _chunks(iter_corpus_files(source), chunk_titles)]
+    else:
+        if np is None:
+            raise ImportError("packed input needs NumPy: pip install numpy")
+        from packed_corpus import PackedCorpus
+
+        corpus = PackedCorpus(source)
+        movies = len(corpus)
+        corpus.close()
+        jobs = [(_packed_chunk, source, first, min(first + chunk_titles, movies), lowest)
+                for first in range(0, movies, chunk_titles)]
+
+    if workers == 0 or len(jobs) <= 1:
+        for fn, *args in jobs:
+            total.merge(fn(*args))
+        return total
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        for snapshot in pool.map(_run_job, jobs):
+            total.merge(snapshot)
+    return total
+
+
+def _run_job(job: Tuple) -> Dict:
+    fn, *args = job
+    return fn(*args)
+
+
+def format_report(report: Dict) -> str:
+    def histogram(title: str, values: Dict[str, int]) -> List[str]:
+        peak = max(values.values(), default=0) or 1
+        return [title] + [f"  {label:>9} {count:>10,} {'#' * round(count / peak * 40)}"
+                          for label, count in values.items()]
+
+    lines = [
+        f"Titles {report['titles']:,} ({report['empty_titles']:,} without segments), "
+        f"segments {report['segments']:,}",
+        f"Mean quality {report['mean_quality']:.3f}, mean confidence {report['mean_confidence']:.3f}, "
+        f"verified {report['verification_rate']:.1%}"
+        + (f", runtime covered {report['coverage']:.1%}" if report["coverage"] is not None else ""),
+        "",
+        "By type      segments   titles  verified",
+    ]
+    for kind, count in report["segments_by_type"].items():
+        lines.append(f"  {kind:<12} {count:>9,} {report['titles_with_type'].get(kind, 0):>8,} "
+                     f"{report['verification_rate_by_type'][kind]:>8.1%}")
+    lines.append("")
+    lines += histogram("Severity", report["severity_histogram"])
+    lines += histogram("Duration", report["duration_histogram"])
+    lines += histogram("Quality", report["quality_histogram"])
+    lines += histogram("Coverage", report["coverage_histogram"])
+    lines.append("")
+    lines.append("Lowest quality")
+    for entry in report["lowest_quality"]:
+        lines.append(f"  {entry['quality']:.2f}  {entry['imdb_id']:<11} {entry['title']}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Corpus-wide quality and coverage analytics")
+    parser.add_argument("source", help="Corpus directory (timestamps/) or a packed corpus file")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count; 0 = this process)")
+    parser.add_argument("--lowest", type=int, default=DEFAULT_LOWEST, help="Lowest-quality titles to list")
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.source):
+        print(f"Error: {args.source} not found", file=sys.stderr)
+        sys.exit(1)
+    started = time.time()
+    report = analyze(args.source, args.workers, args.lowest).report()
+    print(format_report(report))
+    print(f"\nAnalyzed {report['titles']:,} titles in {time.time() - started:.1f}s", file=sys.stderr)
+    if args.json:
+        write_json_atomic(args.json, report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+FilterFlix Corpus I/O
+Deterministic, atomic writes of timestamp files and the build manifest that
+lets nightly jobs skip movies whose inputs have not changed
+
+A file is only rewritten when its content changes. metadata.last_updated is
+ignored when comparing, and the previous value is kept for unchanged files,
+so re-running a job over the same inputs leaves every byte on disk as is.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, Iterable, Optional
+
+MANIFEST_NAME = ".build-manifest.json"
+
+
+def canonical_json(data) -> bytes:
+    """Key-sorted, whitespace-free JSON used for hashing"""
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def content_hash(data) -> str:
+    """sha256 of a JSON-serialisable value"""
+    return hashlib.sha256(canonical_json(data)).hexdigest()
+
+
+def hash_files(paths: Iterable[str], salt: str = "") -> str:
+    """sha256 over the bytes of several files, in order"""
+    digest = hashlib.sha256(salt.encode("utf-8"))
+    for path in paths:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                digest.update(chunk)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def write_json_atomic(path: str, data: Dict):
+    """
+    Write JSON so readers never see a half-written file
+
+    The data goes to a temporary file in the same directory, is fsynced and
+    then renamed over the destination.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _without_last_updated(data: Dict) -> Dict:
+    metadata = data.get("metadata")
+    if not isinstance(metadata, dict) or "last_updated" not in metadata:
+        return data
+    stripped = dict(data)
+    stripped["metadata"] = {k: v for k, v in metadata.items() if k != "last_updated"}
+    return stripped
+
+
+def timestamp_content_hash(data: Dict) -> str:
+    """content_hash of a timestamp file, ignoring metadata.last_updated"""
+    return content_hash(_without_last_updated(data))
+
+
+def write_timestamp_file(path: str, data: Dict) -> bool:
+    """
+    Atomically write a timestamp file unless only last_updated would change
+
+    When the existing file matches, `data` takes over its last_updated so the
+    caller's copy agrees with what is on disk.
+
+    Returns:
+        True if the file was (re)written
+    """
+    if os.path.exists(path):
+        try:
+            with open(path) as f:
+                existing = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            existing = None
+        if isinstance(existing, dict) and _without_last_updated(existing) == _without_last_updated(data):
+            if "last_updated" in existing.get("metadata", {}) and isinstance(data.get("metadata"), dict):
+                data["metadata"]["last_updated"] = existing["metadata"]["last_updated"]
+            return False
+    write_json_atomic(path, data)
+    return True
+
+
+class BuildManifest:
+    """
+    Per-directory record of the inputs each output was built from
+
+    Entries map a key (the IMDb ID) to the content hash of the inputs, the
+    output file name and the hash of the output data.
+    """
+
+    def __init__(self, directory: str):
+        self.path = os.path.join(directory, MANIFEST_NAME)
+        self.entries: Dict[str, Dict] = {}
+        self.dirty = False
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                self.entries = json.load(f).get("entries", {})
+
+    def is_current(self, key: str, input_hash: str, output_path: str) -> bool:
+        """True if `key` was last built from `input_hash` and its output still exists"""
+        entry = self.entries.get(key)
+        return (
+            entry is not None
+            and entry.get("inputs") == input_hash
+            and entry.get("output") == os.path.basename(output_path)
+            and os.path.exists(output_path)
+        )
+
+    def record(self, key: str, input_hash: str, output_path: str, output_hash: Optional[str] = None):
+        self.entries[key] = {
+            "inputs": input_hash,
+            "output": os.path.basename(output_path),
+            "output_hash": output_hash,
+        }
+        self.dirty = True
+
+    def save(self):
+        if self.dirty:
+            write_json_atomic(self.path, {"entries": dict(sorted(self.entries.items()))})
+            self.dirty = False
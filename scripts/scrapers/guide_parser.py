@@ -0,0 +1,194 @@
+"""
+FilterFlix Parents Guide Extractor
+Single-pass lxml extraction of the warnings on an IMDb Parents Guide page
+
+The scraper used to look every category selector up with BeautifulSoup twice:
+soup.find(id=...) and soup.find(string=re.compile(...)), each a walk over
+the whole tree. This extractor parses with lxml and walks the tree once. On
+the way it records, for every selector, the first element with that id and
+the first text node that matches it. It then assembles the same `warnings`
+dict the BeautifulSoup code produced. Near-duplicate warnings within a
+category (near_duplicates.py) are only dropped when near_duplicate_threshold
+is set; by default every distinct warning is kept.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from lxml import etree, html as lxml_html
+
+from corpus_io import content_hash
+from near_duplicates import distinct_texts
+
+# Text inside these never counted towards BeautifulSoup's get_text()
+NON_TEXT_TAGS = {"script", "style", "template"}
+
+ZEBRA_ITEM_CLASS = "ipl-zebra-list__item"
+
+TITLE_TESTID = "hero-title-block__title"
+
+# Bump when extraction changes in a way the categories and threshold don't capture
+PARSER_REVISION = 1
+
+
+def element_text(element) -> str:
+    """Equivalent of BeautifulSoup's get_text(strip=True) for an lxml element"""
+    parts = []
+    for node in element.iter():
+        if node is not element and node.tail:
+            tail = node.tail.strip()
+            if tail:
+                parts.append(tail)
+        if isinstance(node.tag, str) and node.tag not in NON_TEXT_TAGS and node.text:
+            text = node.text.strip()
+            if text:
+                parts.append(text)
+    return "".join(parts)
+
+
+def _closest(element, tag: str):
+    """Nearest ancestor-or-self with the given tag"""
+    while element is not None:
+        if element.tag == tag:
+            return element
+        element = element.getparent()
+    return None
+
+
+class ParentsGuideExtractor:
+    """Compiled selector tables for one CATEGORIES mapping"""
+
+    def __init__(self, categories: Dict[str, List[str]],
+                 near_duplicate_threshold: Optional[float] = None):
+        self.categories = categories
+        # None (the default) keeps every warning that is not an exact duplicate:
+        # similar wording often describes a different scene
+        self.near_duplicate_threshold = near_duplicate_threshold
+        self.selectors = list(dict.fromkeys(s for selectors in categories.values() for s in selectors))
+        self.patterns = {s: re.compile(s, re.I) for s in self.selectors}
+        # One case-sensitive search over the casefolded text rules out the nodes
+        # that match no selector at all (re.I alternations are far slower)
+        self.any_selector = re.compile("|".join(f"(?:{s.casefold()})" for s in self.selectors))
+
+    @property
+    def version(self) -> str:
+        """Fingerprint of everything that shapes extract output for a given page"""
+        return content_hash({
+            "revision": PARSER_REVISION,
+            "categories": self.categories,
+            "near_duplicate_threshold": self.near_duplicate_threshold,
+        })[:16]
+
+    def _walk(self, root) -> Tuple[Dict, Dict, Optional[object], Optional[str]]:
+        """
+        Single document-order traversal
+
+        Returns:
+            (first element per id, container per matched selector, title element, <title> text)
+        """
+        by_id = {}
+        containers = {}
+        pending = set(self.selectors)
+        wanted_ids = set(self.selectors)
+        title_elem = None
+        page_title = None
+        name_h3_depth = 0
+
+        def match_text(text, parent):
+            if not pending or not text or not self.any_selector.search(text.casefold()):
+                return
+            for selector in [s for s in self.selectors if s in pending]:
+                if self.patterns[selector].search(text):
+                    pending.discard(selector)
+                    # find_parent("section") or find_parent("div")
+                    containers[selector] = _closest(parent, "section")
+                    if containers[selector] is None:
+                        containers[selector] = _closest(parent, "div")
+
+        for event, node in etree.iterwalk(root, events=("start", "end", "comment")):
+            if event == "comment":
+                match_text(node.text, node.getparent())
+                match_text(node.tail, node.getparent())
+                continue
+
+            if event == "end":
+                if node.tag == "h3" and node.get("itemprop") == "name":
+                    name_h3_depth -= 1
+                match_text(node.tail, node.getparent())
+                continue
+
+            node_id = node.get("id")
+            if node_id in wanted_ids:
+                wanted_ids.discard(node_id)
+                by_id[node_id] = node
+
+            # h3[itemprop="name"] a, [data-testid="hero-title-block__title"]
+            tag = node.tag
+            if tag == "h3" and node.get("itemprop") == "name":
+                name_h3_depth += 1
+            if title_elem is None and ((tag == "a" and name_h3_depth) or node.get("data-testid") == TITLE_TESTID):
+                title_elem = node
+            if page_title is None and tag == "title":
+                page_title = "".join(node.itertext())
+
+            match_text(node.text, node)
+
+        return by_id, containers, title_elem, page_title
+
+    def extract(self, imdb_id: str, page_html: str) -> Dict:
+        """
+        Parse a Parents Guide page
+
+        Args:
+            imdb_id: IMDb ID the page belongs to
+            page_html: Raw page HTML
+
+        Returns:
+            Dictionary with title and categorized warnings
+        """
+        root = lxml_html.document_fromstring(page_html)
+        by_id, containers, title_elem, page_title = self._walk(root)
+
+        title = element_text(title_elem) if title_elem is not None else None
+
+        # Alternative title extraction
+        if not title and page_title is not None:
+            title = page_title.split(' - ')[0].strip()
+
+        result = {
+            "imdb_id": imdb_id,
+            "title": title,
+            "warnings": {},
+            "severity_votes": {},
+        }
+
+        for category, selectors in self.categories.items():
+            warnings = []
+            for selector in selectors:
+                # ID-based selection
+                section = by_id.get(selector)
+                if section is not None:
+                    items = [li for li in section.iterdescendants("li") if ZEBRA_ITEM_CLASS in (li.get("class") or "")]
+                    if not items:
+                        items = list(section.iterdescendants("li"))
+                    warnings.extend(element_text(item) for item in items)
+
+                # Section header approach
+                parent = containers.get(selector)
+                if parent is not None:
+                    warnings.extend(element_text(item) for item in parent.iterdescendants("li"))
+
+            # Deduplicate and clean
+            seen = set()
+            clean_warnings = []
+            for w in warnings:
+                w_clean = re.sub(r'\s+', ' ', w).strip()
+                if w_clean and w_clean not in seen and len(w_clean) > 10:
+                    seen.add(w_clean)
+                    clean_warnings.append(w_clean)
+            if self.near_duplicate_threshold is not None:
+                clean_warnings = distinct_texts(clean_warnings, threshold=self.near_duplicate_threshold)
+
+            result["warnings"][category] = clean_warnings
+
+        return result
@@ -0,0 +1,216 @@
+"""
+FilterFlix HTTP Cache
+Disk-backed response cache for the scrapers' requests.Session
+
+Responses are stored in a single SQLite file keyed by URL, together with
+their ETag and Last-Modified validators. Within the TTL a cached page is
+served without touching the network; after that the request goes out as a
+conditional GET and a 304 refreshes the stored copy. The cache is capped in
+bytes and evicts least recently used entries first.
+
+Usage:
+    session = requests.Session()
+    mount_cache(session, HTTPCache("~/.cache/filterflix/http", ttl=86400))
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+
+DEFAULT_TTL = 24 * 3600
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class HTTPCache:
+    """SQLite-backed store of GET responses with LRU eviction"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            url TEXT PRIMARY KEY,
+            status INTEGER NOT NULL,
+            headers TEXT NOT NULL,
+            body BLOB NOT NULL,
+            etag TEXT,
+            last_modified TEXT,
+            stored_at REAL NOT NULL,
+            accessed_at REAL NOT NULL,
+            size INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at);
+    """
+
+    def __init__(self, cache_dir: str, ttl: float = DEFAULT_TTL, max_bytes: int = DEFAULT_MAX_BYTES):
+        cache_dir = os.path.expanduser(cache_dir)
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "responses.sqlite")
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(self.SCHEMA)
+        self._total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Return the stored entry for a URL (fresh or stale), or None"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, headers, body, etag, last_modified, stored_at FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self._db.commit()
+        status, headers, body, etag, last_modified, stored_at = row
+        return {
+            "status": status,
+            "headers": _decode_headers(headers),
+            "body": body,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": stored_at,
+        }
+
+    def count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def is_fresh(self, entry: Dict) -> bool:
+        return time.time() - entry["stored_at"] < self.ttl
+
+    def put(self, url: str, status: int, headers: Dict[str, str], body: bytes):
+        """Store (or replace) a response and evict old entries past the size cap"""
+        size = len(body) + len(url)
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            old = self._db.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, status, _encode_headers(headers), body,
+                 headers.get("ETag"), headers.get("Last-Modified"), now, now, size),
+            )
+            self._total += size - (old[0] if old else 0)
+            self.stats["stores"] += 1
+            self._evict()
+            self._db.commit()
+
+    def touch(self, url: str, headers: Dict[str, str]):
+        """Mark an entry fresh again after a 304, picking up any new validators"""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ?, "
+                "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE url = ?",
+                (now, now, headers.get("ETag"), headers.get("Last-Modified"), url),
+            )
+            self._db.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until under max_bytes (lock held)"""
+        while self._total > self.max_bytes:
+            rows = self._db.execute(
+                "SELECT url, size FROM responses ORDER BY accessed_at LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for url, size in rows:
+                if self._total <= self.max_bytes:
+                    break
+                self._db.execute("DELETE FROM responses WHERE url = ?", (url,))
+                self._total -= size
+                self.stats["evictions"] += 1
+
+    def summary(self) -> str:
+        s = self.stats
+        return (f"HTTP cache: {s['hits']} hits, {s['revalidated']} revalidated (304), "
+                f"{s['misses']} misses, {s['evictions']} evictions")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that answers GETs from an HTTPCache and revalidates stale entries"""
+
+    def __init__(self, cache: HTTPCache, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request, **kwargs):
+        if request.method != "GET":
+            return super().send(request, **kwargs)
+
+        entry = self.cache.get(request.url)
+        if entry is not None and self.cache.is_fresh(entry):
+            self.cache.count("hits")
+            return self._build_cached(request, entry)
+
+        if entry is not None:
+            if entry["etag"]:
+                request.headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                request.headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.count("revalidated")
+            self.cache.touch(request.url, response.headers)
+            # The 304 is never handed to the caller; give its connection back
+            # to the pool, or a blocking pool runs dry after pool_maxsize of them
+            response.close()
+            return self._build_cached(request, entry)
+
+        self.cache.count("misses")
+        if response.status_code == 200:
+            # Reading .content here drains the stream so the body can be stored
+            self.cache.put(request.url, response.status_code, response.headers, response.content)
+        return response
+
+    def _build_cached(self, request, entry: Dict) -> requests.Response:
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = entry["body"]
+        response.url = request.url
+        response.request = request
+        response.reason = "OK"
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.connection = self
+        response.from_cache = True
+        return response
+
+
+def mount_cache(session: requests.Session, cache: HTTPCache, **adapter_kwargs) -> CachingHTTPAdapter:
+    """Route all http(s) traffic of a session through a caching adapter"""
+    adapter = CachingHTTPAdapter(cache, **adapter_kwargs)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return adapter
+
+
+def _encode_headers(headers: Dict[str, str]) -> str:
+    # Content-Encoding/Length describe the wire body, not the decoded bytes we store
+    return "\n".join(f"{k}: {v}" for k, v in headers.items()
+                     if k.lower() not in ("content-encoding", "content-length", "transfer-encoding"))
+
+
+def _decode_headers(raw: str) -> Dict[str, str]:
+    headers = {}
+    for line in raw.split("\n"):
+        if ": " in line:
+            key, value = line.split(": ", 1)
+            headers[key] = value
+    return headers
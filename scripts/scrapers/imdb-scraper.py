@@ -6,17 +6,48 @@ Extracts content warnings and estimates timestamps from IMDb
 Usage:
     python imdb-scraper.py tt1745960 130  # Top Gun: Maverick, 130 min runtime
     python imdb-scraper.py tt0468569 152  # The Dark Knight, 152 min runtime
+    python imdb-scraper.py tt1745960 130 tt0468569 152 --concurrency 4
+    python imdb-scraper.py tt1745960 130 tt0468569 152 --adaptive --max-rate 5
+    python imdb-scraper.py tt1745960 130 tt0468569 152 --output-dir ../../timestamps/imdb/
+    python imdb-scraper.py tt1745960 130 tt0468569 152 --ndjson | python aggregate-timestamps.py --ndjson
+    python imdb-scraper.py tt1745960 137 --artifact-dir ~/.cache/filterflix/artifacts --reestimate
+    python imdb-scraper.py tt1745960 130 --near-duplicate-threshold 0.9
 """
 
+import argparse
+import asyncio
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 import json
 import re
+import os
 import sys
+import zlib
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
 import time
 
+from artifacts import ArtifactStore, estimate_key
+from catalog_index import CatalogIndex
+from corpus_io import BuildManifest, content_hash, timestamp_content_hash, write_timestamp_file
+from estimation import DescriptionMatcher
+from guide_parser import ParentsGuideExtractor
+from http_cache import DEFAULT_MAX_BYTES, DEFAULT_TTL, CachingHTTPAdapter, HTTPCache
+from metrics import Metrics
+from near_duplicates import NEAR_DUPLICATE_THRESHOLD
+from profiling import PROFILE_KINDS, profile, profile_calls
+from rate_limit import (
+    MAX_RETRY_AFTER,
+    RETRY_STATUSES,
+    THROTTLE_STATUSES,
+    AdaptiveHostRateLimiter,
+    HostRateLimiter,
+    backoff_delay,
+    parse_retry_after,
+)
+
 
 class IMDbScraper:
     """Scraper for IMDb Parents Guide content warnings"""
@@ -62,17 +93,64 @@ class IMDbScraper:
         1: ["none", "no", "absent"],
     }
 
-    def __init__(self, rate_limit: float = 1.0):
+    # Bump when estimation logic changes in a way TIME_PATTERNS/SEVERITY_KEYWORDS don't capture
+    ESTIMATOR_REVISION = 1
+
+    def __init__(
+        self,
+        rate_limit: float = 1.0,
+        max_concurrency: int = 8,
+        burst: int = 1,
+        cache_dir: Optional[str] = None,
+        cache_ttl: float = DEFAULT_TTL,
+        cache_max_bytes: int = DEFAULT_MAX_BYTES,
+        adaptive: bool = False,
+        max_rate: float = 10.0,
+        retries: int = 3,
+        base_url: Optional[str] = None,
+        artifact_dir: Optional[str] = None,
+        near_duplicate_threshold: Optional[float] = None,
+    ):
         self.session = requests.Session()
         self.session.headers.update(self.HEADERS)
+        # Size the connection pool so concurrent fetches can all reuse keep-alive connections.
+        # pool_block makes a fetch wait for a free connection instead of opening (and then
+        # discarding) an extra one that would lose keep-alive.
+        pool = {"pool_connections": 4, "pool_maxsize": max_concurrency, "pool_block": True}
+        self.cache = None
+        if cache_dir:
+            self.cache = HTTPCache(cache_dir, ttl=cache_ttl, max_bytes=cache_max_bytes)
+            adapter = CachingHTTPAdapter(self.cache, **pool)
+        else:
+            adapter = HTTPAdapter(**pool)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.rate_limit = rate_limit
+        self.max_concurrency = max_concurrency
+        self.burst = burst
+        self.adaptive = adaptive
+        self.max_rate = max_rate
+        self.retries = retries
+        # Point at a stand-in server (scripts/benchmarks/imdb_standin.py) for load tests
+        self.base_url = (base_url or self.BASE_URL).rstrip("/")
+        # The running batch's limiter, so fetch threads can report responses to it
+        self.limiter: Optional[HostRateLimiter] = None
+        # The event loop the running batch's limiter lives on
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self.last_request = 0
+        self.matcher = DescriptionMatcher(self.TIME_PATTERNS, self.SEVERITY_KEYWORDS)
+        # Off by default: only case, punctuation and spacing variants collapse even when on
+        self.extractor = ParentsGuideExtractor(self.CATEGORIES, near_duplicate_threshold)
+        self.metrics = Metrics("filterflix_scraper")
+        # Fetched pages, parsed warnings and estimates, each reused while its inputs match
+        self.artifacts = ArtifactStore(artifact_dir) if artifact_dir else None
 
     def _rate_limit_wait(self):
         """Ensure we don't exceed rate limits"""
         elapsed = time.time() - self.last_request
         if elapsed < self.rate_limit:
             time.sleep(self.rate_limit - elapsed)
+            self.metrics.count("rate_limit_sleep_seconds", self.rate_limit - elapsed)
         self.last_request = time.time()
 
     def scrape_parents_guide(self, imdb_id: str) -> Dict:
@@ -86,68 +164,121 @@ class IMDbScraper:
             Dictionary with title and categorized warnings
         """
         self._rate_limit_wait()
+        return self._fetch_and_parse(imdb_id)
+
+    def _guide_url(self, imdb_id: str) -> str:
+        return f"{self.base_url}/title/{imdb_id}/parentalguide"
 
-        url = f"{self.BASE_URL}/title/{imdb_id}/parentalguide"
+    def _fetch_and_parse(self, imdb_id: str) -> Dict:
+        """Fetch and parse one Parents Guide page (no rate limiting)"""
+        url = self._guide_url(imdb_id)
         print(f"Fetching: {url}", file=sys.stderr)
 
         try:
-            response = self.session.get(url)
-            response.raise_for_status()
+            response = self._get(url)
         except requests.RequestException as e:
+            self.metrics.count("fetch_errors")
             print(f"Error fetching {url}: {e}", file=sys.stderr)
             return {"imdb_id": imdb_id, "title": None, "warnings": {}, "error": str(e)}
 
-        soup = BeautifulSoup(response.text, "lxml")
+        self.metrics.count("pages_fetched")
+        self.metrics.count("bytes_downloaded", len(response.content))
+        if self.artifacts is None:
+            return self.parse_parents_guide(imdb_id, response.text)
+        self.artifacts.put_html(imdb_id, url, response.text)
+        return self.load_cached(imdb_id, response.text)
 
-        # Get movie title
-        title_elem = soup.select_one('h3[itemprop="name"] a, [data-testid="hero-title-block__title"]')
-        title = title_elem.get_text(strip=True) if title_elem else None
+    def load_cached(self, imdb_id: str, page_html: Optional[str] = None) -> Dict:
+        """
+        scrape_parents_guide result from the artifact store, without the network
 
-        # Alternative title extraction
-        if not title:
-            title_elem = soup.select_one('title')
-            if title_elem:
-                title = title_elem.get_text().split(' - ')[0].strip()
+        The stored parse is used while it matches the stored page and the
+        current parser version; otherwise the page is parsed again.
 
-        result = {
-            "imdb_id": imdb_id,
-            "title": title,
-            "warnings": {},
-            "severity_votes": {},
-        }
+        Args:
+            imdb_id: IMDb ID
+            page_html: The stored page, if the caller already has it
+        """
+        version = self.extractor.version
+        data = self.artifacts.get_parsed(imdb_id, version)
+        if data is not None:
+            self.metrics.count("parse_artifact_hits")
+            return data
+        if page_html is None:
+            page_html = self.artifacts.get_html(imdb_id)
+        if page_html is None:
+            return {"imdb_id": imdb_id, "title": None, "warnings": {}, "error": "no stored page"}
+        data = self.parse_parents_guide(imdb_id, page_html)
+        self.artifacts.put_parsed(imdb_id, version, data)
+        return data
+
+    def _get(self, url: str) -> requests.Response:
+        """
+        GET url, retrying connection errors, 429s and 5xx responses
+
+        Retries wait for the response's Retry-After (capped at
+        MAX_RETRY_AFTER, plus a little jitter) or else an exponential backoff
+        with full jitter, then take a token from the host's bucket like any
+        other request. Every response is reported to the adaptive limiter, if
+        one is running.
+
+        Raises:
+            requests.RequestException: The last failure once retries run out
+        """
+        attempt = 0
+        while True:
+            last_attempt = attempt >= self.retries
+            try:
+                with self.metrics.timer("fetch_seconds"):
+                    response = self.session.get(url)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if last_attempt:
+                    raise
+                delay = backoff_delay(attempt)
+                print(f"Retrying {url} in {delay:.1f}s: {e}", file=sys.stderr)
+            else:
+                status = response.status_code
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if isinstance(self.limiter, AdaptiveHostRateLimiter) and not getattr(response, "from_cache", False):
+                    self.limiter.record(url, status, retry_after)
+                if status in THROTTLE_STATUSES:
+                    self.metrics.count("throttled_responses")
+                if status not in RETRY_STATUSES or last_attempt:
+                    response.raise_for_status()
+                    return response
+                if retry_after is not None:
+                    delay = min(retry_after, MAX_RETRY_AFTER) + backoff_delay(0)
+                else:
+                    delay = backoff_delay(attempt) + backoff_delay(0)
+                print(f"Retrying {url} in {delay:.1f}s: HTTP {status}", file=sys.stderr)
+            self.metrics.count("fetch_retries")
+            self.metrics.count("retry_sleep_seconds", delay)
+            time.sleep(delay)
+            self._acquire_retry_token(url)
+            attempt += 1
+
+    def _acquire_retry_token(self, url: str):
+        """Wait for the host's rate limit before a retry, so retries never add to the limited rate"""
+        if self.limiter is not None and self._loop is not None:
+            # Fetches run in worker threads; the buckets live on the batch's event loop
+            waited = asyncio.run_coroutine_threadsafe(self.limiter.acquire(url), self._loop).result()
+            self.metrics.count("rate_limit_sleep_seconds", waited)
+        elif self.rate_limit > 0:
+            self._rate_limit_wait()
+
+    def parse_parents_guide(self, imdb_id: str, html: str) -> Dict:
+        """
+        Extract title and categorized warnings from Parents Guide HTML
 
-        # Extract warnings for each category
-        for category, selectors in self.CATEGORIES.items():
-            warnings = []
-            for selector in selectors:
-                # Try ID-based selection
-                section = soup.find(id=selector)
-                if section:
-                    items = section.find_all("li", class_=lambda c: c and "ipl-zebra-list__item" in c)
-                    if not items:
-                        items = section.find_all("li")
-                    warnings.extend([item.get_text(strip=True) for item in items])
-
-                # Try section header approach
-                header = soup.find(string=re.compile(selector, re.I))
-                if header:
-                    parent = header.find_parent("section") or header.find_parent("div")
-                    if parent:
-                        items = parent.find_all("li")
-                        warnings.extend([item.get_text(strip=True) for item in items])
-
-            # Deduplicate and clean
-            seen = set()
-            clean_warnings = []
-            for w in warnings:
-                w_clean = re.sub(r'\s+', ' ', w).strip()
-                if w_clean and w_clean not in seen and len(w_clean) > 10:
-                    seen.add(w_clean)
-                    clean_warnings.append(w_clean)
-
-            result["warnings"][category] = clean_warnings
-
-        return result
+        Args:
+            imdb_id: IMDb ID the page belongs to
+            html: Raw page HTML
+
+        Returns:
+            Dictionary with title and categorized warnings
+        """
+        with self.metrics.timer("parse_seconds"):
+            return self.extractor.extract(imdb_id, html)
 
     def estimate_timestamp_position(self, description: str, runtime_minutes: int) -> float:
         """
@@ -160,23 +291,17 @@ class IMDbScraper:
         Returns:
             Estimated position as fraction (0-1) of movie runtime
         """
-        desc_lower = description.lower()
-
-        # Check for explicit time mentions (e.g., "about 45 minutes in")
-        time_match = re.search(r'(\d+)\s*minutes?\s*(in|into)', desc_lower)
-        if time_match:
-            minutes = int(time_match.group(1))
-            return min(minutes / runtime_minutes, 0.95)
-
-        # Check for pattern matches
-        for pattern, position in self.TIME_PATTERNS.items():
-            if position == "extract":
-                continue
-            if re.search(pattern, desc_lower):
-                return position
-
-        # Default: middle of movie (with some randomization based on hash)
-        hash_offset = (hash(description) % 20 - 10) / 100  # -0.1 to +0.1
+        hint = self.matcher.position_hint(description)
+        if hint:
+            kind, value = hint
+            # Explicit time mentions (e.g., "about 45 minutes in")
+            if kind == "minutes":
+                return min(value / runtime_minutes, 0.95)
+            return value
+
+        # Default: middle of movie (with some randomization based on hash).
+        # crc32 rather than hash(): str hashes are salted per process.
+        hash_offset = (zlib.crc32(description.encode("utf-8")) % 20 - 10) / 100  # -0.1 to +0.1
         return 0.5 + hash_offset
 
     def estimate_severity(self, description: str, category: str) -> int:
@@ -190,13 +315,10 @@ class IMDbScraper:
         Returns:
             Severity rating 1-10
         """
-        desc_lower = description.lower()
-
         # Check for severity keywords (highest to lowest)
-        for severity, keywords in sorted(self.SEVERITY_KEYWORDS.items(), reverse=True):
-            for keyword in keywords:
-                if keyword in desc_lower:
-                    return severity
+        severity = self.matcher.keyword_severity(description)
+        if severity is not None:
+            return severity
 
         # Default severities by category
         defaults = {
@@ -279,16 +401,30 @@ class IMDbScraper:
         """
         # Scrape
         data = self.scrape_parents_guide(imdb_id)
+        return self._build_output(data, imdb_id, runtime_minutes)
+
+    def reestimate_movie(self, imdb_id: str, runtime_minutes: int) -> Dict:
+        """
+        process_movie from the artifact store: no fetch, and no parse unless the parser changed
 
+        Args:
+            imdb_id: IMDb ID
+            runtime_minutes: Runtime to estimate for (e.g. an extended cut's)
+
+        Returns:
+            Complete FilterFlix timestamp object
+        """
+        return self._build_output(self.load_cached(imdb_id), imdb_id, runtime_minutes)
+
+    def _build_output(self, data: Dict, imdb_id: str, runtime_minutes: int) -> Dict:
+        """Turn scraped Parents Guide data into a FilterFlix timestamp object"""
         if data.get("error"):
             return data
 
         # Generate timestamps
-        timestamps = self.generate_timestamps(
-            data["warnings"],
-            runtime_minutes,
-            imdb_id,
-        )
+        with self.metrics.timer("estimate_seconds"):
+            timestamps = self.estimate_timestamps(data["warnings"], runtime_minutes, imdb_id)
+        self.metrics.count("titles_processed")
 
         # Build final output
         return {
@@ -307,27 +443,383 @@ class IMDbScraper:
             },
         }
 
+    def estimate_timestamps(self, warnings: Dict[str, List[str]], runtime_minutes: int, imdb_id: str) -> List[Dict]:
+        """generate_timestamps, reusing the stored estimate for the same inputs and estimator version"""
+        if self.artifacts is None:
+            return self.generate_timestamps(warnings, runtime_minutes, imdb_id)
+        version = self.estimator_version
+        key = estimate_key(warnings, runtime_minutes, version)
+        timestamps = self.artifacts.get_estimate(key)
+        if timestamps is not None:
+            self.metrics.count("estimate_artifact_hits")
+            return timestamps
+        timestamps = self.generate_timestamps(warnings, runtime_minutes, imdb_id)
+        self.artifacts.put_estimate(key, imdb_id, runtime_minutes, version, timestamps)
+        return timestamps
 
-def main():
-    if len(sys.argv) < 3:
-        print("Usage: python imdb-scraper.py <imdb_id> <runtime_minutes>")
-        print("Example: python imdb-scraper.py tt1745960 130")
-        sys.exit(1)
+    @property
+    def estimator_version(self) -> str:
+        """Fingerprint of everything that shapes generate_timestamps output"""
+        return content_hash({
+            "revision": self.ESTIMATOR_REVISION,
+            "time_patterns": self.TIME_PATTERNS,
+            "severity_keywords": {str(k): v for k, v in self.SEVERITY_KEYWORDS.items()},
+        })[:16]
+
+    def input_hash(self, data: Dict, runtime_minutes: int) -> str:
+        """Content hash of everything a title's output is built from"""
+        return content_hash({
+            "title": data.get("title"),
+            "warnings": data.get("warnings", {}),
+            "runtime_minutes": runtime_minutes,
+            "estimator": self.estimator_version,
+        })
 
-    imdb_id = sys.argv[1]
-    runtime = int(sys.argv[2])
+    def save_output(
+        self,
+        data: Dict,
+        runtime_minutes: int,
+        output_dir: str,
+        manifest: BuildManifest,
+        index: Optional[CatalogIndex] = None,
+    ) -> str:
+        """
+        Write <output_dir>/<imdb_id>.json for scraped data, unless its inputs are unchanged
 
-    # Validate IMDb ID format
-    if not re.match(r'^tt\d+$', imdb_id):
-        print(f"Error: Invalid IMDb ID format: {imdb_id}", file=sys.stderr)
-        print("Expected format: tt followed by numbers (e.g., tt1745960)", file=sys.stderr)
-        sys.exit(1)
+        Args:
+            data: scrape_parents_guide result
+            runtime_minutes: Movie runtime
+            output_dir: Directory holding the timestamp files and build manifest
+            manifest: Build manifest of output_dir
+            index: Catalog index to record the file in, if any
+
+        Returns:
+            "written", "unchanged" or "error"
+        """
+        imdb_id = data["imdb_id"]
+        if data.get("error"):
+            return "error"
+
+        output_path = os.path.join(output_dir, f"{imdb_id}.json")
+        input_hash = self.input_hash(data, runtime_minutes)
+        if manifest.is_current(imdb_id, input_hash, output_path):
+            return "unchanged"
+
+        result = self._build_output(data, imdb_id, runtime_minutes)
+        with self.metrics.timer("write_seconds"):
+            written = write_timestamp_file(output_path, result)
+        self.metrics.count("outputs_written" if written else "outputs_unchanged")
+        manifest.record(imdb_id, input_hash, output_path, timestamp_content_hash(result))
+        if index is not None:
+            index.update(output_path, result)
+        return "written" if written else "unchanged"
+
+    def collect_metrics(self) -> Metrics:
+        """The run's metrics, with derived gauges (throughput, HTTP cache) filled in"""
+        self.metrics.gauge("titles_per_second", self.metrics.rate("titles_processed"))
+        if isinstance(self.limiter, AdaptiveHostRateLimiter):
+            rates = self.limiter.rates()
+            if rates:
+                self.metrics.gauge("request_rate", min(rates.values()))
+        if self.cache:
+            for stat, value in self.cache.stats.items():
+                self.metrics.gauge(f"http_cache_{stat}", value)
+        if self.artifacts:
+            for stat, value in self.artifacts.stats.items():
+                self.metrics.gauge(f"artifacts_{stat}", value)
+        return self.metrics
+
+    # ------------------------------------------------------------------
+    # Concurrent batch API
+    # ------------------------------------------------------------------
+
+    async def _run_many(self, items: Iterable, work: Callable, imdb_id_for: Callable) -> AsyncIterator[Dict]:
+        """
+        Run blocking `work(item)` calls with bounded concurrency
 
-    scraper = IMDbScraper()
-    result = scraper.process_movie(imdb_id, runtime)
+        Each call first takes a token from the per-host bucket of the item's
+        Parents Guide URL, then runs in a worker thread. Results are yielded in
+        completion order, as soon as each one finishes. With `adaptive`, the
+        buckets start at 1 / rate_limit and follow the server's responses up
+        to max_rate.
+        """
+        limiter = None
+        if self.rate_limit > 0:
+            if self.adaptive:
+                limiter = AdaptiveHostRateLimiter(1.0 / self.rate_limit, self.burst, max_rate=self.max_rate)
+            else:
+                limiter = HostRateLimiter(1.0 / self.rate_limit, self.burst)
+        self.limiter = limiter
+        loop = asyncio.get_running_loop()
+        self._loop = loop if limiter is not None else None
+        work = profile_calls(work)
+        # A dedicated pool: the default executor is often smaller than max_concurrency
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        pending: asyncio.Queue = asyncio.Queue()
+        results: asyncio.Queue = asyncio.Queue()
+        count = 0
+        for item in items:
+            pending.put_nowait(item)
+            count += 1
+
+        async def worker():
+            while True:
+                try:
+                    item = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                imdb_id = imdb_id_for(item)
+                try:
+                    if self.rate_limit > 0:
+                        waited = await limiter.acquire(self._guide_url(imdb_id))
+                        self.metrics.count("rate_limit_sleep_seconds", waited)
+                    result = await loop.run_in_executor(executor, work, item)
+                except Exception as e:
+                    # One bad page must not end the stream for every other title
+                    print(f"Error processing {imdb_id}: {e}", file=sys.stderr)
+                    result = {"imdb_id": imdb_id, "title": None, "warnings": {}, "error": str(e)}
+                await results.put(result)
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.max_concurrency, count))]
+        try:
+            for _ in range(count):
+                yield await results.get()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            executor.shutdown(wait=False)
+            self._loop = None
+
+    async def scrape_many(self, imdb_ids: Iterable[str]) -> AsyncIterator[Dict]:
+        """
+        Scrape many Parents Guides concurrently
+
+        Args:
+            imdb_ids: IMDb IDs to scrape
+
+        Yields:
+            scrape_parents_guide-style dictionaries, in completion order
+        """
+        async for result in self._run_many(imdb_ids, self._fetch_and_parse, lambda imdb_id: imdb_id):
+            yield result
+
+    async def process_many(self, movies: Iterable[Tuple[str, int]]) -> AsyncIterator[Dict]:
+        """
+        Run the full pipeline for many movies concurrently
+
+        Args:
+            movies: (imdb_id, runtime_minutes) pairs
+
+        Yields:
+            process_movie-style dictionaries, in completion order
+        """
+        def work(movie):
+            imdb_id, runtime_minutes = movie
+            return self._build_output(self._fetch_and_parse(imdb_id), imdb_id, runtime_minutes)
+
+        async for result in self._run_many(movies, work, lambda movie: movie[0]):
+            yield result
+
+    async def load_cached_many(self, imdb_ids: Iterable[str]) -> AsyncIterator[Dict]:
+        """scrape_many from the artifact store: a local CPU job, no network or rate limit"""
+        for imdb_id in imdb_ids:
+            yield self.load_cached(imdb_id)
+
+    async def reestimate_many(self, movies: Iterable[Tuple[str, int]]) -> AsyncIterator[Dict]:
+        """process_many from the artifact store's parsed warnings, in the order given"""
+        for imdb_id, runtime_minutes in movies:
+            yield self.reestimate_movie(imdb_id, runtime_minutes)
+
+
+def parse_title_args(values: List[str]) -> List[Tuple[str, int]]:
+    """Turn ['tt1', '130', 'tt2', '152'] into [('tt1', 130), ('tt2', 152)]"""
+    if len(values) % 2:
+        raise ValueError("expected <imdb_id> <runtime_minutes> pairs")
+    movies = []
+    for imdb_id, runtime in zip(values[::2], values[1::2]):
+        # Validate IMDb ID format
+        if not re.match(r'^tt\d+$', imdb_id):
+            raise ValueError(f"Invalid IMDb ID format: {imdb_id} "
+                             "(expected tt followed by numbers, e.g. tt1745960)")
+        movies.append((imdb_id, int(runtime)))
+    return movies
+
+
+async def _collect(scraper: IMDbScraper, movies: List[Tuple[str, int]], cached: bool = False) -> List[Dict]:
+    results = {}
+    async for result in (scraper.reestimate_many if cached else scraper.process_many)(movies):
+        results[result["imdb_id"]] = result
+    # Report in the order the titles were given
+    return [results[imdb_id] for imdb_id, _ in movies]
+
+
+async def _stream_ndjson(scraper: IMDbScraper, movies: List[Tuple[str, int]], out=None, cached: bool = False) -> int:
+    """
+    Write one compact JSON record per line as each title completes
+
+    Returns:
+        Number of records that carry an error
+    """
+    out = out or sys.stdout
+    errors = 0
+    async for result in (scraper.reestimate_many if cached else scraper.process_many)(movies):
+        errors += 1 if result.get("error") else 0
+        out.write(json.dumps(result, separators=(",", ":")) + "\n")
+        out.flush()
+    return errors
+
+
+async def _save_many(
+    scraper: IMDbScraper,
+    movies: List[Tuple[str, int]],
+    output_dir: str,
+    index_path: Optional[str] = None,
+    cached: bool = False,
+) -> Dict[str, int]:
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = BuildManifest(output_dir)
+    index = CatalogIndex(index_path) if index_path else CatalogIndex.for_output(output_dir)
+    runtimes = dict(movies)
+    counts = {"written": 0, "unchanged": 0, "error": 0}
+    try:
+        async for data in (scraper.load_cached_many if cached else scraper.scrape_many)(runtimes):
+            counts[scraper.save_output(data, runtimes[data["imdb_id"]], output_dir, manifest, index)] += 1
+    finally:
+        manifest.save()
+        if index is not None:
+            index.save()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Scrape IMDb Parents Guides and estimate timestamps",
+        epilog="Example: python imdb-scraper.py tt1745960 130 tt0468569 152",
+    )
+    parser.add_argument("titles", nargs="*", metavar="imdb_id runtime_minutes",
+                        help="One or more <imdb_id> <runtime_minutes> pairs "
+                             "(with --reestimate, default: every stored title at its last runtime)")
+    parser.add_argument("--rate-limit", type=float, default=1.0,
+                        help="Minimum seconds between requests to a host (default: 1.0)")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="Start at --rate-limit and adapt the request rate to the server (AIMD): "
+                             "speed up while responses are healthy, back off on 429/503 and Retry-After")
+    parser.add_argument("--max-rate", type=float, default=10.0,
+                        help="Ceiling for --adaptive, in requests per second per host (default: 10)")
+    parser.add_argument("--retries", type=int, default=3,
+                        help="Retries for connection errors, 429 and 5xx responses (default: 3)")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="Maximum requests in flight when scraping several titles (default: 8)")
+    parser.add_argument("--base-url", default=IMDbScraper.BASE_URL,
+                        help="Site to scrape, e.g. a local stand-in server (default: https://www.imdb.com)")
+    parser.add_argument("--output-dir",
+                        help="Write <imdb_id>.json files here instead of printing JSON; "
+                             "titles whose scraped inputs are unchanged are skipped")
+    parser.add_argument("--ndjson", action="store_true",
+                        help="Stream one compact JSON record per line as each title finishes "
+                             "(completion order), e.g. into aggregate-timestamps.py --ndjson")
+    parser.add_argument("--index",
+                        help="Catalog index to update with written files "
+                             "(default: index.json at the corpus root above --output-dir)")
+    parser.add_argument("--cache-dir",
+                        help="Directory for the on-disk HTTP cache (disabled if omitted)")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_TTL,
+                        help="Seconds a cached page is used without revalidation (default: 86400)")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="Size cap of the HTTP cache in MB (default: 512)")
+    parser.add_argument("--artifact-dir",
+                        help="Keep each title's fetched page, parsed warnings and estimates here, "
+                             "reused while their inputs and parser/estimator versions match")
+    parser.add_argument("--reestimate", action="store_true",
+                        help="Estimate from the pages and warnings in --artifact-dir without fetching "
+                             "(e.g. after tuning TIME_PATTERNS, or for another cut's runtime)")
+    parser.add_argument("--near-duplicate-threshold", type=float, metavar="JACCARD",
+                        help=f"Drop warnings within a category that are near duplicates of an earlier one "
+                             f"(off by default; at {NEAR_DUPLICATE_THRESHOLD} only case, punctuation and "
+                             f"spacing variants collapse)")
+    parser.add_argument("--metrics-json",
+                        help="Write per-stage timers and counters to this JSON file")
+    parser.add_argument("--metrics-prom",
+                        help="Write the same metrics in Prometheus text format (for the textfile collector)")
+    parser.add_argument("--profile", choices=PROFILE_KINDS,
+                        help="Profile the run (cProfile or tracemalloc) and write collapsed stacks")
+    parser.add_argument("--profile-output",
+                        help="Collapsed-stack file for --profile (default: scraper-<kind>.folded)")
+    args = parser.parse_args()
+
+    if args.ndjson and args.output_dir:
+        parser.error("--ndjson and --output-dir are mutually exclusive")
+    if args.reestimate and not args.artifact_dir:
+        parser.error("--reestimate needs --artifact-dir")
+    if args.near_duplicate_threshold is not None and not 0 < args.near_duplicate_threshold <= 1:
+        parser.error("--near-duplicate-threshold must be in (0, 1]")
+    if not args.titles and not args.reestimate:
+        parser.error("expected <imdb_id> <runtime_minutes> pairs")
+
+    try:
+        movies = parse_title_args(args.titles)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
 
-    # Output JSON
-    print(json.dumps(result, indent=2))
+    scraper = IMDbScraper(
+        rate_limit=args.rate_limit,
+        max_concurrency=args.concurrency,
+        cache_dir=args.cache_dir,
+        cache_ttl=args.cache_ttl,
+        cache_max_bytes=args.cache_max_mb * 1024 * 1024,
+        adaptive=args.adaptive,
+        max_rate=args.max_rate,
+        retries=args.retries,
+        base_url=args.base_url,
+        artifact_dir=args.artifact_dir,
+        near_duplicate_threshold=args.near_duplicate_threshold,
+    )
+
+    if args.reestimate and not movies:
+        stored = scraper.artifacts.titles()
+        movies = [(imdb_id, runtime) for imdb_id, runtime in stored if runtime is not None]
+        for imdb_id, runtime in stored:
+            if runtime is None:
+                print(f"Skipping {imdb_id}: never estimated, so its runtime is unknown", file=sys.stderr)
+
+    profiler = contextlib.nullcontext()
+    if args.profile:
+        profiler = profile(args.profile, args.profile_output or f"scraper-{args.profile}.folded")
+
+    with profiler:
+        if args.output_dir:
+            counts = asyncio.run(_save_many(scraper, movies, args.output_dir, args.index, args.reestimate))
+            print(f"Wrote {counts['written']}, unchanged {counts['unchanged']}, "
+                  f"errors {counts['error']}", file=sys.stderr)
+        elif args.ndjson:
+            try:
+                asyncio.run(_stream_ndjson(scraper, movies, cached=args.reestimate))
+            except BrokenPipeError:
+                # The consumer went away (e.g. `| head`): silence the flush at exit
+                os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+                sys.exit(1)
+        else:
+            if len(movies) == 1:
+                result = (scraper.reestimate_movie if args.reestimate else scraper.process_movie)(*movies[0])
+            else:
+                result = asyncio.run(_collect(scraper, movies, args.reestimate))
+
+            # Output JSON
+            print(json.dumps(result, indent=2))
+
+    if scraper.cache:
+        print(scraper.cache.summary(), file=sys.stderr)
+
+    if args.metrics_json or args.metrics_prom:
+        metrics = scraper.collect_metrics()
+        print(metrics.summary(["fetch_seconds", "parse_seconds", "estimate_seconds", "write_seconds"]),
+              file=sys.stderr)
+        if args.metrics_json:
+            metrics.write_json(args.metrics_json)
+        if args.metrics_prom:
+            metrics.write_prometheus(args.metrics_prom)
 
 
 if __name__ == "__main__":
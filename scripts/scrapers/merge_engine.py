@@ -0,0 +1,203 @@
+"""
+FilterFlix Array Merge Engine
+NumPy implementation of the aggregator's group-and-merge step
+
+aggregate-timestamps.py groups similar timestamps per type with a sweep line
+and merges each group by averaging its start, end and severity. Here every
+source's timestamps are converted once into parallel arrays (start and end
+seconds, type, severity and source codes) and the sweep becomes array
+operations:
+
+    1. lexsort by (type, start, input position), the order the sweep visits
+    2. a segmented running maximum of the ends finds the timestamps that
+       overlap what came before them; only the remaining candidates need the
+       sequential "within 30 s of the cluster's first start" test
+    3. np.add.reduceat over the cluster boundaries gives the sums for the
+       averages, and np.unique over (cluster, source) pairs the distinct
+       source counts
+
+Only descriptions and source lists, which are strings, are still built per
+group (combine_descriptions, which the Python path uses too). The result is identical to merge_timestamp_group over
+group_similar_timestamps, key order included. Inputs the fast path does not
+cover (a missing start or end, a non-integer severity, an unparseable time)
+make merge_timestamp_groups return None so the caller can use the Python path.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from near_duplicates import distinct_texts
+from packed_corpus import format_time, parse_time
+
+try:
+    import numpy as np
+except ImportError:  # the Python merge path needs nothing extra
+    np = None
+
+GROUP_THRESHOLD_SECONDS = 30
+
+# A merged description joins the first few distinct member descriptions;
+# rewordings of one already taken are skipped, and no more than
+# DESCRIPTION_CANDIDATES different strings are looked at per group
+MAX_DESCRIPTIONS = 3
+DESCRIPTION_CANDIDATES = 16
+
+
+def available() -> bool:
+    return np is not None
+
+
+def combine_descriptions(descriptions: Iterable[str]) -> str:
+    """Merged description of a group, shared by both merge engines"""
+    return " | ".join(distinct_texts((description[:100] for description in descriptions),
+                                     limit=MAX_DESCRIPTIONS, max_candidates=DESCRIPTION_CANDIDATES))
+
+
+def parse_times(values: Sequence[str]) -> Optional["np.ndarray"]:
+    """
+    HH:MM:SS strings to int64 seconds
+
+    Zero-padded 8-character times are decoded straight from their code
+    points; anything else goes through parse_time one value at a time.
+
+    Returns:
+        None if a value cannot be parsed
+    """
+    array = np.array(values)
+    if array.dtype == np.dtype("<U8"):
+        digits = array.view(np.uint32).reshape(-1, 8).astype(np.int64) - ord("0")
+        well_formed = (
+            (digits[:, [2, 5]] == ord(":") - ord("0")).all()
+            and (digits[:, [0, 1, 3, 4, 6, 7]] >= 0).all()
+            and (digits[:, [0, 1, 3, 4, 6, 7]] <= 9).all()
+        )
+        if well_formed:
+            return ((digits[:, 0] * 10 + digits[:, 1]) * 3600
+                    + (digits[:, 3] * 10 + digits[:, 4]) * 60
+                    + digits[:, 6] * 10 + digits[:, 7])
+    try:
+        return np.fromiter((parse_time(value) for value in values), dtype=np.int64, count=len(values))
+    except (AttributeError, IndexError, TypeError, ValueError):
+        return None
+
+
+def merge_timestamp_groups(
+    timestamps_by_source: List[List[Dict]],
+    source_names: List[str],
+    threshold_seconds: int = GROUP_THRESHOLD_SECONDS,
+) -> Optional[List[Dict]]:
+    """
+    Group and merge every source's timestamps with array operations
+
+    Args:
+        timestamps_by_source: Each source's timestamp dicts, in source order
+        source_names: Name credited for each source (names may repeat)
+        threshold_seconds: Time window for grouping
+
+    Returns:
+        Merged timestamps in group order (before the aggregator's final sort
+        by start), or None when the input needs the Python path
+    """
+    flat = [ts for timestamps in timestamps_by_source for ts in timestamps]
+    count = len(flat)
+    if not count:
+        return []
+
+    start_values = [ts.get("start") for ts in flat]
+    end_values = [ts.get("end") for ts in flat]
+    severities = [ts.get("severity", 5) for ts in flat]
+    if not all(start_values) or not all(end_values) or not {type(value) for value in severities} <= {int, bool}:
+        return None
+    starts = parse_times(start_values)
+    ends = parse_times(end_values)
+    if starts is None or ends is None:
+        return None
+    severity = np.array(severities, dtype=np.int64)
+    type_values = [ts.get("type") for ts in flat]
+    type_codes = {value: code for code, value in enumerate(dict.fromkeys(type_values))}
+    type_code = np.array([type_codes[value] for value in type_values], dtype=np.int64)
+
+    name_codes: Dict[str, int] = {}
+    per_source = [name_codes.setdefault(name, len(name_codes)) for name in source_names]
+    names = list(name_codes)
+    source_code = np.repeat(np.array(per_source, dtype=np.int64),
+                            [len(timestamps) for timestamps in timestamps_by_source])
+
+    # 1. Visit order of the sweep: per type, by start, ties in input order
+    order = np.lexsort((np.arange(count), starts, type_code))
+    s_start = starts[order]
+    s_end = ends[order]
+    s_type = type_code[order]
+
+    # 2. Running max of the ends before each position, restarted per type by
+    # lifting each type's values into its own band
+    low = min(int(s_start.min()), int(s_end.min()))
+    span = max(int(s_start.max()), int(s_end.max())) - low + 1
+    lifted = s_end - low + s_type * span
+    reach = np.empty(count, dtype=np.int64)
+    reach[0] = -1
+    reach[1:] = np.maximum.accumulate(lifted)[:-1]
+    first_of_type = np.empty(count, dtype=bool)
+    first_of_type[0] = True
+    first_of_type[1:] = s_type[1:] != s_type[:-1]
+    candidate = first_of_type | (s_start - low + s_type * span > reach)
+
+    # Only candidates can open a cluster; those within the window of the
+    # current cluster's first start stay in it
+    breaks = np.zeros(count, dtype=bool)
+    anchor = 0
+    for position, start, new_type in zip(np.flatnonzero(candidate).tolist(),
+                                         s_start[candidate].tolist(),
+                                         first_of_type[candidate].tolist()):
+        if new_type or start - anchor > threshold_seconds:
+            breaks[position] = True
+            anchor = start
+
+    # 3. Per-cluster reductions
+    bounds = np.flatnonzero(breaks)
+    sizes = np.diff(np.append(bounds, count))
+    start_sums = np.add.reduceat(s_start, bounds)
+    end_sums = np.add.reduceat(s_end, bounds)
+    severity_sums = np.add.reduceat(severity[order], bounds)
+    first = order[bounds]
+
+    cluster_of = np.cumsum(breaks) - 1
+    keys = cluster_of * len(names) + source_code[order]
+    unique_keys, first_seen = np.unique(keys, return_index=True)
+    source_counts = np.bincount(unique_keys // len(names), minlength=len(bounds))
+    # (cluster, source) pairs in first-seen order; clusters are contiguous in
+    # the sweep order, so each cluster's sources come out together and in order
+    seen = np.argsort(first_seen, kind="stable")
+    pair_names = (unique_keys % len(names))[seen].tolist()
+    pair_offsets = np.concatenate(([0], np.cumsum(source_counts))).tolist()
+
+    confidence = {n: round(min(0.5 + (n * 0.15), 0.95), 2) for n in set(source_counts.tolist())}
+
+    merged = []
+    order_list = order.tolist()
+    cluster_order = np.lexsort((first, s_start[bounds]))
+    for cluster in cluster_order.tolist():
+        size = int(sizes[cluster])
+        position = int(bounds[cluster])
+        if size == 1:
+            ts = flat[order_list[position]].copy()
+            ts.pop("_source", None)
+            ts.pop("_source_idx", None)
+            ts["confidence"] = 0.5
+            ts["sources_count"] = 1
+            merged.append(ts)
+            continue
+
+        members = order_list[position:position + size]
+        sources = [names[code] for code in pair_names[pair_offsets[cluster]:pair_offsets[cluster + 1]]]
+        merged.append({
+            "start": format_time(int(start_sums[cluster]) // size),
+            "end": format_time(int(end_sums[cluster]) // size),
+            "type": flat[members[0]].get("type", "unknown"),
+            "severity": int(severity_sums[cluster]) // size,
+            "description": combine_descriptions(flat[idx].get("description", "") for idx in members),
+            "verified": len(sources) >= 3,
+            "confidence": confidence[len(sources)],
+            "sources_count": len(sources),
+            "sources": sources,
+        })
+    return merged
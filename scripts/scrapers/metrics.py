@@ -0,0 +1,179 @@
+"""
+FilterFlix Metrics
+Per-stage counters and latency histograms for the scraper and aggregator
+
+A Metrics registry is cheap enough to leave on: counters are dict updates and
+timers are two perf_counter() calls. At the end of a run it is exported as a
+JSON summary and/or a Prometheus text-format file (for node_exporter's
+textfile collector):
+
+    metrics = Metrics("filterflix_scraper")
+    with metrics.timer("parse_seconds"):
+        ...
+    metrics.count("bytes_downloaded", len(body))
+    metrics.write_json("run-metrics.json")
+    metrics.write_prometheus("run-metrics.prom")
+
+Snapshots from worker processes can be folded into the parent with merge().
+"""
+
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Sequence
+
+from corpus_io import write_json_atomic
+
+# Upper bounds in seconds, from 1 ms to 1 min
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram (cumulative buckets are derived on export)"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (max for the +Inf bucket)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip([str(b) for b in self.buckets] + ["+Inf"], self.counts)),
+        }
+
+
+class Metrics:
+    """Thread-safe registry of counters, gauges and histograms"""
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+        self.started = time.time()
+        self.counters: Dict[str, float] = {}
+        self.gauges: Dict[str, float] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def count(self, name: str, amount: float = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def gauge(self, name: str, value: float):
+        with self._lock:
+            self.gauges[name] = value
+
+    def observe(self, name: str, value: float):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Observe the duration of the with-block (in seconds) into histogram `name`"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def merge(self, snapshot: Dict):
+        """Add a to_dict() snapshot (e.g. from a worker process) into this registry"""
+        with self._lock:
+            for name, value in snapshot.get("counters", {}).items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            self.gauges.update(snapshot.get("gauges", {}))
+            for name, data in snapshot.get("histograms", {}).items():
+                histogram = self.histograms.get(name)
+                if histogram is None:
+                    histogram = self.histograms[name] = Histogram()
+                for i, count in enumerate(data["buckets"].values()):
+                    histogram.counts[i] += count
+                histogram.count += data["count"]
+                histogram.sum += data["sum"]
+                histogram.max = max(histogram.max, data["max"])
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            elapsed = time.time() - self.started
+            return {
+                "namespace": self.namespace,
+                "elapsed_seconds": elapsed,
+                "counters": dict(sorted(self.counters.items())),
+                "gauges": dict(sorted(self.gauges.items())),
+                "histograms": {name: h.to_dict() for name, h in sorted(self.histograms.items())},
+            }
+
+    def rate(self, counter: str) -> float:
+        """Counter value per second of wall time since the registry was created"""
+        elapsed = time.time() - self.started
+        return self.counters.get(counter, 0) / elapsed if elapsed > 0 else 0.0
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        snapshot = self.to_dict()
+        for name, value in snapshot["counters"].items():
+            metric = f"{self.namespace}_{name}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        for name, value in snapshot["gauges"].items():
+            metric = f"{self.namespace}_{name}"
+            lines += [f"# TYPE {metric} gauge", f"{metric} {value}"]
+        for name, data in snapshot["histograms"].items():
+            metric = f"{self.namespace}_{name}"
+            lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, count in data["buckets"].items():
+                cumulative += count
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+            lines += [f"{metric}_sum {data['sum']}", f"{metric}_count {data['count']}"]
+        return "\n".join(lines) + "\n"
+
+    def summary(self, stages: Sequence[str] = ()) -> str:
+        """One line of totals for the given histograms, for stderr"""
+        parts = []
+        for name in stages:
+            histogram = self.histograms.get(name)
+            if histogram and histogram.count:
+                label = name[:-len("_seconds")] if name.endswith("_seconds") else name
+                parts.append(f"{label} {histogram.sum:.2f}s/{histogram.count}")
+        return "Stages: " + ", ".join(parts) if parts else "Stages: nothing recorded"
+
+    def write_json(self, path: str):
+        write_json_atomic(path, self.to_dict())
+
+    def write_prometheus(self, path: str):
+        # The textfile collector reads *.prom files; write then rename so it never sees half a file
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
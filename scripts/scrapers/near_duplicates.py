@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+FilterFlix Near-Duplicate Text Detection
+MinHash signatures and LSH banding over character shingles
+
+IMDb, Reddit and user submissions describe the same scene in different
+words ("A man is shot in the head." / "A man gets shot in the head"), so
+exact-string dedupe keeps every rewording. Here each text is normalised
+(casefolded, punctuation dropped, whitespace collapsed) and cut into
+overlapping 3-character shingles. Two texts are near duplicates when the
+Jaccard similarity of their shingle sets reaches the threshold and they
+carry the same numbers and counts (digits, "once", "twice", ...).
+
+The default threshold of 0.9 is deliberately conservative: distinct scenes
+often differ by a word or two and still score high ("smokes a cigarette" /
+"smokes a cigar" 0.85, "says the f-word once" / "the s-word once" 0.77), and
+for a content filter dropping a real scene is worse than listing one twice.
+At 0.9 only trivial variants (case, punctuation, spacing, an added article)
+collapse; rewordings like the pair above (0.71) are kept. Collapsing
+paraphrases is not provided: no shingle threshold separates them from
+distinct scenes, and the number check cannot either.
+
+NearDuplicateIndex finds those pairs without comparing every pair: each
+text gets a 64-value MinHash signature, split into 16 bands of 4; texts that
+agree on any whole band land in the same bucket and become candidates, and
+only candidates are compared exactly. A lookup costs one signature plus the
+few candidates in its buckets, however many texts are indexed.
+
+Used by both merge engines (per group of timestamps) and, when enabled with
+near_duplicate_threshold (imdb-scraper.py --near-duplicate-threshold), by the
+Parents Guide extractor (per category).
+
+Usage:
+    python near_duplicates.py descriptions.txt                # one text per line
+    python near_duplicates.py descriptions.txt --threshold 0.6 --clusters
+"""
+
+import argparse
+import re
+import sys
+import zlib
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # the pure-Python signature gives the same values
+    np = None
+
+SHINGLE_SIZE = 3
+NEAR_DUPLICATE_THRESHOLD = 0.9
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+# Universal hashing (a * x + b) mod a Mersenne prime; a < 2^31 and shingle
+# hashes < 2^32 keep the products inside uint64 for the NumPy path
+_PRIME = (1 << 61) - 1
+_SEED = 0x5EED
+
+
+def _coefficients(count: int, seed: int = _SEED) -> List[Tuple[int, int]]:
+    state = seed
+    pairs = []
+    for _ in range(count):
+        # splitmix64: deterministic across processes and Python versions
+        values = []
+        for _ in range(2):
+            state = (state + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+            z = state
+            z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+            z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+            values.append(z ^ (z >> 31))
+        pairs.append((values[0] % ((1 << 31) - 1) + 1, values[1] % (1 << 32)))
+    return pairs
+
+
+_COEFFICIENTS = _coefficients(NUM_PERM)
+if np is not None:
+    _A = np.array([a for a, _ in _COEFFICIENTS], dtype=np.uint64)[:, None]
+    _B = np.array([b for _, b in _COEFFICIENTS], dtype=np.uint64)[:, None]
+
+
+# Words that carry a count or position; texts that differ in them never match
+NUMBER_WORDS = frozenset(
+    "zero one two three four five six seven eight nine ten eleven twelve twenty thirty forty fifty "
+    "hundred once twice thrice first second third fourth fifth last".split()
+)
+
+
+def normalize(text: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", text.casefold()).split())
+
+
+@lru_cache(maxsize=1 << 16)
+def numbers(text: str) -> Tuple[str, ...]:
+    """Digit runs and number words of the normalised text, in order"""
+    return tuple(word for word in normalize(text).split() if word.isdigit() or word in NUMBER_WORDS)
+
+
+@lru_cache(maxsize=1 << 16)
+def shingles(text: str) -> FrozenSet[str]:
+    """Character shingles of the normalised text (the whole text if shorter)"""
+    text = normalize(text)
+    if len(text) <= SHINGLE_SIZE:
+        return frozenset([text]) if text else frozenset()
+    return frozenset(text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+@lru_cache(maxsize=1 << 16)
+def signature(text: str) -> Tuple[int, ...]:
+    """MinHash signature (NUM_PERM values) of a text's shingle set"""
+    hashes = [zlib.crc32(shingle.encode("utf-8")) for shingle in shingles(text)]
+    if not hashes:
+        return ()
+    if np is not None:
+        values = np.array(hashes, dtype=np.uint64)[None, :]
+        return tuple(((_A * values + _B) % np.uint64(_PRIME)).min(axis=1).tolist())
+    return tuple(min((a * x + b) % _PRIME for x in hashes) for a, b in _COEFFICIENTS)
+
+
+class NearDuplicateIndex:
+    """LSH index of texts for near-duplicate lookups"""
+
+    def __init__(self, threshold: float = NEAR_DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self.texts: List[str] = []
+        self.buckets: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in range(BANDS)]
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def _bands(self, text: str) -> List[Tuple[int, ...]]:
+        values = signature(text)
+        return [values[band * ROWS:(band + 1) * ROWS] for band in range(BANDS)] if values else []
+
+    def query(self, text: str) -> Optional[int]:
+        """Position of the first indexed text that text nearly duplicates, or None"""
+        candidates = set()
+        for band, key in enumerate(self._bands(text)):
+            candidates.update(self.buckets[band].get(key, ()))
+        target = shingles(text)
+        counts = numbers(text)
+        for position in sorted(candidates):
+            other = self.texts[position]
+            if other == text or (numbers(other) == counts
+                                 and jaccard(target, shingles(other)) >= self.threshold):
+                return position
+        return None
+
+    def add(self, text: str) -> int:
+        """Index text (without checking it); returns its position"""
+        position = len(self.texts)
+        self.texts.append(text)
+        for band, key in enumerate(self._bands(text)):
+            self.buckets[band].setdefault(key, []).append(position)
+        return position
+
+
+def distinct_texts(
+    texts: Iterable[str],
+    limit: Optional[int] = None,
+    threshold: float = NEAR_DUPLICATE_THRESHOLD,
+    max_candidates: Optional[int] = None,
+) -> List[str]:
+    """
+    Texts in first-seen order without exact or near duplicates of earlier ones
+
+    Args:
+        texts: Texts to dedupe
+        limit: Stop once this many texts are kept
+        threshold: Jaccard similarity at which two texts count as duplicates
+        max_candidates: Stop after this many exactly-distinct texts were
+            examined (bounds the work on huge inputs)
+
+    Returns:
+        The first text of each group of near duplicates
+    """
+    index = NearDuplicateIndex(threshold)
+    seen = set()
+    kept = []
+    for text in texts:
+        if text in seen:
+            continue
+        seen.add(text)
+        if index.query(text) is None:
+            index.add(text)
+            kept.append(text)
+            if limit is not None and len(kept) >= limit:
+                break
+        if max_candidates is not None and len(seen) >= max_candidates:
+            break
+    return kept
+
+
+def clusters(texts: Iterable[str], threshold: float = NEAR_DUPLICATE_THRESHOLD) -> List[List[str]]:
+    """Group texts under the first text each nearly duplicates"""
+    index = NearDuplicateIndex(threshold)
+    groups: List[List[str]] = []
+    for text in texts:
+        position = index.query(text)
+        if position is None:
+            index.add(text)
+            groups.append([text])
+        else:
+            groups[position].append(text)
+    return groups
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find near-duplicate lines with MinHash/LSH")
+    parser.add_argument("file", help="Text file, one text per line ('-' for stdin)")
+    parser.add_argument("--threshold", type=float, default=NEAR_DUPLICATE_THRESHOLD,
+                        help=f"Jaccard similarity of 3-character shingles (default {NEAR_DUPLICATE_THRESHOLD}); "
+                             "texts with different numbers never match")
+    parser.add_argument("--clusters", action="store_true", help="Print each group of near duplicates")
+    args = parser.parse_args()
+
+    stream = sys.stdin if args.file == "-" else open(args.file, encoding="utf-8")
+    with stream:
+        texts = [line.strip() for line in stream if line.strip()]
+    groups = clusters(texts, args.threshold)
+    if args.clusters:
+        for group in groups:
+            if len(group) > 1:
+                print("\n  ".join(group) + "\n")
+    else:
+        for group in groups:
+            print(group[0])
+    print(f"{len(texts)} texts, {len(groups)} distinct", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
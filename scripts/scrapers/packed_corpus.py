@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+FilterFlix Packed Corpus
+Columnar binary format for the whole timestamp corpus, loaded with mmap
+
+Packing turns every timestamp file under a directory into one file of flat
+little-endian columns:
+
+    movies     imdb_id / title (string ids), year, runtime, version,
+               segment_offsets (CSR: movie i owns segments [o[i], o[i+1]))
+    segments   start / end (uint32 seconds), type (uint8 code),
+               severity (uint8), verified (uint8), confidence (uint8 percent,
+               255 = unknown), description (string id)
+    strings    uint32 offsets + one UTF-8 blob; equal strings are stored once
+
+The loader maps the file and exposes every column as a zero-copy NumPy
+view, so opening the catalog costs a page-table update, not a parse.
+
+Usage:
+    python packed_corpus.py pack ../../timestamps corpus.ffc
+    python packed_corpus.py info corpus.ffc
+    python packed_corpus.py query corpus.ffc --type violence --min-severity 8
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # only the loader needs NumPy
+    np = None
+
+MAGIC = b"FFXCORP1"
+FORMAT_VERSION = 1
+
+TYPES = ["nudity", "profanity", "violence", "substances", "frightening"]
+TYPE_CODES = {name: code for code, name in enumerate(TYPES)}
+UNKNOWN_TYPE = 255
+UNKNOWN_CONFIDENCE = 255
+
+NON_CORPUS_FILES = {"schema.json", "index.json"}
+
+# Section directory entry: name, NumPy dtype string, byte offset, item count
+_HEADER = struct.Struct("<8sII")
+_SECTION = struct.Struct("<16s4sQQ")
+
+# (section name, array typecode, NumPy dtype)
+COLUMNS = [
+    ("movie_imdb_id", "I", "<u4"),
+    ("movie_title", "I", "<u4"),
+    ("movie_year", "H", "<u2"),
+    ("movie_runtime", "H", "<u2"),
+    ("movie_version", "I", "<u4"),
+    ("segment_offsets", "I", "<u4"),
+    ("start", "I", "<u4"),
+    ("end", "I", "<u4"),
+    ("type", "B", "|u1"),
+    ("severity", "B", "|u1"),
+    ("verified", "B", "|u1"),
+    ("confidence", "B", "|u1"),
+    ("description", "I", "<u4"),
+    ("string_offsets", "I", "<u4"),
+    ("string_data", "B", "|u1"),
+]
+
+
+def parse_time(value: str) -> int:
+    parts = value.split(":")
+    return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
+
+
+def format_time(seconds: int) -> str:
+    return f"{seconds // 3600:02d}:{(seconds % 3600) // 60:02d}:{seconds % 60:02d}"
+
+
+def type_name(code: int) -> str:
+    """Content type of a `type` column code ("unknown" for UNKNOWN_TYPE)"""
+    return TYPES[code] if code != UNKNOWN_TYPE else "unknown"
+
+
+def iter_corpus_files(root: str) -> Iterator[str]:
+    """Timestamp files under root in a stable order (dot-files, schema and index skipped)"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for filename in sorted(filenames):
+            if filename.endswith(".json") and not filename.startswith(".") and filename not in NON_CORPUS_FILES:
+                yield os.path.join(dirpath, filename)
+
+
+def iter_corpus(root: str) -> Iterator[Tuple[str, Dict]]:
+    """(path, data) for every file under root that looks like a timestamp file"""
+    for path in iter_corpus_files(root):
+        with open(path) as f:
+            data = json.load(f)
+        if isinstance(data, dict) and data.get("imdb_id") and isinstance(data.get("timestamps"), list):
+            yield path, data
+
+
+class _StringTable:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.offsets = array("I", [0])
+        self.data = bytearray()
+
+    def add(self, value: Optional[str]) -> int:
+        value = value or ""
+        if value not in self.ids:
+            self.ids[value] = len(self.ids)
+            self.data += value.encode("utf-8")
+            self.offsets.append(len(self.data))
+        return self.ids[value]
+
+
+def pack_corpus(root: str, output_path: str) -> Dict[str, int]:
+    """
+    Pack every timestamp file under root into one columnar file
+
+    Returns:
+        Counts of movies, segments and distinct strings
+    """
+    return pack_movies((data for _, data in iter_corpus(root)), output_path)
+
+
+def pack_movies(movies: Iterable[Dict], output_path: str) -> Dict[str, int]:
+    """
+    Pack timestamp dicts (schema layout) into one columnar file
+
+    Args:
+        movies: Timestamp dicts, in the row order they should get
+        output_path: File to write (replaced atomically)
+
+    Returns:
+        Counts of movies, segments and distinct strings
+    """
+    columns = {name: array(code) for name, code, _ in COLUMNS}
+    strings = _StringTable()
+    columns["segment_offsets"].append(0)
+
+    for data in movies:
+        columns["movie_imdb_id"].append(strings.add(data["imdb_id"]))
+        columns["movie_title"].append(strings.add(data.get("title")))
+        columns["movie_year"].append(data.get("year") or 0)
+        columns["movie_runtime"].append(data.get("runtime_minutes") or 0)
+        columns["movie_version"].append(data.get("metadata", {}).get("version") or 0)
+
+        for ts in sorted(data["timestamps"], key=lambda t: parse_time(t["start"])):
+            columns["start"].append(parse_time(ts["start"]))
+            columns["end"].append(parse_time(ts["end"]))
+            columns["type"].append(TYPE_CODES.get(ts.get("type"), UNKNOWN_TYPE))
+            columns["severity"].append(ts.get("severity", 5))
+            columns["verified"].append(1 if ts.get("verified") else 0)
+            confidence = ts.get("confidence")
+            columns["confidence"].append(UNKNOWN_CONFIDENCE if confidence is None else round(confidence * 100))
+            columns["description"].append(strings.add(ts.get("description")))
+        columns["segment_offsets"].append(len(columns["start"]))
+
+    columns["string_offsets"] = strings.offsets
+    columns["string_data"] = array("B", bytes(strings.data))
+
+    # Lay the sections out after the directory, each 8-byte aligned
+    offset = _HEADER.size + _SECTION.size * len(COLUMNS)
+    directory = []
+    payloads = []
+    for name, _, dtype in COLUMNS:
+        column = columns[name]
+        if sys.byteorder == "big" and column.itemsize > 1:
+            column.byteswap()
+        offset += -offset % 8
+        directory.append(_SECTION.pack(name.encode(), dtype.encode(), offset, len(column)))
+        payloads.append((offset, column.tobytes()))
+        offset += len(payloads[-1][1])
+
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(COLUMNS)))
+        f.write(b"".join(directory))
+        for section_offset, payload in payloads:
+            f.write(b"\0" * (section_offset - f.tell()))
+            f.write(payload)
+    os.replace(tmp_path, output_path)
+
+    return {
+        "movies": len(columns["movie_imdb_id"]),
+        "segments": len(columns["start"]),
+        "strings": len(strings.ids),
+    }
+
+
+class PackedCorpus:
+    """Read-only, memory-mapped view of a packed corpus file"""
+
+    def __init__(self, path: str):
+        if np is None:
+            raise ImportError("PackedCorpus needs NumPy: pip install numpy")
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, section_count = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a packed corpus (format {FORMAT_VERSION})")
+
+        self.columns = {}
+        for i in range(section_count):
+            name, dtype, offset, count = _SECTION.unpack_from(self._map, _HEADER.size + i * _SECTION.size)
+            name = name.rstrip(b"\0").decode()
+            self.columns[name] = np.frombuffer(self._map, dtype=dtype.rstrip(b"\0").decode(),
+                                               count=count, offset=offset)
+
+        for name in ("start", "end", "type", "severity", "verified", "confidence", "description",
+                     "segment_offsets"):
+            setattr(self, name, self.columns[name])
+        self._string_offsets = self.columns["string_offsets"]
+        self._string_data = self.columns["string_data"]
+        self._ids: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.columns["movie_imdb_id"])
+
+    def string(self, string_id: int) -> str:
+        start, end = self._string_offsets[string_id], self._string_offsets[string_id + 1]
+        return self._string_data[start:end].tobytes().decode("utf-8")
+
+    def movie_index(self, imdb_id: str) -> int:
+        """Row of a movie; the id lookup table is built on first use"""
+        if self._ids is None:
+            self._ids = {self.string(sid): row for row, sid in enumerate(self.columns["movie_imdb_id"].tolist())}
+        return self._ids[imdb_id]
+
+    def segment_range(self, row: int) -> slice:
+        return slice(int(self.segment_offsets[row]), int(self.segment_offsets[row + 1]))
+
+    def segments(self, imdb_id: str) -> Dict[str, "np.ndarray"]:
+        """Zero-copy column slices for one movie"""
+        rows = self.segment_range(self.movie_index(imdb_id))
+        return {name: getattr(self, name)[rows] for name in
+                ("start", "end", "type", "severity", "verified", "confidence", "description")}
+
+    def movie(self, imdb_id: str) -> Dict:
+        """Rebuild a movie's timestamp dict (schema layout) from the columns"""
+        row = self.movie_index(imdb_id)
+        rows = self.segment_range(row)
+        timestamps = []
+        for i in range(rows.start, rows.stop):
+            ts = {
+                "start": format_time(int(self.start[i])),
+                "end": format_time(int(self.end[i])),
+                "type": type_name(int(self.type[i])),
+                "severity": int(self.severity[i]),
+                "description": self.string(int(self.description[i])),
+                "verified": bool(self.verified[i]),
+            }
+            if self.confidence[i] != UNKNOWN_CONFIDENCE:
+                ts["confidence"] = int(self.confidence[i]) / 100
+            timestamps.append(ts)
+        data = {
+            "title": self.string(int(self.columns["movie_title"][row])),
+            "imdb_id": imdb_id,
+            "runtime_minutes": int(self.columns["movie_runtime"][row]),
+            "timestamps": timestamps,
+        }
+        if self.columns["movie_year"][row]:
+            data["year"] = int(self.columns["movie_year"][row])
+        return data
+
+    def query(self, types: Optional[List[str]] = None, min_severity: int = 1) -> "np.ndarray":
+        """Indices of all segments of the given types at or above min_severity"""
+        mask = self.severity >= min_severity
+        if types:
+            mask &= np.isin(self.type, [TYPE_CODES[t] for t in types])
+        return np.flatnonzero(mask)
+
+    def movie_of(self, segment_indices: "np.ndarray") -> "np.ndarray":
+        """Movie row owning each segment index"""
+        return np.searchsorted(self.segment_offsets, segment_indices, side="right") - 1
+
+    def close(self):
+        self.columns.clear()
+        for name in ("start", "end", "type", "severity", "verified", "confidence", "description",
+                     "segment_offsets", "_string_offsets", "_string_data"):
+            setattr(self, name, None)
+        self._map.close()
+        self._file.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack and query the timestamp corpus")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    pack_cmd = sub.add_parser("pack", help="Pack a timestamp directory into one file")
+    pack_cmd.add_argument("root", help="Corpus directory (e.g. timestamps/)")
+    pack_cmd.add_argument("output", help="Packed corpus file to write")
+
+    info_cmd = sub.add_parser("info", help="Show counts for a packed corpus")
+    info_cmd.add_argument("corpus")
+
+    query_cmd = sub.add_parser("query", help="List segments matching type/severity")
+    query_cmd.add_argument("corpus")
+    query_cmd.add_argument("--type", action="append", choices=TYPES, help="Content type (repeatable)")
+    query_cmd.add_argument("--min-severity", type=int, default=1)
+    query_cmd.add_argument("--limit", type=int, default=50)
+
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        counts = pack_corpus(args.root, args.output)
+        print(f"Packed {counts['movies']} movies, {counts['segments']} segments, "
+              f"{counts['strings']} distinct strings into {args.output} "
+              f"({os.path.getsize(args.output):,} bytes)")
+        return
+
+    corpus = PackedCorpus(args.corpus)
+    if args.command == "info":
+        print(f"{args.corpus}: {len(corpus)} movies, {len(corpus.start)} segments")
+    else:
+        hits = corpus.query(args.type, args.min_severity)
+        movie_rows = corpus.movie_of(hits)
+        print(f"{len(hits)} matching segments")
+        for seg, row in zip(hits[:args.limit].tolist(), movie_rows[:args.limit].tolist()):
+            imdb_id = corpus.string(int(corpus.columns["movie_imdb_id"][row]))
+            print(f"{imdb_id}  {format_time(int(corpus.start[seg]))}-{format_time(int(corpus.end[seg]))}  "
+                  f"{type_name(int(corpus.type[seg])):<12} {corpus.severity[seg]:>2}  "
+                  f"{corpus.string(int(corpus.description[seg]))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+FilterFlix Profiling
+cProfile / tracemalloc wrappers that write collapsed stacks for flamegraphs
+
+Both profilers write Brendan Gregg's collapsed format, one line per stack:
+
+    main;run_batch;aggregate_movie;merge_timestamps 1234
+
+which flamegraph.pl, speedscope and inferno read directly.
+
+cpu       cProfile. cProfile records caller->callee edges rather than full
+          stacks, so the stacks are rebuilt from the call graph and each
+          function's time is split across its callers in proportion to the
+          time spent under each. The raw .pstats file is written alongside.
+          Values are microseconds. cProfile only sees the thread that enabled
+          it, so code that runs work on thread pools wraps it with
+          profile_calls() to have those calls included.
+memory    tracemalloc. Live allocations at the end of the run, grouped by
+          their allocation traceback (up to 64 frames). Values are bytes.
+"""
+
+import cProfile
+import functools
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+PROFILE_KINDS = ("cpu", "memory")
+
+MAX_DEPTH = 128
+TRACEMALLOC_FRAMES = 64
+
+# Profilers of calls made on other threads during the active cpu profile
+_thread_profiles: Optional[List[cProfile.Profile]] = None
+_thread_profiles_lock = threading.Lock()
+
+
+def profile_calls(fn: Callable) -> Callable:
+    """
+    Wrap fn so calls on pool threads show up in the active cpu profile
+
+    Returns fn unchanged when no cpu profile is running.
+    """
+    if _thread_profiles is None:
+        return fn
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profiler.disable()
+            with _thread_profiles_lock:
+                if _thread_profiles is not None:
+                    _thread_profiles.append(profiler)
+
+    return wrapper
+
+
+def _frame_label(func: Tuple[str, int, str]) -> str:
+    filename, line, name = func
+    if filename == "~":  # built-ins
+        return name.strip("<>").replace(" ", "_")
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def collapse_pstats(stats: pstats.Stats) -> List[str]:
+    """Rebuild collapsed stacks (microseconds of self time) from a cProfile call graph"""
+    raw: Dict = stats.stats
+    callees: Dict = {}
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    totals: Dict[str, float] = {}
+
+    def walk(func, stack: List[str], share: float):
+        _, _, self_time, cumulative, _ = raw[func]
+        if cumulative <= 0 or share <= 0:
+            return
+        fraction = share / cumulative
+        stack.append(_frame_label(func))
+        key = ";".join(stack)
+        totals[key] = totals.get(key, 0.0) + self_time * fraction
+        if len(stack) < MAX_DEPTH:
+            for callee, edge_time in callees.get(func, ()):
+                label = _frame_label(callee)
+                if label not in stack:  # recursion is folded into the first frame
+                    walk(callee, stack, edge_time * fraction)
+        stack.pop()
+
+    roots = [func for func, (_, _, _, _, callers) in raw.items() if not callers]
+    for root in roots:
+        walk(root, [], raw[root][3])
+
+    return [f"{stack} {round(seconds * 1e6)}" for stack, seconds in sorted(totals.items())
+            if round(seconds * 1e6) > 0]
+
+
+def collapse_tracemalloc(snapshot: tracemalloc.Snapshot) -> List[str]:
+    """Collapsed stacks (bytes still allocated) from a tracemalloc snapshot"""
+    lines = []
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ])
+    for stat in snapshot.statistics("traceback"):
+        # Frames run from the oldest call to the allocation site, as collapsed stacks expect
+        frames = [f"{os.path.basename(frame.filename)}:{frame.lineno}" for frame in stat.traceback]
+        lines.append(f"{';'.join(frames)} {stat.size}")
+    return lines
+
+
+@contextmanager
+def profile(kind: str, output: str) -> Iterator[None]:
+    """
+    Profile the with-block and write collapsed stacks to `output`
+
+    Args:
+        kind: "cpu" or "memory"
+        output: Collapsed-stack file to write (cpu also writes <output>.pstats)
+    """
+    if kind not in PROFILE_KINDS:
+        raise ValueError(f"unknown profile kind {kind!r} (expected one of {', '.join(PROFILE_KINDS)})")
+
+    global _thread_profiles
+
+    if kind == "cpu":
+        profiler = cProfile.Profile()
+        _thread_profiles = []
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            with _thread_profiles_lock:
+                others, _thread_profiles = _thread_profiles, None
+            stats = pstats.Stats(profiler)
+            for other in others:
+                stats.add(other)
+            stats.dump_stats(output + ".pstats")
+            _write_lines(output, collapse_pstats(stats))
+            print(f"CPU profile written to {output} (and {output}.pstats)", file=sys.stderr)
+    else:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+        try:
+            yield
+        finally:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            _write_lines(output, collapse_tracemalloc(snapshot))
+            print(f"Memory profile written to {output} "
+                  f"(live {current / 1e6:.1f} MB, peak {peak / 1e6:.1f} MB)", file=sys.stderr)
+
+
+def _write_lines(path: str, lines: List[str]):
+    with open(path, "w") as f:
+        f.write("\n".join(lines))
+        if lines:
+            f.write("\n")
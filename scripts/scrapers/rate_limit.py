@@ -0,0 +1,222 @@
+"""
+FilterFlix Rate Limiting
+Token-bucket limiters shared by the async scraping paths
+
+A bucket refills at `rate` tokens per second up to `capacity` tokens. Each
+request takes one token, so sustained throughput is bounded by the rate while
+short bursts (up to the capacity) go out immediately.
+
+AdaptiveTokenBucket moves its rate with the server's responses (AIMD, as in
+TCP congestion control): every healthy response adds a small step to the rate,
+every 429/503 divides it, and a Retry-After header stops the bucket from
+handing out tokens until the server says it is ready again. The step is
+scaled by 1 / rate, so the rate grows by about `increase` requests per second
+every second, whatever the current rate. A fleet of
+scrapers therefore settles just under the rate the server tolerates instead
+of at a conservative fixed one.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+# Responses that mean "slow down" rather than "this request is broken"
+THROTTLE_STATUSES = frozenset({429, 503})
+# Transient failures worth retrying without touching the rate
+RETRY_STATUSES = THROTTLE_STATUSES | {500, 502, 504}
+
+# Never honour a Retry-After longer than this many seconds
+MAX_RETRY_AFTER = 600.0
+
+
+class TokenBucket:
+    """Asyncio token bucket for a single host"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> float:
+        """
+        Wait until a token is available and take it
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        # The lock serialises waiters so tokens are handed out in FIFO order
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1.0:
+                delay = (1.0 - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+                self._refill()
+            self.tokens -= 1.0
+        return waited
+
+
+class HostRateLimiter:
+    """One token bucket per host, created on first use"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    def bucket_for(self, url: str) -> TokenBucket:
+        host = urlparse(url).netloc
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate, self.capacity)
+        return self.buckets[host]
+
+    async def acquire(self, url: str) -> float:
+        """Wait for a token from the bucket of the URL's host"""
+        return await self.bucket_for(url).acquire()
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    """
+    Token bucket whose rate follows the server's responses (AIMD)
+
+    success() and throttled() are called from the threads that made the
+    requests; acquire() runs on the event loop.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        min_rate: float = 0.05,
+        max_rate: float = 10.0,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+    ):
+        super().__init__(rate, capacity)
+        if not 0 < min_rate <= max_rate:
+            raise ValueError("need 0 < min_rate <= max_rate")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.rate = min(max(rate, min_rate), max_rate)
+        self.blocked_until = 0.0
+        self.last_decrease = 0.0
+        self._state_lock = threading.Lock()
+
+    def success(self):
+        """Additive increase after a healthy response"""
+        with self._state_lock:
+            self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+
+    def throttled(self, retry_after: Optional[float] = None):
+        """
+        Multiplicative decrease after a 429/503, and a pause for Retry-After
+
+        Requests already in flight when the server started refusing come back
+        throttled together; they count as a single decrease.
+        """
+        now = time.monotonic()
+        with self._state_lock:
+            if now - self.last_decrease >= 1.0 / self.rate:
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self.last_decrease = now
+                self.tokens = min(self.tokens, 0.0)
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, now + min(retry_after, MAX_RETRY_AFTER))
+
+    async def acquire(self) -> float:
+        waited = 0.0
+        async with self._lock:
+            while True:
+                pause = self.blocked_until - time.monotonic()
+                if pause <= 0:
+                    break
+                await asyncio.sleep(pause)
+                waited += pause
+            self._refill()
+            while self.tokens < 1.0:
+                delay = (1.0 - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+                self._refill()
+            self.tokens -= 1.0
+        return waited
+
+
+class AdaptiveHostRateLimiter(HostRateLimiter):
+    """One AdaptiveTokenBucket per host, fed back through record()"""
+
+    def __init__(self, rate: float, capacity: float = 1.0, max_rate: float = 10.0, min_rate: float = 0.05):
+        super().__init__(rate, capacity)
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, rate)
+        self._buckets_lock = threading.Lock()
+
+    def bucket_for(self, url: str) -> AdaptiveTokenBucket:
+        host = urlparse(url).netloc
+        with self._buckets_lock:
+            if host not in self.buckets:
+                self.buckets[host] = AdaptiveTokenBucket(
+                    self.rate, self.capacity, min_rate=self.min_rate, max_rate=self.max_rate)
+            return self.buckets[host]
+
+    def record(self, url: str, status: int, retry_after: Optional[float] = None):
+        """Feed a response status (and its Retry-After, in seconds) back into the host's rate"""
+        bucket = self.bucket_for(url)
+        if status in THROTTLE_STATUSES:
+            bucket.throttled(retry_after)
+        elif status < 500:
+            bucket.success()
+
+    def rates(self) -> Dict[str, float]:
+        """Current requests per second of each host"""
+        return {host: bucket.rate for host, bucket in self.buckets.items()}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)
+
+    Returns:
+        None if the header is missing or unparseable
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0, rng: Optional[random.Random] = None) -> float:
+    """
+    Exponential backoff with full jitter for retry `attempt` (0-based)
+
+    Spreading retries uniformly over [0, base * 2^attempt] keeps clients that
+    failed together from retrying together.
+    """
+    return (rng or random).uniform(0, min(cap, base * 2 ** attempt))
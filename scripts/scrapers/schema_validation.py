@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+FilterFlix Schema Validation
+Compiles timestamps/schema.json into a validator and checks the corpus with it
+
+compile_schema() generates the Python source of one validate() function
+from the schema and compiles it with exec(), once; each keyword becomes an
+inline check, so checking a file is straight-line code over its data with no
+schema interpretation left. It covers the keywords schema.json uses (type,
+required, properties, items, enum, const, pattern, minimum, maximum,
+maxLength, format: date-time); any other validation keyword is rejected at
+compile time rather than silently ignored.
+Annotations (title, description, default, $schema, $id) are skipped.
+
+validate_corpus() spreads the files over a process pool; every worker
+compiles the schema once. The aggregator calls check() before each write,
+so an invalid merge is never published.
+
+Usage:
+    python schema_validation.py ../../timestamps
+    python schema_validation.py ../../timestamps --workers 8 --json
+    python schema_validation.py merged.json other.json --schema ../../timestamps/schema.json
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from catalog_index import find_corpus_root
+from packed_corpus import iter_corpus_files
+
+# timestamps/schema.json in this repository, used outside a corpus
+DEFAULT_SCHEMA = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                              "timestamps", "schema.json")
+
+ANNOTATIONS = {"$schema", "$id", "title", "description", "default", "$comment", "examples"}
+
+TYPE_TESTS = {
+    "object": "isinstance({v}, dict)",
+    "array": "isinstance({v}, list)",
+    "string": "isinstance({v}, str)",
+    "boolean": "isinstance({v}, bool)",
+    "null": "{v} is None",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    "integer": "((isinstance({v}, int) and not isinstance({v}, bool)) or (isinstance({v}, float) and {v}.is_integer()))",
+}
+
+KEYWORDS = {"type", "required", "properties", "items", "enum", "const", "pattern",
+            "minimum", "maximum", "maxLength", "format"}
+
+
+class SchemaValidationError(ValueError):
+    """Raised by check() with every problem found in a document"""
+
+    def __init__(self, errors: List[str], source: Optional[str] = None):
+        self.errors = errors
+        self.source = source
+        where = f"{source}: " if source else ""
+        more = f" (and {len(errors) - 1} more)" if len(errors) > 1 else ""
+        super().__init__(f"{where}{errors[0]}{more}")
+
+    def __reduce__(self):
+        # Keep the error list when raised in a worker process
+        return SchemaValidationError, (self.errors, self.source)
+
+
+def format_path(path: Tuple) -> str:
+    """('timestamps', 3, 'severity') -> 'timestamps[3].severity'"""
+    text = ""
+    for part in path:
+        text += f"[{part}]" if isinstance(part, int) else (f".{part}" if text else part)
+    return text or "(root)"
+
+
+def _is_date_time(value: str) -> bool:
+    try:
+        datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith(("Z", "z")) else value)
+    except ValueError:
+        return False
+    return "T" in value or "t" in value or " " in value
+
+
+FORMATS = {"date-time": _is_date_time}
+
+
+def _show(value) -> str:
+    return json.dumps(value, default=str)[:60]
+
+
+def _same(value, expected) -> bool:
+    """JSON equality: true is not 1"""
+    return value == expected and isinstance(value, bool) == isinstance(expected, bool)
+
+
+class _Compiler:
+    """
+    Generates the source of one validate() function for a schema
+
+    Each keyword becomes an inline test on a local variable, so validating a
+    document runs straight-line code; paths and messages are only built on
+    the error branches.
+    """
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.constants: Dict[str, Any] = {"_show": _show, "_same": _same}
+        self.counter = 0
+
+    def name(self, prefix: str) -> str:
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+    def constant(self, value) -> str:
+        name = self.name("c")
+        self.constants[name] = value
+        return name
+
+    def emit(self, indent: int, line: str):
+        self.lines.append("    " * indent + line)
+
+    def error(self, indent: int, path: List[str], message: str):
+        self.emit(indent, f"errors.append((({''.join(p + ', ' for p in path)}), {message}))")
+
+    def node(self, schema: Dict, var: str, path: List[str], indent: int, location: str):
+        unknown = set(schema) - ANNOTATIONS - KEYWORDS
+        if unknown:
+            raise ValueError(f"{location}: unsupported schema keywords {', '.join(sorted(unknown))}")
+
+        types = schema.get("type")
+        if types is not None:
+            types = types if isinstance(types, list) else [types]
+            test = " or ".join(TYPE_TESTS[t].format(v=var) for t in types)
+            self.emit(indent, f"if not ({test}):")
+            self.error(indent + 1, path, f"_show({var}) + {' is not of type ' + ' or '.join(types)!r}")
+            # The other keywords only run on a value of the right type
+            self.emit(indent, "else:")
+            indent += 1
+            start = len(self.lines)
+        known = set(types or ())
+
+        def guard(kind: str, python_type: str) -> str:
+            return "" if known == {kind} else f"isinstance({var}, {python_type}) and "
+
+        if "enum" in schema:
+            allowed = schema["enum"]
+            if all(isinstance(v, str) for v in allowed):
+                test = f"not (isinstance({var}, str) and {var} in {self.constant(frozenset(allowed))})"
+            else:
+                test = f"not any(_same({var}, v) for v in {self.constant(list(allowed))})"
+            listing = ", ".join(json.dumps(v) for v in allowed)
+            self.emit(indent, f"if {test}:")
+            self.error(indent + 1, path, f"_show({var}) + {' is not one of ' + listing!r}")
+
+        if "const" in schema:
+            const = schema["const"]
+            self.emit(indent, f"if not _same({var}, {self.constant(const)}):")
+            self.error(indent + 1, path, f"_show({var}) + {' should be ' + json.dumps(const)!r}")
+
+        if "pattern" in schema:
+            search = self.constant(re.compile(schema["pattern"]).search)
+            self.emit(indent, f"if {guard('string', 'str')}not {search}({var}):")
+            self.error(indent + 1, path, f"_show({var}) + {' does not match ' + schema['pattern']!r}")
+
+        if "maxLength" in schema:
+            limit = int(schema["maxLength"])
+            self.emit(indent, f"if {guard('string', 'str')}len({var}) > {limit}:")
+            self.error(indent + 1, path, f"f'is longer than {limit} characters ({{len({var})}})'")
+
+        numeric = "" if known & {"integer", "number"} == known and known else \
+            f"isinstance({var}, (int, float)) and not isinstance({var}, bool) and "
+        if "minimum" in schema:
+            low = schema["minimum"]
+            self.emit(indent, f"if {numeric}{var} < {low!r}:")
+            self.error(indent + 1, path, f"f'{{{var}}} is less than the minimum of {low}'")
+        if "maximum" in schema:
+            high = schema["maximum"]
+            self.emit(indent, f"if {numeric}{var} > {high!r}:")
+            self.error(indent + 1, path, f"f'{{{var}}} is greater than the maximum of {high}'")
+
+        if schema.get("format") in FORMATS:
+            is_valid = self.constant(FORMATS[schema["format"]])
+            self.emit(indent, f"if {guard('string', 'str')}not {is_valid}({var}):")
+            self.error(indent + 1, path, f"_show({var}) + {' is not a valid ' + schema['format']!r}")
+
+        if "required" in schema or "properties" in schema:
+            if known != {"object"}:
+                self.emit(indent, f"if isinstance({var}, dict):")
+                indent += 1
+            for required in schema.get("required", []):
+                self.emit(indent, f"if {required!r} not in {var}:")
+                self.error(indent + 1, path, repr(f"missing required property {required!r}"))
+            for name, sub in schema.get("properties", {}).items():
+                child = self.name("v")
+                self.emit(indent, f"{child} = {var}.get({name!r}, _MISSING)")
+                self.emit(indent, f"if {child} is not _MISSING:")
+                mark = len(self.lines)
+                self.node(sub, child, path + [repr(name)], indent + 1, f"{location}.{name}")
+                if len(self.lines) == mark:
+                    # Nothing to check inside: drop the lookup again
+                    del self.lines[-2:]
+            if known != {"object"}:
+                indent -= 1
+
+        if "items" in schema:
+            if known != {"array"}:
+                self.emit(indent, f"if isinstance({var}, list):")
+                indent += 1
+            index, child = self.name("i"), self.name("v")
+            self.emit(indent, f"for {index}, {child} in enumerate({var}):")
+            mark = len(self.lines)
+            self.node(schema["items"], child, path + [index], indent + 1, f"{location}[]")
+            if len(self.lines) == mark:
+                self.emit(indent + 1, "pass")
+
+        if types is not None and len(self.lines) == start:
+            self.lines.pop()  # an "else:" with nothing under it
+
+    def build(self, schema: Dict) -> Callable[[Any], List[Tuple[Tuple, str]]]:
+        self.node(schema, "document", [], 1, "$")
+        self.constants["_MISSING"] = object()
+        # Constants are bound as default arguments, which makes them fast locals
+        signature = ", ".join(["document"] + [f"{name}={name}" for name in self.constants])
+        self.lines[:0] = [f"def validate({signature}):", "    errors = []"]
+        self.emit(1, "return errors")
+        namespace = dict(self.constants)
+        exec(compile("\n".join(self.lines), "<schema>", "exec"), namespace)
+        return namespace["validate"]
+
+
+def compile_schema(schema: Dict) -> Callable[[Any], List[str]]:
+    """
+    Compile a JSON Schema into a validator
+
+    Returns:
+        validate(document) -> list of "path: message" strings (empty if valid)
+    """
+    raw = _Compiler().build(schema)
+
+    def validate(document) -> List[str]:
+        return [f"{format_path(path)}: {message}" for path, message in raw(document)]
+
+    return validate
+
+
+@lru_cache(maxsize=8)
+def load_validator(schema_path: str = DEFAULT_SCHEMA) -> Callable[[Any], List[str]]:
+    """Compiled validator for a schema file (compiled once per process)"""
+    with open(schema_path) as f:
+        return compile_schema(json.load(f))
+
+
+def schema_for(path: str) -> str:
+    """schema.json of the corpus that path belongs to, or the repository's"""
+    root = find_corpus_root(path)
+    if root and os.path.exists(os.path.join(root, "schema.json")):
+        return os.path.join(root, "schema.json")
+    return DEFAULT_SCHEMA
+
+
+def check(data: Dict, path: Optional[str] = None, schema_path: Optional[str] = None):
+    """
+    Validate a document about to be written to path
+
+    Raises:
+        SchemaValidationError: With every error found
+    """
+    if schema_path is None:
+        schema_path = schema_for(path) if path else DEFAULT_SCHEMA
+    errors = load_validator(schema_path)(data)
+    if errors:
+        raise SchemaValidationError(errors, path)
+
+
+def validate_file(path: str, schema_path: str = DEFAULT_SCHEMA) -> List[str]:
+    """Errors of one file on disk (unreadable JSON is reported as an error too)"""
+    try:
+        with open(path, "rb") as f:
+            data = json.loads(f.read())
+    except (OSError, ValueError) as e:
+        return [f"(root): cannot read: {e}"]
+    return load_validator(schema_path)(data)
+
+
+def _validate_chunk(paths: List[str], schema_path: str) -> List[Tuple[str, List[str]]]:
+    return [(path, validate_file(path, schema_path)) for path in paths]
+
+
+def validate_files(paths: Sequence[str], schema_path: str = DEFAULT_SCHEMA,
+                   workers: Optional[int] = None, chunk_size: int = 256) -> Dict[str, List[str]]:
+    """
+    Validate files across a process pool
+
+    Args:
+        paths: Files to check
+        schema_path: Schema to compile (once per worker)
+        workers: Worker processes (default: one per CPU; 0 validates in this process)
+        chunk_size: Files handed to a worker at a time
+
+    Returns:
+        Errors by path, for the files that have any
+    """
+    failures: Dict[str, List[str]] = {}
+    if workers == 0 or len(paths) <= chunk_size:
+        results = _validate_chunk(list(paths), schema_path)
+    else:
+        chunks = [list(paths[i:i + chunk_size]) for i in range(0, len(paths), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            results = [result for chunk in pool.map(_validate_chunk, chunks, [schema_path] * len(chunks))
+                       for result in chunk]
+    for path, errors in results:
+        if errors:
+            failures[path] = errors
+    return failures
+
+
+def validate_corpus(root: str, schema_path: Optional[str] = None,
+                    workers: Optional[int] = None) -> Tuple[int, Dict[str, List[str]]]:
+    """
+    Validate every timestamp file under root
+
+    Returns:
+        (number of files checked, errors by path)
+    """
+    paths = list(iter_corpus_files(root))
+    return len(paths), validate_files(paths, schema_path or schema_for(root), workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate timestamp files against schema.json")
+    parser.add_argument("paths", nargs="+", help="Corpus directories and/or timestamp files")
+    parser.add_argument("--schema", help="Schema file (default: schema.json at the corpus root, else the repo's)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count; 0 for none)")
+    parser.add_argument("--json", action="store_true", help="Print the errors as one JSON object")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    checked = 0
+    failures: Dict[str, List[str]] = {}
+    files = [path for path in args.paths if not os.path.isdir(path)]
+    try:
+        for path in args.paths:
+            if os.path.isdir(path):
+                count, errors = validate_corpus(path, args.schema, args.workers)
+                checked += count
+                failures.update(errors)
+        if files:
+            checked += len(files)
+            failures.update(validate_files(files, args.schema or schema_for(files[0]), args.workers))
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.json:
+        print(json.dumps(failures, indent=2))
+    else:
+        for path, errors in sorted(failures.items()):
+            for error in errors:
+                print(f"{path}: {error}")
+    print(f"Checked {checked} files in {time.perf_counter() - started:.2f}s: "
+          f"{len(failures)} invalid", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
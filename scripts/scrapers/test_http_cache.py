@@ -0,0 +1,71 @@
+"""
+Tests for http_cache.py: revalidations must not leak pooled connections
+
+Usage:
+    python -m pytest scripts/scrapers/test_http_cache.py
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from http_cache import HTTPCache, mount_cache
+
+ETAG = '"v1"'
+BODY = b"<html>guide</html>"
+
+
+class ETagHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), ETagHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/guide"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_revalidations_release_pooled_connections(server, tmp_path):
+    cache = HTTPCache(str(tmp_path), ttl=0)
+    session = requests.Session()
+    # Same pool settings the scraper uses, with room for a single connection
+    mount_cache(session, cache, pool_connections=1, pool_maxsize=1, pool_block=True)
+
+    bodies = []
+
+    def fetch():
+        for _ in range(5):
+            bodies.append(session.get(server, timeout=5).content)
+
+    # A leaked connection blocks the next request forever, past any timeout
+    worker = threading.Thread(target=fetch, daemon=True)
+    worker.start()
+    worker.join(30)
+    session.close()
+    cache.close()
+
+    assert not worker.is_alive(), "request blocked waiting for a pooled connection"
+    assert bodies == [BODY] * 5
+    assert cache.stats["misses"] == 1
+    assert cache.stats["revalidated"] == 4
@@ -0,0 +1,46 @@
+"""
+Tests for near_duplicates.py: distinct scenes that read alike must survive
+
+Usage:
+    python -m pytest scripts/scrapers/test_near_duplicates.py
+"""
+
+import pytest
+
+from guide_parser import ParentsGuideExtractor
+from near_duplicates import distinct_texts, numbers
+
+DISTINCT_PAIRS = [
+    ("A man is shot in the head about 45 minutes in.", "A man is shot in the head about 90 minutes in."),
+    ("He says the f-word once.", "He says the s-word once."),
+    ("A character smokes a cigarette.", "A character smokes a cigar."),
+    ("The f-word is used 12 times.", "The f-word is used 21 times."),
+    ("A woman is stabbed twice.", "A woman is stabbed once."),
+]
+
+
+@pytest.mark.parametrize("first, second", DISTINCT_PAIRS)
+def test_distinct_scenes_are_kept(first, second):
+    assert distinct_texts([first, second]) == [first, second]
+
+
+@pytest.mark.parametrize("first, second", [pair for pair in DISTINCT_PAIRS if numbers(pair[0]) != numbers(pair[1])])
+def test_differing_counts_never_collapse(first, second):
+    assert distinct_texts([first, second], threshold=0.5) == [first, second]
+
+
+def test_trivial_variants_collapse():
+    texts = ["A man is shot in the head.", "a man is shot in the head", "A man is  shot in the head!"]
+    assert distinct_texts(texts) == texts[:1]
+
+
+def test_numbers_include_digits_and_count_words():
+    assert numbers("Shot twice, about 45 minutes in") == ("twice", "45")
+
+
+def test_extractor_keeps_near_duplicates_by_default():
+    extractor = ParentsGuideExtractor({"violence": ["advisory-violence"]})
+    items = "".join(f"<li>{first}</li><li>{second}</li>" for first, second in DISTINCT_PAIRS)
+    page = f'<html><body><section id="advisory-violence"><ul>{items}</ul></section></body></html>'
+    warnings = extractor.extract("tt0000000", page)["warnings"]["violence"]
+    assert warnings == [text for pair in DISTINCT_PAIRS for text in pair]
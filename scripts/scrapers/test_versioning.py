@@ -0,0 +1,33 @@
+"""
+Tests for versioning.py: patches must carry JSON type changes at any depth
+
+Usage:
+    python -m pytest scripts/scrapers/test_versioning.py
+"""
+
+import copy
+
+import pytest
+
+from versioning import apply_patch, json_diff
+
+BOOL_TO_INT = [
+    (True, 1),
+    ({"verified": True}, {"verified": 1}),
+    ([{"verified": False}], [{"verified": 0}]),
+    ({"timestamps": [{"flags": [True, 1]}]}, {"timestamps": [{"flags": [1, True]}]}),
+]
+
+
+@pytest.mark.parametrize("old, new", BOOL_TO_INT + [(new, old) for old, new in BOOL_TO_INT])
+def test_bool_and_number_are_different_values(old, new):
+    patch = json_diff(old, new)
+    assert patch
+    patched = apply_patch(copy.deepcopy(old), patch)
+    assert patched == new
+    assert repr(patched) == repr(new)
+
+
+def test_equal_documents_give_an_empty_patch():
+    document = {"timestamps": [{"verified": True, "severity": 3}], "version": 2}
+    assert json_diff(document, copy.deepcopy(document)) == []
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+FilterFlix Timestamp Store
+SQLite copy of the corpus with indexed segment queries
+
+The JSON files stay the source of truth for the extension and the server;
+this store holds the same titles in one database so questions such as "every
+violence segment of severity 8+ on netflix titles" are answered from
+indexes instead of by parsing every file:
+
+    titles     imdb_id (primary key), title, year, runtime, version,
+               content_hash and the title document without its timestamps
+    segments   one row per timestamp: start/end seconds, type, severity,
+               verified, confidence plus the segment as written
+    platforms  (platform, imdb_id) pairs
+
+Segments are indexed by (type, severity, start), (severity, start) and
+start; platforms by platform. Each segment and title document is stored
+verbatim, so `export` writes back files identical to what was imported or
+aggregated. The database runs in WAL mode: readers (the query CLI, an API)
+never block the aggregator's writes.
+
+The aggregator writes every title it validates into the store with --db.
+An existing corpus is loaded with `import`.
+
+Usage:
+    python timestamp_store.py import filterflix.db ../../timestamps
+    python timestamp_store.py query filterflix.db --type violence --min-severity 8 --platform netflix
+    python timestamp_store.py export filterflix.db ./exported/
+    python timestamp_store.py stats filterflix.db
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from corpus_io import timestamp_content_hash, write_timestamp_file
+from packed_corpus import iter_corpus, parse_time
+
+STORE_VERSION = 1
+CACHE_KIB = 64 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS titles (
+    imdb_id TEXT PRIMARY KEY,
+    title TEXT,
+    year INTEGER,
+    runtime_minutes INTEGER,
+    version INTEGER,
+    content_hash TEXT NOT NULL,
+    document TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS segments (
+    imdb_id TEXT NOT NULL REFERENCES titles(imdb_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    start_seconds INTEGER NOT NULL,
+    end_seconds INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    severity INTEGER NOT NULL,
+    verified INTEGER NOT NULL DEFAULT 0,
+    confidence REAL,
+    document TEXT NOT NULL,
+    PRIMARY KEY (imdb_id, position)
+);
+CREATE INDEX IF NOT EXISTS segments_type ON segments (type, severity, start_seconds);
+CREATE INDEX IF NOT EXISTS segments_severity ON segments (severity, start_seconds);
+CREATE INDEX IF NOT EXISTS segments_start ON segments (start_seconds);
+CREATE TABLE IF NOT EXISTS platforms (
+    platform TEXT NOT NULL,
+    imdb_id TEXT NOT NULL REFERENCES titles(imdb_id) ON DELETE CASCADE,
+    PRIMARY KEY (platform, imdb_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS platforms_title ON platforms (imdb_id);
+"""
+
+
+_compact = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+# A day has only 86,400 distinct times
+_seconds = lru_cache(maxsize=1 << 17)(parse_time)
+
+
+class TimestampStore:
+    """SQLite database of titles and their segments"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        # Bulk upserts touch three segment indexes in random order
+        self.db.execute(f"PRAGMA cache_size=-{CACHE_KIB}")
+        self.db.execute("PRAGMA foreign_keys=ON")
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, STORE_VERSION):
+            raise ValueError(f"{path}: store version {version}, expected {STORE_VERSION}")
+        with self.db:
+            self.db.executescript(SCHEMA)
+            self.db.execute(f"PRAGMA user_version={STORE_VERSION}")
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def upsert_many(self, documents: Iterable[Dict]) -> int:
+        """
+        Insert or replace titles (merge_timestamps output or corpus files)
+
+        All documents go in one transaction; of repeated IDs the last wins.
+        Titles whose content hash is already stored are left alone.
+
+        Returns:
+            Number of titles inserted or replaced
+        """
+        documents = list({data["imdb_id"]: data for data in documents}.values())
+        stored = {}
+        ids = [data["imdb_id"] for data in documents]
+        for offset in range(0, len(ids), 500):
+            chunk = ids[offset:offset + 500]
+            rows = self.db.execute(
+                f"SELECT imdb_id, content_hash FROM titles WHERE imdb_id IN ({','.join('?' * len(chunk))})", chunk)
+            stored.update((row["imdb_id"], row["content_hash"]) for row in rows)
+
+        titles, segments, platforms, replaced = [], [], [], []
+        for data in documents:
+            content_hash = timestamp_content_hash(data)
+            imdb_id = data["imdb_id"]
+            if stored.get(imdb_id) == content_hash:
+                continue
+            if imdb_id in stored:
+                replaced.append((imdb_id,))
+            # The title document keeps its key order; timestamps are refilled
+            # from the segments on export
+            titles.append((imdb_id, data.get("title"), data.get("year"), data.get("runtime_minutes"),
+                           data.get("metadata", {}).get("version"), content_hash,
+                           _compact(dict(data, timestamps=[]))))
+            segments.extend(
+                (imdb_id, position, _seconds(ts["start"]), _seconds(ts["end"]), ts["type"],
+                 ts.get("severity", 5), bool(ts.get("verified")), ts.get("confidence"), _compact(ts))
+                for position, ts in enumerate(data.get("timestamps", [])))
+            platforms.extend((platform, imdb_id) for platform in data.get("platforms", []))
+
+        with self.db:
+            # Segments and platforms of replaced titles go with them (cascade)
+            self.db.executemany("DELETE FROM titles WHERE imdb_id = ?", replaced)
+            self.db.executemany("INSERT INTO titles VALUES (?, ?, ?, ?, ?, ?, ?)", titles)
+            self.db.executemany("INSERT INTO segments VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", segments)
+            self.db.executemany("INSERT OR IGNORE INTO platforms VALUES (?, ?)", platforms)
+        return len(titles)
+
+    def upsert(self, data: Dict) -> bool:
+        return self.upsert_many([data]) == 1
+
+    def delete(self, imdb_id: str) -> bool:
+        with self.db:
+            return self.db.execute("DELETE FROM titles WHERE imdb_id = ?", (imdb_id,)).rowcount == 1
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def get(self, imdb_id: str) -> Optional[Dict]:
+        """The title as a schema-compliant timestamp dict, or None"""
+        row = self.db.execute("SELECT document FROM titles WHERE imdb_id = ?", (imdb_id,)).fetchone()
+        if row is None:
+            return None
+        data = json.loads(row["document"])
+        data["timestamps"] = [json.loads(segment["document"]) for segment in self.db.execute(
+            "SELECT document FROM segments WHERE imdb_id = ? ORDER BY position", (imdb_id,))]
+        return data
+
+    def imdb_ids(self) -> List[str]:
+        return [row[0] for row in self.db.execute("SELECT imdb_id FROM titles ORDER BY imdb_id")]
+
+    @staticmethod
+    def _query_sql(
+        types: Sequence[str] = (),
+        min_severity: Optional[int] = None,
+        max_severity: Optional[int] = None,
+        platforms: Sequence[str] = (),
+        imdb_ids: Sequence[str] = (),
+        start_from: Optional[int] = None,
+        start_to: Optional[int] = None,
+        verified: Optional[bool] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[str, List]:
+        where, params = [], []
+        if types:
+            where.append(f"s.type IN ({','.join('?' * len(types))})")
+            params.extend(types)
+        if min_severity is not None:
+            where.append("s.severity >= ?")
+            params.append(min_severity)
+        if max_severity is not None:
+            where.append("s.severity <= ?")
+            params.append(max_severity)
+        if platforms:
+            where.append(f"s.imdb_id IN (SELECT imdb_id FROM platforms WHERE platform IN "
+                         f"({','.join('?' * len(platforms))}))")
+            params.extend(platforms)
+        if imdb_ids:
+            where.append(f"s.imdb_id IN ({','.join('?' * len(imdb_ids))})")
+            params.extend(imdb_ids)
+        if start_from is not None:
+            where.append("s.start_seconds >= ?")
+            params.append(start_from)
+        if start_to is not None:
+            where.append("s.start_seconds <= ?")
+            params.append(start_to)
+        if verified is not None:
+            where.append("s.verified = ?")
+            params.append(int(verified))
+        sql = ("SELECT s.imdb_id, t.title, s.document FROM segments s JOIN titles t USING (imdb_id)"
+               + (" WHERE " + " AND ".join(where) if where else "")
+               + " ORDER BY s.imdb_id, s.start_seconds, s.position")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return sql, params
+
+    def query(self, **filters) -> Iterator[Dict]:
+        """
+        Segments matching every given filter, by title then start
+
+        Args:
+            types: Segment types to include (any of)
+            min_severity: Lowest severity to include
+            max_severity: Highest severity to include
+            platforms: Only titles on any of these platforms
+            imdb_ids: Only these titles
+            start_from: Segments starting at or after this second
+            start_to: Segments starting at or before this second
+            verified: Only verified (True) or unverified (False) segments
+            limit: Stop after this many segments
+
+        Yields:
+            The segment dict plus imdb_id and title
+        """
+        sql, params = self._query_sql(**filters)
+        for row in self.db.execute(sql, params):
+            yield dict(json.loads(row["document"]), imdb_id=row["imdb_id"], title=row["title"])
+
+    def explain(self, **filters) -> List[str]:
+        """SQLite's plan for query(**filters), to check which indexes it uses"""
+        sql, params = self._query_sql(**filters)
+        return [row[-1] for row in self.db.execute("EXPLAIN QUERY PLAN " + sql, params)]
+
+    def stats(self) -> Dict:
+        counts = {table: self.db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                  for table in ("titles", "segments", "platforms")}
+        counts["by_type"] = dict(self.db.execute(
+            "SELECT type, COUNT(*) FROM segments GROUP BY type ORDER BY type").fetchall())
+        counts["bytes"] = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return counts
+
+    # ------------------------------------------------------------------
+    # Corpus import / export
+    # ------------------------------------------------------------------
+
+    def import_corpus(self, root: str, batch_size: int = 1000) -> int:
+        """Upsert every timestamp file under root; returns titles changed"""
+        changed = 0
+        batch = []
+        for _, data in iter_corpus(root):
+            batch.append(data)
+            if len(batch) >= batch_size:
+                changed += self.upsert_many(batch)
+                batch = []
+        return changed + self.upsert_many(batch)
+
+    def export(self, output_dir: str, imdb_ids: Sequence[str] = ()) -> Dict[str, int]:
+        """
+        Write <imdb_id>.json files (unchanged files are left alone)
+
+        Returns:
+            Counts of files written and unchanged
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        counts = {"written": 0, "unchanged": 0}
+        for imdb_id in imdb_ids or self.imdb_ids():
+            data = self.get(imdb_id)
+            if data is None:
+                continue
+            written = write_timestamp_file(os.path.join(output_dir, f"{imdb_id}.json"), data)
+            counts["written" if written else "unchanged"] += 1
+        return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite store of the timestamp corpus")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    load = sub.add_parser("import", help="Load (or refresh) every timestamp file under a corpus directory")
+    load.add_argument("db")
+    load.add_argument("corpus")
+
+    query = sub.add_parser("query", help="Find segments using the indexes")
+    query.add_argument("db")
+    query.add_argument("--type", action="append", default=[], help="Segment type (repeatable)")
+    query.add_argument("--min-severity", type=int)
+    query.add_argument("--max-severity", type=int)
+    query.add_argument("--platform", action="append", default=[], help="Platform (repeatable)")
+    query.add_argument("--imdb", action="append", default=[], help="IMDb ID (repeatable)")
+    query.add_argument("--from", dest="start_from", help="Segments starting at or after HH:MM:SS")
+    query.add_argument("--to", dest="start_to", help="Segments starting at or before HH:MM:SS")
+    query.add_argument("--verified", action="store_true", default=None, help="Only verified segments")
+    query.add_argument("--limit", type=int)
+    query.add_argument("--format", choices=("table", "ndjson"), default="table")
+    query.add_argument("--explain", action="store_true", help="Print the query plan instead of results")
+
+    export = sub.add_parser("export", help="Write titles back out as timestamp files")
+    export.add_argument("db")
+    export.add_argument("output_dir")
+    export.add_argument("--imdb", action="append", default=[], help="IMDb ID (repeatable; default: all)")
+
+    stats = sub.add_parser("stats", help="Row counts")
+    stats.add_argument("db")
+
+    args = parser.parse_args()
+    if args.command != "import" and not os.path.exists(args.db):
+        print(f"Error: {args.db} not found", file=sys.stderr)
+        sys.exit(1)
+
+    with TimestampStore(args.db) as store:
+        if args.command == "import":
+            started = time.time()
+            changed = store.import_corpus(args.corpus)
+            print(f"Imported {changed} changed titles into {args.db} in {time.time() - started:.1f}s")
+        elif args.command == "query":
+            filters = {
+                "types": args.type, "min_severity": args.min_severity, "max_severity": args.max_severity,
+                "platforms": args.platform, "imdb_ids": args.imdb, "verified": args.verified, "limit": args.limit,
+                "start_from": parse_time(args.start_from) if args.start_from else None,
+                "start_to": parse_time(args.start_to) if args.start_to else None,
+            }
+            if args.explain:
+                print("\n".join(store.explain(**filters)))
+                return
+            count = 0
+            for segment in store.query(**filters):
+                count += 1
+                if args.format == "ndjson":
+                    print(_compact(segment))
+                else:
+                    print(f"{segment['imdb_id']:<11} {segment['start']}-{segment['end']} "
+                          f"{segment['type']:<12} {segment.get('severity', '-'):>2}  "
+                          f"{(segment.get('title') or '')[:30]:<30} {segment.get('description', '')[:60]}")
+            if args.format == "table":
+                print(f"{count} segments", file=sys.stderr)
+        elif args.command == "export":
+            counts = store.export(args.output_dir, args.imdb)
+            print(f"Exported to {args.output_dir}: {counts['written']} written, {counts['unchanged']} unchanged")
+        else:
+            print(json.dumps(store.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+FilterFlix Title Versioning
+Keeps prior versions of each timestamp file and JSON Patch deltas between them
+
+Every time the aggregator changes a title it bumps metadata.version and
+records the change next to the file:
+
+    movies/tt1375666.json                     the current version
+    movies/.versions/tt1375666/manifest.json  one entry per version
+    movies/.versions/tt1375666/4.json         full copy of version 4
+    movies/.versions/tt1375666/5.patch.json   RFC 6902 JSON Patch 4 -> 5
+
+A client holding version 4 fetches the patches since 4 and applies them
+instead of downloading the whole title again. Only the newest KEEP_SNAPSHOTS
+full copies and KEEP_PATCHES patches are kept; a client older than the
+oldest patch refetches the full title. The .versions directory is a dot
+directory, so corpus scans (packing, validation, the index) skip it.
+
+Usage:
+    python versioning.py log ../../timestamps/movies/tt1375666.json
+    python versioning.py diff ../../timestamps/movies/tt1375666.json 3 5
+    python versioning.py since ../../timestamps/movies/tt1375666.json 3
+"""
+
+import argparse
+import copy
+import json
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+from corpus_io import canonical_json, timestamp_content_hash, write_json_atomic
+
+VERSIONS_DIR = ".versions"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+KEEP_SNAPSHOTS = 5
+KEEP_PATCHES = 100
+
+
+# ----------------------------------------------------------------------
+# JSON Patch (RFC 6902): add / remove / replace
+# ----------------------------------------------------------------------
+
+def _escape(key) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _same(a, b) -> bool:
+    """JSON equality at every depth: true is not 1, even inside objects and arrays"""
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    if isinstance(a, dict):
+        return (isinstance(b, dict) and len(a) == len(b)
+                and all(key in b and _same(value, b[key]) for key, value in a.items()))
+    if isinstance(a, list):
+        return isinstance(b, list) and len(a) == len(b) and all(map(_same, a, b))
+    return a == b
+
+
+def _size(value) -> int:
+    return len(json.dumps(value, separators=(",", ":")))
+
+
+def json_diff(old: Any, new: Any, path: str = "") -> List[Dict]:
+    """
+    JSON Patch turning old into new
+
+    Objects are diffed key by key. Arrays keep their common prefix and
+    suffix, diff the overlapping middle element by element and add or remove
+    the rest, so editing, inserting or dropping one segment yields a patch of
+    about that segment's size. Wherever the ops for an object or array come
+    out larger than the value itself (short derived arrays such as the
+    playback tables), one replace of the whole value is used instead.
+    """
+    ops = _diff(old, new, path)
+    if len(ops) > 1 and isinstance(new, (dict, list)) and _size(ops) > _size(new) + len(path) + 32:
+        return [{"op": "replace", "path": path, "value": new}]
+    return ops
+
+
+def _diff(old: Any, new: Any, path: str) -> List[Dict]:
+    if _same(old, new):
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(json_diff(old[key], value, child))
+        return ops
+    if isinstance(old, list) and isinstance(new, list):
+        prefix = 0
+        limit = min(len(old), len(new))
+        while prefix < limit and _same(old[prefix], new[prefix]):
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and _same(old[-1 - suffix], new[-1 - suffix]):
+            suffix += 1
+        old_middle = old[prefix:len(old) - suffix]
+        new_middle = new[prefix:len(new) - suffix]
+        ops = []
+        shared = min(len(old_middle), len(new_middle))
+        for offset in range(shared):
+            ops.extend(json_diff(old_middle[offset], new_middle[offset], f"{path}/{prefix + offset}"))
+        # Remove from the back so earlier indices stay valid
+        for offset in range(len(old_middle) - 1, shared - 1, -1):
+            ops.append({"op": "remove", "path": f"{path}/{prefix + offset}"})
+        for offset in range(shared, len(new_middle)):
+            ops.append({"op": "add", "path": f"{path}/{prefix + offset}", "value": new_middle[offset]})
+        return ops
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_patch(document: Any, ops: List[Dict]) -> Any:
+    """
+    Apply a JSON Patch (add, remove, replace) to a copy of document
+
+    Raises:
+        ValueError: An op is unsupported or its path does not exist
+    """
+    document = copy.deepcopy(document)
+    for op in ops:
+        kind, path = op.get("op"), op.get("path", "")
+        if path == "":
+            if kind not in ("add", "replace"):
+                raise ValueError(f"cannot {kind} the whole document")
+            document = copy.deepcopy(op["value"])
+            continue
+        tokens = [_unescape(token) for token in path.split("/")[1:]]
+        parent = document
+        try:
+            for token in tokens[:-1]:
+                parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+            last = tokens[-1]
+            if isinstance(parent, list):
+                index = len(parent) if last == "-" else int(last)
+                if kind == "add":
+                    if not 0 <= index <= len(parent):
+                        raise IndexError(index)
+                    parent.insert(index, copy.deepcopy(op["value"]))
+                elif kind == "remove":
+                    del parent[index]
+                elif kind == "replace":
+                    parent[index] = copy.deepcopy(op["value"])
+                else:
+                    raise ValueError(f"unsupported op {kind!r}")
+            else:
+                if kind == "add":
+                    parent[last] = copy.deepcopy(op["value"])
+                elif kind == "remove":
+                    del parent[last]
+                elif kind == "replace":
+                    if last not in parent:
+                        raise KeyError(last)
+                    parent[last] = copy.deepcopy(op["value"])
+                else:
+                    raise ValueError(f"unsupported op {kind!r}")
+        except (KeyError, IndexError, TypeError) as e:
+            raise ValueError(f"{kind} {path}: no such location ({e})") from None
+    return document
+
+
+# ----------------------------------------------------------------------
+# Per-title version store
+# ----------------------------------------------------------------------
+
+def document_version(data: Optional[Dict]) -> int:
+    if not isinstance(data, dict):
+        return 0
+    version = data.get("metadata", {}).get("version")
+    return version if isinstance(version, int) and not isinstance(version, bool) else 0
+
+
+def _content_key(data: Dict) -> str:
+    """Content hash ignoring last_updated and the version number itself"""
+    metadata = data.get("metadata")
+    if isinstance(metadata, dict) and "version" in metadata:
+        data = dict(data, metadata={k: v for k, v in metadata.items() if k != "version"})
+    return timestamp_content_hash(data)
+
+
+class VersionStore:
+    """Prior versions and patches of one timestamp file"""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        stem = os.path.splitext(os.path.basename(file_path))[0]
+        self.directory = os.path.join(os.path.dirname(os.path.abspath(file_path)), VERSIONS_DIR, stem)
+        self.manifest_path = os.path.join(self.directory, MANIFEST_NAME)
+        self.manifest: Dict = {"version": MANIFEST_VERSION, "current": 0, "versions": []}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                self.manifest = json.load(f)
+
+    @property
+    def current(self) -> int:
+        return self.manifest.get("current", 0)
+
+    def read_current(self) -> Optional[Dict]:
+        try:
+            with open(self.file_path) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    def prepare(self, data: Dict) -> Optional[Dict]:
+        """
+        Give data the version number it will be written as
+
+        Unchanged content keeps the current version (so the write is skipped);
+        anything else gets the next one.
+
+        Returns:
+            The version currently on disk, for record(), or None
+        """
+        previous = self.read_current()
+        current = max(document_version(previous), self.current)
+        if document_version(previous) and _content_key(previous) == _content_key(data):
+            version = document_version(previous)
+        else:
+            version = current + 1
+        data.setdefault("metadata", {})["version"] = version
+        return previous
+
+    def record(self, previous: Optional[Dict], data: Dict):
+        """Store the version that was replaced and the patch to the new one (after the write)"""
+        os.makedirs(self.directory, exist_ok=True)
+        version = document_version(data)
+        entry = {
+            "version": version,
+            "content_hash": timestamp_content_hash(data),
+            "last_updated": data.get("metadata", {}).get("last_updated"),
+            "bytes": len(canonical_json(data)),
+            "patch_bytes": None,
+        }
+        previous_version = document_version(previous)
+        if previous is not None and 0 < previous_version < version:
+            write_json_atomic(self._snapshot_path(previous_version), previous)
+            ops = json_diff(previous, data)
+            patch = {"from": previous_version, "to": version, "ops": ops}
+            write_json_atomic(self._patch_path(version), patch)
+            entry["patch_bytes"] = len(canonical_json(patch))
+
+        versions = [v for v in self.manifest.get("versions", []) if v["version"] < version]
+        versions.append(entry)
+        self.manifest = {"version": MANIFEST_VERSION, "current": version, "versions": versions}
+        self._prune()
+        write_json_atomic(self.manifest_path, self.manifest)
+
+    def _snapshot_path(self, version: int) -> str:
+        return os.path.join(self.directory, f"{version}.json")
+
+    def _patch_path(self, version: int) -> str:
+        return os.path.join(self.directory, f"{version}.patch.json")
+
+    def _prune(self):
+        versions = self.manifest["versions"]
+        for entry in versions[:-KEEP_SNAPSHOTS - 1]:
+            if os.path.exists(self._snapshot_path(entry["version"])):
+                os.unlink(self._snapshot_path(entry["version"]))
+        for entry in versions[:-KEEP_PATCHES]:
+            if entry.get("patch_bytes") is not None:
+                if os.path.exists(self._patch_path(entry["version"])):
+                    os.unlink(self._patch_path(entry["version"]))
+                entry["patch_bytes"] = None
+
+    def patches_since(self, version: int) -> Optional[List[Dict]]:
+        """
+        Patches taking a client from `version` to the current one, in order
+
+        Returns:
+            [] when the client is current, None when a needed patch is gone
+            (or the version is unknown) and the full title must be fetched
+        """
+        if version == self.current:
+            return []
+        if not 0 < version < self.current:
+            return None
+        patches = []
+        for step in range(version + 1, self.current + 1):
+            try:
+                with open(self._patch_path(step)) as f:
+                    patches.append(json.load(f))
+            except (OSError, json.JSONDecodeError):
+                return None
+        return patches
+
+    def snapshot(self, version: int) -> Optional[Dict]:
+        """Full copy of a version, if still kept (the current one is the file itself)"""
+        if version == self.current:
+            return self.read_current()
+        try:
+            with open(self._snapshot_path(version)) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the versions of a timestamp file")
+    sub = parser.add_subparsers(dest="command", required=True)
+    log = sub.add_parser("log", help="List the recorded versions")
+    log.add_argument("file")
+    diff = sub.add_parser("diff", help="JSON Patch between two kept versions")
+    diff.add_argument("file")
+    diff.add_argument("old", type=int)
+    diff.add_argument("new", type=int, nargs="?", help="default: the current version")
+    since = sub.add_parser("since", help="The patches a client at VERSION needs")
+    since.add_argument("file")
+    since.add_argument("version", type=int)
+    args = parser.parse_args()
+
+    store = VersionStore(args.file)
+    if args.command == "log":
+        for entry in store.manifest.get("versions", []):
+            patch = f"patch {entry['patch_bytes']:,} B" if entry.get("patch_bytes") is not None else "no patch"
+            print(f"v{entry['version']:<5} {entry.get('last_updated') or '-':<28} "
+                  f"{entry['bytes']:>9,} B  {patch}")
+    elif args.command == "diff":
+        old, new = store.snapshot(args.old), store.snapshot(args.new or store.current)
+        if old is None or new is None:
+            print("Error: version not kept", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(json_diff(old, new), indent=2))
+    else:
+        patches = store.patches_since(args.version)
+        if patches is None:
+            print(f"Error: no patch chain from version {args.version}; fetch the full file", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(patches, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+FilterFlix Timestamp Server
+Small asyncio HTTP/1.1 service that serves the timestamp corpus by IMDb ID
+
+Endpoints:
+    GET /timestamps/{imdb_id}             one title (".json" suffix optional)
+    GET /timestamps/{imdb_id}/patches?since=N
+                                          JSON Patches from version N to the
+                                          current one; 410 when they are no
+                                          longer kept (fetch the full title)
+    GET /timestamps?ids=tt1,tt2,...       many titles in one response
+    POST /timestamps/bulk {"ids": [...]}  same, for long ID lists
+    GET /healthz                          liveness plus cache counters
+
+Titles are located through timestamps/index.json (see catalog_index.py), so
+no request touches the directory tree. Each title is parsed once, stored in
+an in-memory LRU as compact JSON plus a precompressed gzip copy, and served
+with a strong ETag; If-None-Match answers 304 without a body. The index is
+re-read when its mtime changes, and entries whose content hash moved are
+dropped from the cache.
+
+Files edited by hand (outside the scraper/aggregator) need
+`catalog_index.py build` before the server notices them.
+
+Usage:
+    python timestamp-server.py
+    python timestamp-server.py --corpus ../timestamps --port 8787 --cache-size 50000
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scrapers"))
+
+from catalog_index import INDEX_NAME, CatalogIndex  # noqa: E402
+from versioning import VersionStore  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "timestamps")
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+MAX_BULK_IDS = 500
+KEEPALIVE_TIMEOUT = 15.0
+
+REASONS = {
+    200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 410: "Gone", 413: "Payload Too Large", 500: "Internal Server Error",
+}
+
+
+class CachedBody:
+    """One response body in both encodings, with an ETag for each"""
+
+    __slots__ = ("body", "gzip_body", "etag", "gzip_etag", "content_hash")
+
+    def __init__(self, body: bytes, content_hash: Optional[str] = None):
+        self.body = body
+        self.gzip_body = gzip.compress(body, compresslevel=6, mtime=0)
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        # Strong validators differ per representation
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gz"'
+        self.content_hash = content_hash
+
+    def matches(self, if_none_match: str) -> bool:
+        if if_none_match.strip() == "*":
+            return True
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return self.etag in tags or self.gzip_etag in tags
+
+
+class LRUCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[object, CachedBody]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key) -> Optional[CachedBody]:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry: CachedBody):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+class TitleCache:
+    """Index-backed title lookups with an LRU of encoded bodies"""
+
+    def __init__(self, corpus_dir: str, cache_size: int = 10000, reload_interval: float = 2.0):
+        self.index_path = os.path.join(corpus_dir, INDEX_NAME)
+        if not os.path.exists(self.index_path):
+            raise FileNotFoundError(f"{self.index_path} not found; run catalog_index.py build {corpus_dir}")
+        self.reload_interval = reload_interval
+        self.cache = LRUCache(cache_size)
+        self.bulk_cache = LRUCache(max(64, cache_size // 100))
+        self.patch_cache = LRUCache(max(64, cache_size // 10))
+        self._loading: Dict[str, asyncio.Future] = {}
+        self._index_mtime = None
+        self._next_check = 0.0
+        self._load_index()
+
+    def _load_index(self):
+        self._index_mtime = os.stat(self.index_path).st_mtime_ns
+        self.index = CatalogIndex(self.index_path)
+
+    def maybe_reload(self):
+        """Pick up a rewritten index.json (checked at most every reload_interval)"""
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.reload_interval
+        try:
+            mtime = os.stat(self.index_path).st_mtime_ns
+        except OSError:
+            return
+        if mtime != self._index_mtime:
+            self._load_index()
+
+    @staticmethod
+    def _read(path: str) -> bytes:
+        with open(path) as f:
+            data = json.load(f)
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    async def get(self, imdb_id: str) -> Optional[CachedBody]:
+        entry = self.index.lookup(imdb_id)
+        if entry is None:
+            return None
+        cached = self.cache.get(imdb_id)
+        if cached is not None and cached.content_hash == entry.get("content_hash"):
+            return cached
+
+        # Concurrent misses for the same title share one read
+        pending = self._loading.get(imdb_id)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        future = asyncio.get_running_loop().create_future()
+        self._loading[imdb_id] = future
+        try:
+            body = await asyncio.get_running_loop().run_in_executor(
+                None, self._read, self.index.resolve(imdb_id))
+            cached = CachedBody(body, entry.get("content_hash"))
+            self.cache.put(imdb_id, cached)
+            future.set_result(cached)
+            return cached
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else waits
+            raise
+        finally:
+            del self._loading[imdb_id]
+
+    async def get_many(self, imdb_ids: List[str]) -> CachedBody:
+        """{"titles": {id: data}, "missing": [ids]} for a list of IDs"""
+        imdb_ids = list(dict.fromkeys(imdb_ids))
+        found = await asyncio.gather(*(self.get(imdb_id) for imdb_id in imdb_ids))
+        key = tuple((imdb_id, entry.etag if entry else None) for imdb_id, entry in zip(imdb_ids, found))
+        cached = self.bulk_cache.get(key)
+        if cached is not None:
+            return cached
+
+        titles = [b'"%s":%s' % (imdb_id.encode(), entry.body) for imdb_id, entry in zip(imdb_ids, found) if entry]
+        missing = [imdb_id for imdb_id, entry in zip(imdb_ids, found) if entry is None]
+        body = b'{"titles":{' + b",".join(titles) + b'},"missing":' + json.dumps(missing).encode() + b"}"
+        cached = CachedBody(body)
+        self.bulk_cache.put(key, cached)
+        return cached
+
+    @staticmethod
+    def _read_patches(path: str, imdb_id: str, since: int) -> Optional[bytes]:
+        versions = VersionStore(path)
+        patches = versions.patches_since(since)
+        if patches is None:
+            return None
+        body = {"imdb_id": imdb_id, "from": since, "to": versions.current, "patches": patches}
+        return json.dumps(body, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    async def get_patches(self, imdb_id: str, since: int) -> Tuple[Optional[Dict], Optional[CachedBody]]:
+        """
+        The patches taking a client from version `since` to the current one
+
+        Returns:
+            (index entry, body); the entry is None for an unknown title and the
+            body None when the patch chain is no longer available
+        """
+        entry = self.index.lookup(imdb_id)
+        if entry is None:
+            return None, None
+        key = (imdb_id, since, entry.get("content_hash"))
+        cached = self.patch_cache.get(key)
+        if cached is None:
+            body = await asyncio.get_running_loop().run_in_executor(
+                None, self._read_patches, self.index.resolve(imdb_id), imdb_id, since)
+            if body is None:
+                return entry, None
+            cached = CachedBody(body, entry.get("content_hash"))
+            self.patch_cache.put(key, cached)
+        return entry, cached
+
+    def stats(self) -> Dict:
+        return {
+            "titles": len(self.index),
+            "cached": len(self.cache.entries),
+            "hits": self.cache.hits,
+            "misses": self.cache.misses,
+            "bulk_cached": len(self.bulk_cache.entries),
+            "patches_cached": len(self.patch_cache.entries),
+        }
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            q = params.strip()
+            return q not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+class TimestampServer:
+    def __init__(self, store: TitleCache, max_age: int = 300):
+        self.store = store
+        self.cache_control = f"public, max-age={max_age}"
+        self.requests = 0
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(self._response(400, b"header too large", close=True))
+                    break
+
+                try:
+                    method, target, version, headers = self._parse_head(head)
+                except ValueError:
+                    writer.write(self._response(400, b"malformed request", close=True))
+                    break
+
+                try:
+                    length = int(headers.get("content-length", "0") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    writer.write(self._response(400, b"invalid content-length", close=True))
+                    break
+                if length > MAX_BODY_BYTES:
+                    writer.write(self._response(413, b"body too large", close=True))
+                    break
+                try:
+                    body = await reader.readexactly(length) if length else b""
+                except asyncio.IncompleteReadError:
+                    # Client went away mid-body; there is no one to answer
+                    break
+
+                keep_alive = (version == "HTTP/1.1" and headers.get("connection", "").lower() != "close") or \
+                    headers.get("connection", "").lower() == "keep-alive"
+                self.requests += 1
+                try:
+                    response = await self.dispatch(method, target, headers, body, keep_alive)
+                except Exception as e:
+                    print(f"Error handling {method} {target}: {e}", file=sys.stderr)
+                    response = self._response(500, b"internal error", close=not keep_alive)
+                writer.write(response)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _parse_head(head: bytes) -> Tuple[str, str, str, Dict[str, str]]:
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, version = lines[0].split(" ")
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        return method, target, version, headers
+
+    async def dispatch(self, method: str, target: str, headers: Dict[str, str], body: bytes,
+                       keep_alive: bool) -> bytes:
+        url = urlsplit(target)
+        path = unquote(url.path)
+        close = not keep_alive
+        self.store.maybe_reload()
+
+        if path == "/healthz":
+            stats = dict(self.store.stats(), requests=self.requests)
+            return self._response(200, json.dumps(stats).encode(), "application/json", close=close)
+
+        if path == "/timestamps/bulk":
+            if method != "POST":
+                return self._response(405, b"use POST", close=close, extra={"Allow": "POST"})
+            try:
+                ids = json.loads(body or b"{}").get("ids")
+            except (ValueError, AttributeError):
+                ids = None
+            return await self._bulk(ids, headers, close)
+
+        if method not in ("GET", "HEAD"):
+            return self._response(405, b"use GET", close=close, extra={"Allow": "GET, HEAD"})
+
+        if path == "/timestamps":
+            ids = [i for value in parse_qs(url.query).get("ids", []) for i in value.split(",") if i]
+            return await self._bulk(ids, headers, close, head=method == "HEAD")
+
+        if path.startswith("/timestamps/") and path.endswith("/patches"):
+            imdb_id = path[len("/timestamps/"):-len("/patches")]
+            try:
+                since = int(parse_qs(url.query)["since"][0])
+            except (KeyError, ValueError):
+                return self._response(400, b"expected ?since=<version>", close=close)
+            entry, patches = await self.store.get_patches(imdb_id, since)
+            if entry is None:
+                return self._response(404, b"unknown imdb_id", close=close)
+            if patches is None:
+                return self._response(410, b"no patches from that version; fetch the full title", close=close)
+            return self._cached(patches, headers, close, head=method == "HEAD")
+
+        if path.startswith("/timestamps/"):
+            imdb_id = path[len("/timestamps/"):]
+            if imdb_id.endswith(".json"):
+                imdb_id = imdb_id[:-5]
+            entry = await self.store.get(imdb_id)
+            if entry is None:
+                return self._response(404, b"unknown imdb_id", close=close)
+            return self._cached(entry, headers, close, head=method == "HEAD")
+
+        return self._response(404, b"not found", close=close)
+
+    async def _bulk(self, ids, headers: Dict[str, str], close: bool, head: bool = False) -> bytes:
+        if not isinstance(ids, list) or not ids or not all(isinstance(i, str) for i in ids):
+            return self._response(400, b"expected a non-empty list of ids", close=close)
+        if len(ids) > MAX_BULK_IDS:
+            return self._response(413, f"at most {MAX_BULK_IDS} ids per request".encode(), close=close)
+        return self._cached(await self.store.get_many(ids), headers, close, head=head)
+
+    def _cached(self, entry: CachedBody, headers: Dict[str, str], close: bool, head: bool = False) -> bytes:
+        use_gzip = accepts_gzip(headers.get("accept-encoding", ""))
+        extra = {
+            "ETag": entry.gzip_etag if use_gzip else entry.etag,
+            "Cache-Control": self.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if "if-none-match" in headers and entry.matches(headers["if-none-match"]):
+            return self._response(304, b"", close=close, extra=extra)
+        if use_gzip:
+            extra["Content-Encoding"] = "gzip"
+        body = entry.gzip_body if use_gzip else entry.body
+        return self._response(200, body, "application/json", close=close, extra=extra, head=head)
+
+    @staticmethod
+    def _response(status: int, body: bytes, content_type: str = "text/plain; charset=utf-8",
+                  close: bool = False, extra: Optional[Dict[str, str]] = None, head: bool = False) -> bytes:
+        lines = [f"HTTP/1.1 {status} {REASONS[status]}"]
+        if status != 304:
+            lines.append(f"Content-Type: {content_type}")
+            lines.append(f"Content-Length: {len(body)}")
+        for name, value in (extra or {}).items():
+            lines.append(f"{name}: {value}")
+        lines.append(f"Connection: {'close' if close else 'keep-alive'}")
+        head_bytes = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        return head_bytes if head or status == 304 else head_bytes + body
+
+
+async def serve(corpus_dir: str, host: str, port: int, cache_size: int, max_age: int,
+                ready: Optional[asyncio.Event] = None):
+    store = TitleCache(corpus_dir, cache_size)
+    server = TimestampServer(store, max_age)
+    async with await asyncio.start_server(server.handle_connection, host, port,
+                                          limit=MAX_HEADER_BYTES, backlog=1024) as listener:
+        bound = listener.sockets[0].getsockname()
+        print(f"Serving {len(store.index)} titles on http://{bound[0]}:{bound[1]}", file=sys.stderr)
+        if ready is not None:
+            ready.set()
+        await listener.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve FilterFlix timestamps over HTTP")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS,
+                        help="Corpus root holding index.json (default: the repo's timestamps/)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--cache-size", type=int, default=10000,
+                        help="Titles kept in the in-memory LRU (default: 10000)")
+    parser.add_argument("--max-age", type=int, default=300,
+                        help="Cache-Control max-age in seconds (default: 300)")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.corpus, args.host, args.port, args.cache_size, args.max_age))
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -83,22 +83,116 @@ async function saveTimestamps(imdbId, data) {
   }
 }
 
+// Responses from loadTimestampsFromUrl, revalidated with If-None-Match
+const remoteCache = new Map();
+
 /**
  * Load timestamps from remote URL
+ * Repeat requests send the last ETag and reuse the cached data on 304
  * @param {string} url - URL to fetch timestamps from
  * @returns {Promise<Object|null>} Timestamp data or null
  */
 async function loadTimestampsFromUrl(url) {
   try {
-    const response = await fetch(url);
+    const cached = remoteCache.get(url);
+    const headers = cached ? { 'If-None-Match': cached.etag } : {};
+    const response = await fetch(url, { headers });
+    if (response.status === 304 && cached) return cached.data;
     if (!response.ok) throw new Error(`HTTP ${response.status}`);
-    return await response.json();
+
+    const data = await response.json();
+    const etag = response.headers.get('ETag');
+    if (etag) remoteCache.set(url, { etag, data });
+    return data;
   } catch (err) {
     console.error('[FilterFlix] Error fetching timestamps:', err);
     return null;
   }
 }
 
+/**
+ * Load many titles from a timestamp server in one request
+ * @param {string} baseUrl - Server root, e.g. http://127.0.0.1:8787
+ * @param {string[]} imdbIds - IMDb IDs to fetch
+ * @returns {Promise<Object>} Map of IMDb ID to timestamp data (missing IDs omitted)
+ */
+async function loadTimestampsBulk(baseUrl, imdbIds) {
+  try {
+    const response = await fetch(`${baseUrl}/timestamps/bulk`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ ids: imdbIds })
+    });
+    if (!response.ok) throw new Error(`HTTP ${response.status}`);
+    return (await response.json()).titles;
+  } catch (err) {
+    console.error('[FilterFlix] Error fetching timestamps:', err);
+    return {};
+  }
+}
+
+/**
+ * Apply a JSON Patch (add / remove / replace) to a copy of a document
+ * @param {Object} doc - Document to patch (left unchanged)
+ * @param {Array} ops - RFC 6902 operations
+ * @returns {Object} Patched copy
+ */
+function applyJsonPatch(doc, ops) {
+  let result = JSON.parse(JSON.stringify(doc));
+  for (const { op, path, value } of ops) {
+    if (path === '') {
+      result = JSON.parse(JSON.stringify(value));
+      continue;
+    }
+    const tokens = path.split('/').slice(1).map(t => t.replace(/~1/g, '/').replace(/~0/g, '~'));
+    const last = tokens.pop();
+    let parent = result;
+    for (const token of tokens) {
+      parent = parent[Array.isArray(parent) ? Number(token) : token];
+      if (parent === undefined || parent === null) throw new Error(`${op} ${path}: no such location`);
+    }
+    const copy = value === undefined ? undefined : JSON.parse(JSON.stringify(value));
+    if (Array.isArray(parent)) {
+      const index = last === '-' ? parent.length : Number(last);
+      if (op === 'add') parent.splice(index, 0, copy);
+      else if (op === 'remove') parent.splice(index, 1);
+      else if (op === 'replace') parent[index] = copy;
+      else throw new Error(`unsupported op ${op}`);
+    } else if (op === 'add' || op === 'replace') {
+      parent[last] = copy;
+    } else if (op === 'remove') {
+      delete parent[last];
+    } else {
+      throw new Error(`unsupported op ${op}`);
+    }
+  }
+  return result;
+}
+
+/**
+ * Bring a title up to date by fetching only the patches since its version
+ * Falls back to the full title when the server no longer keeps the patches (410)
+ * @param {string} baseUrl - Server root, e.g. http://127.0.0.1:8787
+ * @param {Object} current - Timestamp data the caller already has
+ * @returns {Promise<Object|null>} Current timestamp data or null
+ */
+async function loadTimestampUpdates(baseUrl, current) {
+  const url = `${baseUrl}/timestamps/${current.imdb_id}`;
+  const version = current.metadata?.version;
+  if (!version) return loadTimestampsFromUrl(url);
+  try {
+    const response = await fetch(`${url}/patches?since=${version}`);
+    if (response.status === 410) return loadTimestampsFromUrl(url);
+    if (!response.ok) throw new Error(`HTTP ${response.status}`);
+
+    const { patches } = await response.json();
+    return patches.reduce((data, patch) => applyJsonPatch(data, patch.ops), current);
+  } catch (err) {
+    console.error('[FilterFlix] Error fetching timestamp updates:', err);
+    return null;
+  }
+}
+
 // ═══════════════════════════════════════════════════════════════
 // TIMESTAMP MATCHING
 // ═══════════════════════════════════════════════════════════════
@@ -308,6 +402,9 @@ if (typeof module !== 'undefined' && module.exports) {
     loadTimestamps,
     saveTimestamps,
     loadTimestampsFromUrl,
+    loadTimestampsBulk,
+    applyJsonPatch,
+    loadTimestampUpdates,
     matchCurrentTime,
     getUpcomingSegments,
     validateTimestamp,